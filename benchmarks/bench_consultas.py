@@ -0,0 +1,125 @@
+"""
+Microbenchmark de la latencia de una búsqueda por ID (obtener_producto) con y sin la caché de
+sentencias preparadas de cada conexión (DB_STATEMENT_CACHE).
+
+Solo compara el cursor preparado desactivado ("sin_preparar": DB_STATEMENT_CACHE=0, un cursor
+nuevo por consulta) y activado ("preparada": se reutiliza el cursor preparado de la conexión).
+Las dos variantes usan la misma sentencia ya clasificada (db_manager.sentencia), así que no miden
+el camino anterior a las sentencias fijas, que además clasificaba el texto en cada llamada: la
+diferencia es solo la de reutilizar el cursor. Las variantes se alternan por rondas para que las
+dos sufran el mismo ruido.
+
+Por defecto trabaja sobre una base de datos SQLite temporal; con --mysql usa la base de datos
+configurada en .env, que debe estar vacía (se insertan IDs fijos).
+
+Uso:
+    python -m benchmarks.bench_consultas [--productos 5000] [--busquedas 20000] [--mysql] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks import datos_sinteticos
+from benchmarks.bench_inventario import percentil
+
+
+def medir_busquedas(dao, ids, cache_sentencias):
+    """
+    Busca cada ID con el tamaño de caché de sentencias dado y devuelve los tiempos en microsegundos.
+    """
+    dao.db.pool.cache_sentencias = cache_sentencias
+    tiempos = []
+    for id_producto in ids:
+        t0 = time.perf_counter()
+        dao.obtener_producto(id_producto)
+        tiempos.append((time.perf_counter() - t0) * 1e6)
+    return tiempos
+
+
+def _resumen(tiempos):
+    mediana = percentil(tiempos, 0.5)
+    return {
+        "busquedas": len(tiempos),
+        "mediana_us": round(mediana, 2),
+        "p95_us": round(percentil(tiempos, 0.95), 2),
+        "min_us": round(min(tiempos), 2),
+        "ops_s": round(1e6 / mediana) if mediana else None,
+    }
+
+
+def ejecutar(productos, busquedas, rondas=5, semilla=42, cargar=True):
+    """
+    Carga los productos (si `cargar`) y mide obtener_producto sin y con el cursor preparado.
+    Debe llamarse con DB_BACKEND/DB_PATH ya configurados.
+    :return: dict con el motor, los resultados de cada variante y la mejora de la mediana
+    """
+    from src.core.inventory_manager import InventoryManager
+    from src.database.db_manager import backend, cerrar_pools, statement_cache_size
+
+    # Sin caché de objetos: cada búsqueda llega a la base de datos
+    manager = InventoryManager(tamano_cache=0)
+    if cargar:
+        datos_sinteticos.cargar(manager, {"proveedores": 50, "productos": productos, "clientes": 0, "movimientos": 0},
+                                semilla)
+    dao = manager.product_dao
+    rng = random.Random(semilla)
+    ids = [rng.randint(1, productos) for _ in range(max(1, busquedas // rondas))]
+    cache = statement_cache_size or 64
+
+    # Calentamiento: abre la conexión y prepara la sentencia
+    medir_busquedas(dao, ids[:100], cache)
+    sin_preparar, preparada = [], []
+    for _ in range(rondas):
+        sin_preparar += medir_busquedas(dao, ids, 0)
+        preparada += medir_busquedas(dao, ids, cache)
+    dao.db.pool.cache_sentencias = statement_cache_size
+    cerrar_pools()
+
+    resultados = {"sin_preparar": _resumen(sin_preparar), "preparada": _resumen(preparada)}
+    return {
+        "motor": backend,
+        "productos": productos,
+        "resultados": resultados,
+        "mejora": round(resultados["sin_preparar"]["mediana_us"] / resultados["preparada"]["mediana_us"], 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia de obtener_producto con y sin sentencias preparadas")
+    parser.add_argument("--productos", type=int, default=5000, help="Productos a cargar (por defecto 5000)")
+    parser.add_argument("--busquedas", type=int, default=20000, help="Búsquedas por variante (por defecto 20000)")
+    parser.add_argument("--rondas", type=int, default=5, help="Rondas en las que se alternan las variantes")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del generador de datos")
+    parser.add_argument("--mysql", action="store_true", help="Usar la base de datos MySQL de .env (vacía)")
+    parser.add_argument("--sin-carga", action="store_true", help="No cargar datos: reutilizar los de una ejecución anterior")
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON")
+    args = parser.parse_args()
+
+    temporal = None
+    if args.mysql:
+        os.environ["DB_BACKEND"] = "mysql"
+    else:
+        temporal = tempfile.mkdtemp(prefix="almacen_bench_")
+        datos_sinteticos.configurar_sqlite(os.path.join(temporal, "almacen.db"))
+    try:
+        informe = ejecutar(args.productos, args.busquedas, max(1, args.rondas), args.semilla, not args.sin_carga)
+    finally:
+        if temporal:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(informe, indent=2))
+        return
+    print(f"obtener_producto ({informe['motor']}, {informe['productos']} productos)")
+    for variante, r in informe["resultados"].items():
+        print(f"  {variante:<12} mediana {r['mediana_us']:>8.2f} µs  p95 {r['p95_us']:>8.2f} µs  "
+              f"({r['ops_s']:,} búsquedas/s)")
+    print(f"  mejora de la mediana con el cursor preparado: x{informe['mejora']}")
+
+
+if __name__ == "__main__":
+    main()
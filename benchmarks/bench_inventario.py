@@ -0,0 +1,217 @@
+"""
+Benchmark reproducible de las operaciones principales de InventoryManager sobre un almacén
+sintético (ver benchmarks/datos_sinteticos.py). Carga los datos, mide cada operación varias
+veces y da la mediana y el p95; los resultados se pueden guardar en JSON y comparar con una
+ejecución anterior para detectar regresiones.
+
+Por defecto trabaja sobre una base de datos SQLite temporal; con --mysql usa la base de datos
+configurada en .env, que debe estar vacía (se insertan IDs fijos).
+
+Uso:
+    python -m benchmarks.bench_inventario --movimientos 1000000 [--salida actual.json] [--base anterior.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks import datos_sinteticos
+
+
+def percentil(valores, fraccion):
+    """
+    Devuelve el percentil `fraccion` (entre 0 y 1) de una lista de tiempos.
+    """
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(fraccion * len(ordenados)))]
+
+
+def medir(operacion, repeticiones):
+    """
+    Ejecuta operacion(i) `repeticiones` veces y devuelve sus estadísticas en milisegundos.
+    """
+    tiempos = []
+    for i in range(repeticiones):
+        t0 = time.perf_counter()
+        operacion(i)
+        tiempos.append((time.perf_counter() - t0) * 1000.0)
+    mediana = percentil(tiempos, 0.5)
+    return {
+        "repeticiones": repeticiones,
+        "mediana_ms": round(mediana, 4),
+        "p95_ms": round(percentil(tiempos, 0.95), 4),
+        "min_ms": round(min(tiempos), 4),
+        "ops_s": round(1000.0 / mediana, 1) if mediana else None,
+    }
+
+
+def operaciones(manager, tamanos, semilla):
+    """
+    Devuelve la lista de (nombre, operacion(i), repeticiones relativas) a medir.
+    Los argumentos aleatorios se generan con una semilla fija para que cada ejecución haga lo mismo.
+    """
+    from src.models.movement import Movement
+    from src.models.product import Product
+
+    rng = random.Random(semilla + 1)
+    n_productos = tamanos["productos"]
+    ids = [rng.randint(1, n_productos) for _ in range(1000)]
+    pagina_intermedia = n_productos // 2
+    prefijos = [datos_sinteticos._NOMBRES[i % len(datos_sinteticos._NOMBRES)][:4] for i in range(1000)]
+    dias = [datos_sinteticos.INICIO_PERIODO + timedelta(days=rng.randrange(datos_sinteticos.DIAS_PERIODO))
+            for _ in range(1000)]
+    siguiente_movimiento = [tamanos["movimientos"]]
+    siguiente_producto = [n_productos]
+    tamano_bulk = 1000
+
+    def registrar(i):
+        siguiente_movimiento[0] += 1
+        manager.registrar_movimiento(siguiente_movimiento[0], ids[i % len(ids)], "entrada", 5,
+                                     datetime.now(), "BENCH", 1, 1)
+
+    def insertar_bloque(i):
+        primero = siguiente_producto[0] + 1
+        siguiente_producto[0] += tamano_bulk
+        manager.agregar_productos(Product(j, f"Bench {j}", "", f"BENCH{j:09d}", 1.0, 100, 1, "B", 1, "2024-01-01")
+                                  for j in range(primero, primero + tamano_bulk))
+
+    def registrar_bloque(i):
+        primero = siguiente_movimiento[0] + 1
+        siguiente_movimiento[0] += tamano_bulk
+        manager.registrar_movimientos(Movement(j, ids[j % len(ids)], "entrada", 1, datetime.now(), "BENCH", 1, 1)
+                                      for j in range(primero, primero + tamano_bulk))
+
+    def recorrer_movimientos(i):
+        for _ in manager.iter_movimientos():
+            pass
+
+    return [
+        ("listar_productos_pagina", lambda i: manager.listar_productos_pagina(100), 1.0),
+        ("listar_productos_pagina_intermedia", lambda i: manager.listar_productos_pagina(100, pagina_intermedia), 1.0),
+        ("obtener_producto", lambda i: manager.obtener_producto(ids[i % len(ids)]), 5.0),
+        ("buscar_producto_por_sku", lambda i: manager.buscar_producto_por_sku(f"SKU{ids[i % len(ids)]:08d}"), 5.0),
+        ("buscar_productos_prefijo", lambda i: manager.buscar_productos(prefijos[i % len(prefijos)], limite=100), 1.0),
+        ("contar_movimientos", lambda i: manager.contar_movimientos(), 0.2),
+        ("listar_movimientos_pagina_fecha", lambda i: manager.listar_movimientos_pagina(100, por_fecha=True, descendente=True), 1.0),
+        ("buscar_movimientos_por_fecha_dia", lambda i: manager.buscar_movimientos_por_fecha(
+            dias[i % len(dias)], dias[i % len(dias)] + timedelta(days=1), limite=1000), 1.0),
+        ("registrar_movimiento", registrar, 1.0),
+        ("agregar_productos_1000", insertar_bloque, 0.1),
+        ("registrar_movimientos_1000", registrar_bloque, 0.1),
+        ("iter_movimientos_completo", recorrer_movimientos, 0.02),
+    ]
+
+
+def ejecutar(tamanos, semilla=42, repeticiones=50, cargar=True, informar=print):
+    """
+    Carga el conjunto de datos (si `cargar`) y mide las operaciones.
+    Debe llamarse con DB_BACKEND/DB_PATH ya configurados.
+    :return: dict con metadatos, carga y resultados por operación
+    """
+    from src.core.inventory_manager import InventoryManager
+    from src.database.db_manager import backend, cerrar_pools
+
+    # Sin caché de objetos: se mide el acceso a la base de datos
+    manager = InventoryManager(tamano_cache=0)
+    carga = {}
+    if cargar:
+        carga = datos_sinteticos.cargar(manager, tamanos, semilla, informar=lambda entidad, filas, s: informar(
+            f"Carga {entidad:<12} {filas:>9} filas en {s:7.2f}s"))
+    resultados = {}
+    for nombre, operacion, factor in operaciones(manager, tamanos, semilla):
+        resultados[nombre] = medir(operacion, max(1, round(repeticiones * factor)))
+        informar(f"{nombre:<36} mediana {resultados[nombre]['mediana_ms']:>9.3f} ms  "
+                 f"p95 {resultados[nombre]['p95_ms']:>9.3f} ms")
+    cerrar_pools()
+    return {
+        "metadatos": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "motor": backend,
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "tamanos": tamanos,
+            "semilla": semilla,
+            "repeticiones": repeticiones,
+        },
+        "carga": carga,
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, base, tolerancia=0.2):
+    """
+    Compara las medianas con las de una ejecución anterior.
+    :param tolerancia: float, empeoramiento relativo admitido antes de considerar regresión
+    :return: list[dict] con operación, medianas, relación actual/base y si es regresión
+    """
+    filas = []
+    for nombre, resultado in actual["resultados"].items():
+        anterior = base.get("resultados", {}).get(nombre)
+        if not anterior or not anterior["mediana_ms"]:
+            continue
+        relacion = resultado["mediana_ms"] / anterior["mediana_ms"]
+        filas.append({"operacion": nombre, "base_ms": anterior["mediana_ms"], "actual_ms": resultado["mediana_ms"],
+                      "relacion": round(relacion, 3), "regresion": relacion > 1 + tolerancia})
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de InventoryManager con datos sintéticos")
+    for entidad, defecto in datos_sinteticos.TAMANOS.items():
+        parser.add_argument(f"--{entidad}", type=int, default=defecto, help=f"Número de {entidad} (por defecto {defecto})")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del generador de datos")
+    parser.add_argument("--repeticiones", type=int, default=50, help="Repeticiones base de cada operación")
+    motor = parser.add_mutually_exclusive_group()
+    motor.add_argument("--sqlite", metavar="RUTA", help="Fichero SQLite a usar (por defecto uno temporal)")
+    motor.add_argument("--mysql", action="store_true", help="Usar la base de datos MySQL de .env (vacía)")
+    parser.add_argument("--sin-carga", action="store_true", help="No cargar datos: reutilizar los de una ejecución anterior")
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON")
+    parser.add_argument("--salida", metavar="FICHERO", help="Guarda los resultados en un fichero JSON")
+    parser.add_argument("--base", metavar="FICHERO", help="Resultados anteriores con los que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Empeoramiento admitido frente a la base (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    temporal = None
+    if args.mysql:
+        os.environ["DB_BACKEND"] = "mysql"
+    elif args.sqlite:
+        datos_sinteticos.configurar_sqlite(args.sqlite)
+    else:
+        temporal = tempfile.mkdtemp(prefix="almacen_bench_")
+        datos_sinteticos.configurar_sqlite(os.path.join(temporal, "almacen.db"))
+
+    tamanos = {e: getattr(args, e) for e in datos_sinteticos.TAMANOS}
+    try:
+        informe = ejecutar(tamanos, args.semilla, args.repeticiones, not args.sin_carga,
+                           informar=(lambda texto: None) if args.json else print)
+    finally:
+        if temporal:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+    regresiones = []
+    if args.base:
+        with open(args.base, encoding="utf-8") as f:
+            informe["comparacion"] = comparar(informe, json.load(f), args.tolerancia)
+        regresiones = [c for c in informe["comparacion"] if c["regresion"]]
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2)
+    if args.json:
+        print(json.dumps(informe, indent=2))
+    elif args.base:
+        print(f"\nComparación con {args.base}:")
+        for c in informe["comparacion"]:
+            marca = "  REGRESIÓN" if c["regresion"] else ""
+            print(f"{c['operacion']:<36} {c['base_ms']:>9.3f} -> {c['actual_ms']:>9.3f} ms (x{c['relacion']}){marca}")
+    # Código de salida distinto de cero si alguna operación empeora más de lo tolerado
+    sys.exit(1 if regresiones else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark de memoria y velocidad de construcción de modelos a partir de filas.
+Compara los modelos anteriores (con __dict__ por instancia, construidos con Modelo(*fila))
+con los modelos actuales (__slots__ y fábrica de filas de los DAOs).
+
+Uso:
+    python -m benchmarks.bench_modelos --filas 1000000 [--json]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.models.movement import Movement
+from src.models.product import Product
+from src.models.factory import fabrica_filas
+
+
+class MovementAnterior:
+    """
+    Copia del modelo Movement anterior, sin __slots__.
+    """
+    def __init__(self, id_movimiento, id_producto, tipo_movimiento, cantidad, fecha_movimiento, referencia_origen, id_usuario, id_cliente_proveedor):
+        self.id_movimiento = id_movimiento
+        self.id_producto = id_producto
+        self.cantidad = cantidad
+        self.tipo_movimiento = tipo_movimiento
+        self.fecha_movimiento = fecha_movimiento
+        self.referencia_origen = referencia_origen
+        self.id_usuario = id_usuario
+        self.id_cliente_proveedor = id_cliente_proveedor
+
+
+class ProductAnterior:
+    """
+    Copia del modelo Product anterior, sin __slots__.
+    """
+    def __init__(self, id_producto, nombre_producto, descripcion, sku, precio_unitario, stok_actual, stock_minimo, ubicacion, id_proveedor, fecha_alta):
+        self.id_producto = id_producto
+        self.nombre_producto = nombre_producto
+        self.descripcion = descripcion
+        self.sku = sku
+        self.precio_unitario = precio_unitario
+        self.stock_actual = stok_actual
+        self.stock_minimo = stock_minimo
+        self.ubicacion = ubicacion
+        self.id_proveedor = id_proveedor
+        self.fecha_alta = fecha_alta
+
+
+def filas_movimientos(n):
+    """
+    Genera n filas con la forma que devuelve el conector para la tabla movimientos.
+    """
+    inicio = datetime(2024, 1, 1)
+    return [(i, i % 5000 + 1, "entrada" if i % 3 else "salida", i % 50 + 1,
+             inicio + timedelta(seconds=i * 30), f"REF-{i % 1000}", i % 40 + 1, i % 800 + 1)
+            for i in range(1, n + 1)]
+
+
+def filas_productos(n):
+    """
+    Genera n filas con la forma que devuelve el conector para la tabla productos.
+    """
+    alta = datetime(2024, 1, 1).date()
+    return [(i, f"Producto {i}", "Descripción", f"SKU{i:08d}", Decimal("9.95"), i % 500, 10,
+             f"A{i % 40}", i % 800 + 1, alta)
+            for i in range(1, n + 1)]
+
+
+def medir(construir, filas):
+    """
+    Devuelve (segundos, bytes retenidos por la lista de modelos) de construir(filas).
+    """
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    modelos = construir(filas)
+    segundos = time.perf_counter() - t0
+    retenidos = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    del modelos
+    return segundos, retenidos
+
+
+def ejecutar(n):
+    """
+    Ejecuta el benchmark para movimientos y productos y devuelve una lista de resultados.
+    """
+    resultados = []
+    casos = [
+        ("movimientos", filas_movimientos, MovementAnterior, Movement),
+        ("productos", filas_productos, ProductAnterior, Product),
+    ]
+    for nombre, generar, anterior, actual in casos:
+        filas = generar(n)
+        t_ant, m_ant = medir(lambda fs: [anterior(*fila) for fila in fs], filas)
+        t_act, m_act = medir(fabrica_filas(actual), filas)
+        resultados.append({
+            "entidad": nombre,
+            "filas": n,
+            "anterior_s": round(t_ant, 4),
+            "actual_s": round(t_act, 4),
+            "anterior_bytes_por_fila": round(m_ant / n, 1),
+            "actual_bytes_por_fila": round(m_act / n, 1),
+            "aceleracion": round(t_ant / t_act, 2) if t_act else None,
+            "memoria_relativa": round(m_act / m_ant, 3) if m_ant else None,
+        })
+        del filas
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de modelos con __slots__ y fábricas de filas")
+    parser.add_argument("--filas", type=int, default=1000000, help="Número de filas a materializar")
+    parser.add_argument("--json", action="store_true", help="Imprime los resultados en JSON")
+    args = parser.parse_args()
+    resultados = ejecutar(args.filas)
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return
+    for r in resultados:
+        print(f"{r['entidad']:<12} {r['filas']} filas | tiempo {r['anterior_s']:.3f}s -> {r['actual_s']:.3f}s "
+              f"(x{r['aceleracion']}) | memoria {r['anterior_bytes_por_fila']} -> "
+              f"{r['actual_bytes_por_fila']} bytes/fila ({r['memoria_relativa']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
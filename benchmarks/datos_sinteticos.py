@@ -0,0 +1,179 @@
+"""
+Generador reproducible de datos sintéticos del almacén: proveedores, productos, clientes y
+movimientos con distribuciones parecidas a las reales (pocos productos concentran la mayoría
+de movimientos, cantidades sesgadas, más actividad en días laborables y horario de oficina).
+Todas las funciones devuelven generadores de tuplas en el orden del constructor de cada modelo,
+de modo que millones de movimientos no se materializan en memoria.
+
+Uso como módulo:
+    python -m benchmarks.datos_sinteticos --productos 5000 --movimientos 1000000 [--sqlite almacen.db]
+"""
+import argparse
+import itertools
+import math
+import os
+import random
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+
+# Tamaños por defecto de un almacén mediano
+TAMANOS = {"proveedores": 200, "productos": 5000, "clientes": 2000, "movimientos": 100000}
+
+# Periodo cubierto por los movimientos generados
+INICIO_PERIODO = datetime(2024, 1, 1)
+DIAS_PERIODO = 365
+
+_NOMBRES = ("Tornillo", "Tuerca", "Arandela", "Cable", "Bisagra", "Taco", "Brida", "Junta",
+            "Rodamiento", "Fusible", "Manguera", "Abrazadera", "Cinta", "Pintura", "Guante")
+_ACABADOS = ("inox", "zincado", "negro", "latón", "nylon", "galvanizado")
+_CALLES = ("Calle Mayor", "Avenida del Puerto", "Polígono Sur", "Calle Real", "Camino Viejo")
+
+
+def generar_proveedores(n, rng):
+    """
+    Genera n proveedores con IDs 1..n.
+    """
+    for i in range(1, n + 1):
+        yield (i, f"Proveedor {i:05d}", f"9{rng.randrange(10**7, 10**8)}",
+               f"ventas{i}@proveedor{i % 97}.es", f"{rng.choice(_CALLES)} {rng.randint(1, 200)}")
+
+
+def generar_clientes(n, rng):
+    """
+    Genera n clientes con IDs 1..n.
+    """
+    for i in range(1, n + 1):
+        yield (i, f"Cliente {i:06d}", f"6{rng.randrange(10**7, 10**8)}", f"cliente{i}@correo.es",
+               f"{rng.choice(_CALLES)} {rng.randint(1, 200)}")
+
+
+def generar_productos(n, n_proveedores, rng):
+    """
+    Genera n productos con IDs 1..n, SKU único y precio con distribución log-normal.
+    El stock inicial es alto para que las salidas generadas no lo agoten.
+    """
+    for i in range(1, n + 1):
+        nombre = f"{rng.choice(_NOMBRES)} {rng.choice(_ACABADOS)} {i}"
+        precio = round(min(5000.0, rng.lognormvariate(2.0, 1.0)), 2)
+        alta = (INICIO_PERIODO - timedelta(days=rng.randint(0, 1500))).date().isoformat()
+        yield (i, nombre, "Artículo generado para pruebas de rendimiento", f"SKU{i:08d}", precio,
+               rng.randint(1000, 100000), rng.randint(5, 100), f"P{rng.randint(1, 40):02d}-E{rng.randint(1, 12):02d}",
+               rng.randint(1, n_proveedores), alta)
+
+
+def _pesos_zipf(n, exponente=1.1):
+    """
+    Pesos acumulados de una distribución de Zipf sobre n elementos (el primero es el más frecuente).
+    """
+    return list(itertools.accumulate(1.0 / (k ** exponente) for k in range(1, n + 1)))
+
+
+def generar_movimientos(n, n_productos, n_clientes, n_proveedores, rng):
+    """
+    Genera n movimientos ordenados por fecha con IDs 1..n:
+    - el producto sigue una distribución de Zipf (los más vendidos acaparan los movimientos);
+    - dos de cada tres movimientos son salidas; las entradas reponen en cantidades mayores;
+    - las cantidades siguen una distribución geométrica (muchas unidades sueltas, pocos lotes grandes);
+    - la actividad se concentra en días laborables entre las 8 y las 20 horas.
+    """
+    acumulados = _pesos_zipf(n_productos)
+    total_pesos = acumulados[-1]
+    # Permutación fija para que los productos populares no sean siempre los de ID bajo
+    orden = list(range(1, n_productos + 1))
+    rng.shuffle(orden)
+    segundos_periodo = DIAS_PERIODO * 86400
+    paso = segundos_periodo / max(1, n)
+    instante = 0.0
+    for i in range(1, n + 1):
+        instante += rng.expovariate(1.0 / paso)
+        fecha = INICIO_PERIODO + timedelta(seconds=instante % segundos_periodo)
+        if fecha.weekday() >= 5 and rng.random() < 0.8:
+            fecha += timedelta(days=7 - fecha.weekday())
+        fecha = fecha.replace(hour=8 + int(fecha.hour * 12 / 24))
+        id_producto = orden[bisect_left(acumulados, rng.random() * total_pesos)]
+        if rng.random() < 2 / 3:
+            tipo = "salida"
+            cantidad = 1 + int(math.log(1 - rng.random()) / math.log(0.7))
+            contraparte = rng.randint(1, n_clientes)
+        else:
+            tipo = "entrada"
+            cantidad = rng.choice((10, 20, 25, 50, 100, 200))
+            contraparte = rng.randint(1, n_proveedores)
+        yield (i, id_producto, tipo, cantidad, fecha.strftime("%Y-%m-%d %H:%M:%S"),
+               f"{'ALB' if tipo == 'salida' else 'PED'}-{i:08d}", rng.randint(1, 25), contraparte)
+
+
+def _en_lotes(iterable, tamano):
+    iterador = iter(iterable)
+    while True:
+        lote = list(itertools.islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def cargar(manager, tamanos=None, semilla=42, tamano_lote=5000, informar=None):
+    """
+    Genera y carga un conjunto de datos completo usando las inserciones masivas.
+    Los movimientos se insertan como histórico (sin recalcular el stock).
+    :param manager: InventoryManager sobre una base de datos vacía
+    :param tamanos: dict con proveedores, productos, clientes y movimientos (por defecto TAMANOS)
+    :param semilla: int, semilla del generador para obtener siempre los mismos datos
+    :param informar: función (entidad, filas, segundos) llamada al terminar cada tabla
+    :return: dict entidad -> {"filas", "segundos", "filas_s", "rechazadas"}
+    """
+    tamanos = {**TAMANOS, **(tamanos or {})}
+    rng = random.Random(semilla)
+    from src.models.movement import Movement
+
+    pasos = [
+        ("proveedores", generar_proveedores(tamanos["proveedores"], rng), manager.agregar_proveedores),
+        ("clientes", generar_clientes(tamanos["clientes"], rng), manager.agregar_clientes),
+        ("productos", generar_productos(tamanos["productos"], tamanos["proveedores"], rng), manager.agregar_productos),
+        ("movimientos", generar_movimientos(tamanos["movimientos"], tamanos["productos"], tamanos["clientes"],
+                                            tamanos["proveedores"], rng),
+         lambda filas: manager.movement_dao.crear_movimientos(Movement(*f) for f in filas)),
+    ]
+    resumen = {}
+    for entidad, filas, insertar in pasos:
+        t0 = time.perf_counter()
+        cargadas = rechazadas = 0
+        for lote in _en_lotes(filas, tamano_lote):
+            fallos = insertar(lote)
+            rechazadas += len(fallos)
+            cargadas += len(lote) - len(fallos)
+        segundos = time.perf_counter() - t0
+        resumen[entidad] = {"filas": cargadas, "segundos": round(segundos, 3),
+                            "filas_s": round(cargadas / segundos) if segundos else None,
+                            "rechazadas": rechazadas}
+        if informar:
+            informar(entidad, cargadas, segundos)
+    return resumen
+
+
+def configurar_sqlite(ruta):
+    """
+    Selecciona el motor SQLite antes de importar la aplicación.
+    """
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["DB_PATH"] = os.path.abspath(ruta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga datos sintéticos del almacén en la base de datos configurada")
+    for entidad, defecto in TAMANOS.items():
+        parser.add_argument(f"--{entidad}", type=int, default=defecto, help=f"Número de {entidad} (por defecto {defecto})")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del generador")
+    parser.add_argument("--sqlite", metavar="RUTA", help="Cargar en un fichero SQLite en lugar de la base de datos de .env")
+    args = parser.parse_args()
+    if args.sqlite:
+        configurar_sqlite(args.sqlite)
+    from src.core.inventory_manager import InventoryManager
+    cargar(InventoryManager(tamano_cache=0), {e: getattr(args, e) for e in TAMANOS}, args.semilla,
+           informar=lambda entidad, filas, s: print(f"{entidad:<12} {filas:>9} filas en {s:7.2f}s ({filas / s if s else 0:,.0f} filas/s)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,13 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.ui.main_window import MainWindow
+from src.database.db_manager import cerrar_pools
 
 def main():
     app = MainWindow()
     app.mainloop()
+    # Cierra las conexiones compartidas del pool al salir
+    cerrar_pools()
 
 if __name__ == "__main__":
     main()
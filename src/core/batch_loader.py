@@ -0,0 +1,80 @@
+# Agrupación de las búsquedas por ID de una misma acción en una sola consulta
+from functools import partial
+
+
+class BatchLoader:
+    """
+    Resuelve búsquedas por ID de una entidad agrupándolas: los IDs se anotan con pedir() y la
+    primera vez que se necesita un resultado se piden todos los pendientes con una sola llamada
+    a `cargar_varios`. Los resultados (también los IDs que no existen) se recuerdan mientras
+    vive el cargador, así que debe crearse uno por acción de la interfaz y no compartirse entre hilos.
+    """
+    def __init__(self, cargar_varios):
+        """
+        :param cargar_varios: función (ids) -> dict id -> objeto, p. ej. InventoryManager.obtener_productos
+        """
+        self._cargar_varios = cargar_varios
+        self._pendientes = {}  # IDs anotados y aún sin resolver, en orden de petición
+        self._resueltos = {}
+        self.consultas = 0
+
+    def pedir(self, clave):
+        """
+        Anota un ID sin consultar todavía la base de datos.
+        :return: función sin argumentos que devuelve el objeto (o None) cuando se llama
+        """
+        if clave is not None and clave not in self._resueltos:
+            self._pendientes[clave] = None
+        return partial(self.obtener, clave)
+
+    def pedir_varios(self, claves):
+        """
+        Anota varios IDs sin consultar todavía la base de datos.
+        """
+        for clave in claves:
+            self.pedir(clave)
+
+    def obtener(self, clave):
+        """
+        Devuelve el objeto del ID, resolviendo antes en una sola consulta todos los IDs pendientes.
+        :return: objeto o None si no existe
+        """
+        if clave is None:
+            return None
+        if clave not in self._resueltos:
+            self._pendientes[clave] = None
+            self.cargar_pendientes()
+        return self._resueltos[clave]
+
+    def obtener_varios(self, claves):
+        """
+        Devuelve un dict ID -> objeto (o None) de los IDs dados, con una sola consulta para los que falten.
+        """
+        claves = [clave for clave in claves if clave is not None]
+        self.pedir_varios(claves)
+        self.cargar_pendientes()
+        return {clave: self._resueltos[clave] for clave in claves}
+
+    def cargar_pendientes(self):
+        """
+        Resuelve de una vez todos los IDs anotados.
+        """
+        if not self._pendientes:
+            return
+        claves, self._pendientes = list(self._pendientes), {}
+        encontrados = self._cargar_varios(claves)
+        self.consultas += 1
+        for clave in claves:
+            self._resueltos[clave] = encontrados.get(clave)
+
+
+class RequestLoaders:
+    """
+    Cargadores por lotes de todas las entidades para una acción de la interfaz
+    (ver InventoryManager.cargadores()).
+    """
+    def __init__(self, manager):
+        self.productos = BatchLoader(manager.obtener_productos)
+        self.clientes = BatchLoader(manager.obtener_clientes)
+        self.proveedores = BatchLoader(manager.obtener_proveedores)
+        self.movimientos = BatchLoader(manager.obtener_movimientos)
@@ -0,0 +1,123 @@
+# Caché en memoria para las consultas frecuentes
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Caché LRU de tamaño acotado con caducidad por tiempo (TTL) y contadores de aciertos y fallos.
+    Es segura entre hilos. Los valores None no se guardan.
+    """
+    def __init__(self, tamano_maximo=1024, ttl=30.0, reloj=time.monotonic):
+        """
+        :param tamano_maximo: int, número máximo de entradas antes de expulsar la menos usada
+        :param ttl: float, segundos que una entrada se considera válida
+        :param reloj: función que devuelve el instante actual en segundos (inyectable en pruebas)
+        """
+        self.tamano_maximo = tamano_maximo
+        self.ttl = ttl
+        self._reloj = reloj
+        self._entradas = OrderedDict()  # clave -> (valor, caduca_en)
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def consultar(self, clave):
+        """
+        Devuelve el valor guardado para la clave, o None si no está o ha caducado.
+        """
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                valor, caduca_en = entrada
+                if caduca_en > self._reloj():
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return valor
+                del self._entradas[clave]
+            self.fallos += 1
+            return None
+
+    def guardar(self, clave, valor):
+        """
+        Guarda un valor, expulsando la entrada usada hace más tiempo si la caché está llena.
+        """
+        if valor is None:
+            return
+        with self._lock:
+            self._entradas[clave] = (valor, self._reloj() + self.ttl)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.tamano_maximo:
+                self._entradas.popitem(last=False)
+                self.expulsiones += 1
+
+    def obtener(self, clave, cargar):
+        """
+        Devuelve el valor de la caché o, si no está, lo obtiene con `cargar(clave)` y lo guarda.
+        """
+        valor = self.consultar(clave)
+        if valor is None:
+            valor = cargar(clave)
+            self.guardar(clave, valor)
+        return valor
+
+    def obtener_varios(self, claves, cargar_varios):
+        """
+        Devuelve un dict clave -> valor de las claves dadas: las que están en la caché se toman de
+        ella y el resto se obtienen juntas con `cargar_varios(claves)` (que devuelve un dict) y se guardan.
+        Las claves sin valor no aparecen en el resultado.
+        """
+        encontrados = {}
+        pendientes = []
+        for clave in dict.fromkeys(claves):
+            valor = self.consultar(clave)
+            if valor is None:
+                pendientes.append(clave)
+            else:
+                encontrados[clave] = valor
+        if pendientes:
+            cargados = cargar_varios(pendientes)
+            for clave, valor in cargados.items():
+                self.guardar(clave, valor)
+            encontrados.update(cargados)
+        return encontrados
+
+    def invalidar(self, clave):
+        """
+        Elimina la entrada de una clave.
+        """
+        with self._lock:
+            self._entradas.pop(clave, None)
+
+    def invalidar_valor(self, valor):
+        """
+        Elimina todas las entradas cuyo valor es igual al dado (útil para índices secundarios).
+        """
+        with self._lock:
+            for clave in [c for c, (v, _) in self._entradas.items() if v == valor]:
+                del self._entradas[clave]
+
+    def limpiar(self):
+        """
+        Vacía la caché sin reiniciar los contadores.
+        """
+        with self._lock:
+            self._entradas.clear()
+
+    def estadisticas(self):
+        """
+        Devuelve un dict con el tamaño actual y los contadores de la caché.
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "tamano": len(self._entradas),
+                "tamano_maximo": self.tamano_maximo,
+                "ttl": self.ttl,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "expulsiones": self.expulsiones,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
@@ -0,0 +1,370 @@
+"""
+Importación de ficheros CSV de productos, clientes, proveedores y movimientos.
+
+El fichero se lee en streaming y se procesa por bloques: cada bloque se convierte y valida
+(tipos, obligatorios, SKU único, proveedor y producto existentes) y se inserta con las altas
+masivas de InventoryManager, de modo que la memoria no depende del tamaño del fichero.
+La conversión de los bloques se puede repartir entre varios procesos para ficheros grandes.
+Las filas rechazadas se pueden guardar en otro CSV con la línea y el motivo.
+
+La primera fila del CSV son los nombres de las columnas (ver COLUMNAS); el separador
+(',', ';' o tabulador) se detecta automáticamente.
+
+Uso:
+    python -m src.core.csv_importer productos catalogo.csv [--rechazos rechazados.csv] [--procesos 4]
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from src.core.inventory_manager import InventoryManager, TIPOS_MOVIMIENTO
+from src.database.db_manager import cerrar_pools
+from src.models.product import Product
+from src.models.client import Client
+from src.models.supplier import Supplier
+from src.models.movement import Movement
+
+# Filas por bloque de validación e inserción (opcional en .env)
+import_chunk_size = int(os.getenv('IMPORT_CHUNK_SIZE', '5000'))
+
+
+def _texto(valor):
+    return valor
+
+
+def _entero(valor):
+    return int(valor)
+
+
+def _decimal(valor):
+    # Admite la coma decimal de las hojas de cálculo en español
+    if "," in valor and "." not in valor:
+        valor = valor.replace(",", ".")
+    try:
+        return Decimal(valor)
+    except InvalidOperation:
+        raise ValueError(f"'{valor}' no es un número")
+
+
+def _fecha(valor):
+    # fromisoformat es mucho más rápido que strptime para el formato habitual
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(valor, "%d/%m/%Y").date()
+    except ValueError:
+        raise ValueError(f"'{valor}' no es una fecha (AAAA-MM-DD o DD/MM/AAAA)")
+
+
+def _fecha_hora(valor):
+    try:
+        return datetime.fromisoformat(valor)
+    except ValueError:
+        pass
+    for formato in ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M"):
+        try:
+            return datetime.strptime(valor, formato)
+        except ValueError:
+            pass
+    fecha = _fecha(valor)
+    return datetime(fecha.year, fecha.month, fecha.day)
+
+
+# Columnas de cada entidad en el orden del constructor del modelo: (nombre, conversión, obligatoria, por defecto)
+COLUMNAS = {
+    "productos": (
+        ("id_producto", _entero, True, None),
+        ("nombre_producto", _texto, True, None),
+        ("descripcion", _texto, False, None),
+        ("sku", _texto, True, None),
+        ("precio_unitario", _decimal, False, None),
+        ("stock_actual", _entero, False, 0),
+        ("stock_minimo", _entero, False, 0),
+        ("ubicacion", _texto, False, None),
+        ("id_proveedor", _entero, False, None),
+        ("fecha_alta", _fecha, False, None),
+    ),
+    "clientes": (
+        ("id_cliente", _entero, True, None),
+        ("nombre_cliente", _texto, True, None),
+        ("telefono", _texto, False, None),
+        ("email", _texto, False, None),
+        ("direccion", _texto, False, None),
+    ),
+    "proveedores": (
+        ("id_proveedor", _entero, True, None),
+        ("nombre_proveedor", _texto, True, None),
+        ("telefono", _texto, False, None),
+        ("email", _texto, False, None),
+        ("direccion", _texto, False, None),
+    ),
+    "movimientos": (
+        ("id_movimiento", _entero, True, None),
+        ("id_producto", _entero, True, None),
+        ("tipo_movimiento", _texto, True, None),
+        ("cantidad", _entero, True, None),
+        ("fecha_movimiento", _fecha_hora, True, None),
+        ("referencia_origen", _texto, False, None),
+        ("id_usuario", _entero, False, None),
+        ("id_cliente_proveedor", _entero, False, None),
+    ),
+}
+
+MODELOS = {"productos": Product, "clientes": Client, "proveedores": Supplier, "movimientos": Movement}
+
+
+def _comprobar_valores(entidad, valores):
+    """
+    Reglas de cada entidad que no dependen de la base de datos. Lanza ValueError si no se cumplen.
+    """
+    if entidad == "productos":
+        if valores[4] is not None and valores[4] < 0:
+            raise ValueError("El precio no puede ser negativo")
+        if valores[5] < 0 or valores[6] < 0:
+            raise ValueError("El stock no puede ser negativo")
+    elif entidad == "movimientos":
+        if valores[2] not in TIPOS_MOVIMIENTO:
+            raise ValueError(f"Tipo de movimiento no válido: {valores[2]}")
+        if valores[3] <= 0:
+            raise ValueError("La cantidad del movimiento debe ser un entero positivo")
+
+
+def convertir_lote(entidad, filas):
+    """
+    Convierte y valida un bloque de filas leídas del CSV. No usa la base de datos, así que
+    se puede ejecutar en otro proceso.
+    :param filas: list[(int, dict)] número de línea y fila tal como la entrega csv.DictReader
+    :return: (validas, errores): list[(línea, tupla de valores, fila)] y list[(línea, fila, motivo)]
+    """
+    columnas = COLUMNAS[entidad]
+    validas = []
+    errores = []
+    for linea, fila in filas:
+        valores = []
+        try:
+            for nombre, convertir, obligatoria, defecto in columnas:
+                texto = (fila.get(nombre) or "").strip()
+                if not texto:
+                    if obligatoria:
+                        raise ValueError(f"Falta el campo {nombre}")
+                    valores.append(defecto)
+                    continue
+                try:
+                    valores.append(convertir(texto))
+                except ValueError as e:
+                    raise ValueError(f"Valor no válido en {nombre}: {e}")
+            _comprobar_valores(entidad, valores)
+        except ValueError as e:
+            errores.append((linea, fila, str(e)))
+            continue
+        validas.append((linea, tuple(valores), fila))
+    return validas, errores
+
+
+def _leer_lotes(fichero, tamano_lote):
+    """
+    Lee el CSV en bloques de `tamano_lote` filas con su número de línea.
+    """
+    muestra = fichero.read(4096)
+    fichero.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+    except csv.Error:
+        dialecto = csv.excel
+    lector = csv.DictReader(fichero, dialect=dialecto)
+    # La línea 1 es la cabecera
+    filas = ((lector.line_num, fila) for fila in lector)
+    while True:
+        lote = list(itertools.islice(filas, tamano_lote))
+        if not lote:
+            return
+        yield lote
+
+
+class CSVImporter:
+    """
+    Importa ficheros CSV en bloques con las altas masivas de InventoryManager.
+    """
+    def __init__(self, manager, tamano_lote=None, procesos=0):
+        """
+        :param manager: InventoryManager en el que se importan los datos
+        :param tamano_lote: int, filas por bloque (por defecto IMPORT_CHUNK_SIZE)
+        :param procesos: int, procesos para convertir los bloques (0 o 1 lo hace en este proceso)
+        """
+        self.manager = manager
+        self.tamano_lote = max(1, tamano_lote or import_chunk_size)
+        self.procesos = procesos
+
+    def _convertidos(self, entidad, lotes):
+        """
+        Entrega los bloques convertidos en orden. Con varios procesos mantiene como mucho dos
+        bloques en curso por proceso, para que la memoria siga acotada.
+        """
+        if self.procesos <= 1:
+            for lote in lotes:
+                yield convertir_lote(entidad, lote)
+            return
+        with ProcessPoolExecutor(self.procesos) as executor:
+            en_curso = deque()
+            for lote in lotes:
+                en_curso.append(executor.submit(convertir_lote, entidad, lote))
+                if len(en_curso) >= self.procesos * 2:
+                    yield en_curso.popleft().result()
+            while en_curso:
+                yield en_curso.popleft().result()
+
+    def _referencias(self, entidad):
+        """
+        Carga los datos existentes necesarios para validar las referencias de la entidad.
+        """
+        if entidad == "productos":
+            skus = set()
+            for producto in self.manager.iter_productos():
+                skus.add(producto.sku)
+            return {"skus": skus, "proveedores": {p.id_proveedor for p in self.manager.iter_proveedores()}}
+        if entidad == "movimientos":
+            return {"productos": {p.id_producto for p in self.manager.iter_productos()}}
+        return {}
+
+    @staticmethod
+    def _validar_referencias(entidad, valores, referencias):
+        """
+        Devuelve el motivo de rechazo si la fila no cumple las referencias, o None.
+        """
+        if entidad == "productos":
+            if valores[3] in referencias["skus"]:
+                return f"El SKU {valores[3]} ya existe"
+            if valores[8] is not None and valores[8] not in referencias["proveedores"]:
+                return f"El proveedor {valores[8]} no existe"
+        elif entidad == "movimientos":
+            if valores[1] not in referencias["productos"]:
+                return f"El producto {valores[1]} no existe"
+        return None
+
+    @staticmethod
+    def _anotar_insertados(entidad, lote, fallos, referencias):
+        """
+        Añade a las referencias los SKU de los productos que la base de datos ha aceptado, para
+        rechazar sus repeticiones en los bloques siguientes. Los de un producto rechazado no se
+        anotan: otra fila del fichero puede usarlos. Dentro de un mismo bloque, las repeticiones
+        las rechaza la restricción UNIQUE de la tabla.
+        """
+        if entidad == "productos":
+            rechazados = {id(objeto) for objeto, _ in fallos}
+            referencias["skus"].update(p.sku for p in lote if id(p) not in rechazados)
+
+    def _insertar(self, entidad, modelos, aplicar_stock):
+        """
+        Inserta un bloque con el alta masiva de la entidad.
+        :return: list[(modelo, motivo)] filas rechazadas por la base de datos
+        """
+        if entidad == "productos":
+            return self.manager.agregar_productos(modelos, self.tamano_lote)
+        if entidad == "clientes":
+            return self.manager.agregar_clientes(modelos, self.tamano_lote)
+        if entidad == "proveedores":
+            return self.manager.agregar_proveedores(modelos, self.tamano_lote)
+        if aplicar_stock:
+            return self.manager.registrar_movimientos(modelos, self.tamano_lote)
+        # Histórico: se insertan sin modificar el stock de los productos
+        return self.manager.agregar_movimientos(modelos, self.tamano_lote)
+
+    def importar(self, entidad, ruta, rechazos=None, aplicar_stock=True, al_progresar=None):
+        """
+        Importa un fichero CSV de la entidad indicada.
+        :param entidad: str, 'productos', 'clientes', 'proveedores' o 'movimientos'
+        :param ruta: str, fichero CSV con cabecera
+        :param rechazos: str, fichero CSV donde guardar las filas rechazadas con su línea y motivo
+        :param aplicar_stock: bool, si los movimientos actualizan el stock (False los importa como histórico)
+        :param al_progresar: función (leidas, importadas, rechazadas) llamada tras cada bloque
+        :return: dict con leidas, importadas, rechazadas, segundos, filas_s y los primeros errores
+        """
+        if entidad not in COLUMNAS:
+            raise ValueError(f"Entidad no válida: {entidad}")
+        modelo = MODELOS[entidad]
+        inicio = time.perf_counter()
+        leidas = importadas = rechazadas = 0
+        primeros_errores = []
+        referencias = self._referencias(entidad)
+
+        with open(ruta, newline="", encoding="utf-8-sig") as fichero:
+            destino = escritor = None
+            try:
+                if rechazos:
+                    destino = open(rechazos, "w", newline="", encoding="utf-8")
+                for validas, errores in self._convertidos(entidad, _leer_lotes(fichero, self.tamano_lote)):
+                    leidas += len(validas) + len(errores)
+                    lote = []
+                    lineas = {}
+                    filas = {}
+                    for linea, valores, fila in validas:
+                        motivo = self._validar_referencias(entidad, valores, referencias)
+                        if motivo:
+                            errores.append((linea, fila, motivo))
+                            continue
+                        objeto = modelo(*valores)
+                        lote.append(objeto)
+                        lineas[id(objeto)] = linea
+                        filas[id(objeto)] = fila
+                    fallos = self._insertar(entidad, lote, aplicar_stock) if lote else []
+                    self._anotar_insertados(entidad, lote, fallos, referencias)
+                    errores.extend((lineas[id(objeto)], filas[id(objeto)], motivo) for objeto, motivo in fallos)
+                    importadas += len(lote) - len(fallos)
+                    rechazadas += len(errores)
+
+                    errores.sort(key=lambda error: error[0])
+                    primeros_errores.extend((linea, motivo) for linea, _, motivo in errores[:max(0, 100 - len(primeros_errores))])
+                    if destino and errores:
+                        if escritor is None:
+                            escritor = csv.writer(destino)
+                            escritor.writerow(["linea", "motivo"] + [c[0] for c in COLUMNAS[entidad]])
+                        for linea, fila, motivo in errores:
+                            escritor.writerow([linea, motivo] + [fila.get(c[0], "") for c in COLUMNAS[entidad]])
+                    if al_progresar:
+                        al_progresar(leidas, importadas, rechazadas)
+            finally:
+                if destino:
+                    destino.close()
+
+        segundos = time.perf_counter() - inicio
+        return {
+            "leidas": leidas,
+            "importadas": importadas,
+            "rechazadas": rechazadas,
+            "segundos": round(segundos, 3),
+            "filas_s": round(leidas / segundos) if segundos else None,
+            "errores": primeros_errores,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa un fichero CSV en el almacén")
+    parser.add_argument("entidad", choices=sorted(COLUMNAS), help="Tipo de datos del fichero")
+    parser.add_argument("fichero", help="Fichero CSV con cabecera")
+    parser.add_argument("--rechazos", metavar="FICHERO", help="Guarda las filas rechazadas en este CSV")
+    parser.add_argument("--lote", type=int, default=None, help="Filas por bloque (por defecto IMPORT_CHUNK_SIZE)")
+    parser.add_argument("--procesos", type=int, default=0, help="Procesos para convertir los bloques")
+    parser.add_argument("--sin-stock", action="store_true", help="Importar los movimientos como histórico sin tocar el stock")
+    args = parser.parse_args()
+
+    importador = CSVImporter(InventoryManager(), args.lote, args.procesos)
+    resultado = importador.importar(
+        args.entidad, args.fichero, args.rechazos, not args.sin_stock,
+        al_progresar=lambda leidas, importadas, rechazadas: print(
+            f"\r{leidas} filas leídas, {importadas} importadas, {rechazadas} rechazadas", end="", flush=True))
+    print(f"\nImportación terminada en {resultado['segundos']:.1f}s ({resultado['filas_s'] or 0} filas/s).")
+    for linea, motivo in resultado["errores"][:20]:
+        print(f"  línea {linea}: {motivo}")
+    cerrar_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Exportación en streaming de movimientos y productos (stock) a CSV o JSON Lines, opcionalmente
+comprimidos con gzip. Las filas se leen con un cursor en streaming y se escriben en bloques
+grandes, así que la memoria no depende del número de filas exportadas.
+
+El formato se deduce de la extensión del fichero: .csv, .csv.gz, .jsonl o .jsonl.gz.
+El fichero se escribe con un nombre temporal y se renombra al terminar, de modo que nunca
+queda un fichero a medias con el nombre definitivo.
+
+Uso:
+    python -m src.core.exporter movimientos movimientos_2025_01.csv.gz --desde 2025-01-01 --hasta 2025-02-01
+    python -m src.core.exporter productos stock.jsonl
+"""
+import argparse
+import csv
+import gzip
+import itertools
+import json
+import os
+import time
+from datetime import date
+
+from src.core.inventory_manager import InventoryManager
+from src.database.db_manager import cerrar_pools
+
+# Filas por bloque de escritura (opcional en .env)
+export_chunk_size = int(os.getenv('EXPORT_CHUNK_SIZE', '10000'))
+
+# Tamaño del búfer de escritura del fichero
+_BUFER = 1 << 20
+
+FORMATOS = ("csv", "csv.gz", "jsonl", "jsonl.gz")
+
+
+def formato_de(ruta):
+    """
+    Deduce el formato de exportación de la extensión del fichero.
+    """
+    for formato in sorted(FORMATOS, key=len, reverse=True):
+        if ruta.lower().endswith("." + formato):
+            return formato
+    raise ValueError(f"Formato de exportación no reconocido: {ruta} (usar {', '.join(FORMATOS)})")
+
+
+def _abrir(ruta, formato):
+    """
+    Abre el fichero de destino en modo texto con un búfer grande, comprimido si el formato lo pide.
+    """
+    if formato.endswith(".gz"):
+        # Nivel 6: buen equilibrio entre tamaño y velocidad para ficheros grandes
+        return gzip.open(ruta, "wt", compresslevel=6, encoding="utf-8", newline="")
+    return open(ruta, "w", encoding="utf-8", newline="", buffering=_BUFER)
+
+
+class StreamingExporter:
+    """
+    Exporta tablas completas o filtradas sin cargarlas en memoria.
+    """
+    def __init__(self, manager, tamano_lote=None):
+        """
+        :param manager: InventoryManager del que se leen los datos
+        :param tamano_lote: int, filas por bloque de lectura y de escritura (por defecto EXPORT_CHUNK_SIZE)
+        """
+        self.manager = manager
+        self.tamano_lote = max(1, tamano_lote or export_chunk_size)
+
+    def exportar_movimientos(self, ruta, desde=None, hasta=None, id_productos=None, al_progresar=None):
+        """
+        Exporta los movimientos, opcionalmente filtrados por fechas [desde, hasta) y productos.
+        Con filtro de fechas salen ordenados por fecha; si no, por ID.
+        :param al_progresar: función (filas) llamada tras escribir cada bloque
+        :return: dict con filas, bytes, segundos, filas_s y mb_s
+        """
+        dao = self.manager.movement_dao
+        filas = dao.iter_filas(self.tamano_lote, desde, hasta, id_productos)
+        return self._exportar(ruta, dao.COLUMNAS, filas, al_progresar)
+
+    def exportar_productos(self, ruta, al_progresar=None):
+        """
+        Exporta todos los productos con su stock actual, ordenados por ID.
+        :return: dict con filas, bytes, segundos, filas_s y mb_s
+        """
+        dao = self.manager.product_dao
+        return self._exportar(ruta, dao.COLUMNAS, dao.iter_filas(self.tamano_lote), al_progresar)
+
+    def _exportar(self, ruta, columnas, filas, al_progresar):
+        """
+        Escribe las filas en bloques de `tamano_lote` en un fichero temporal y lo renombra al terminar.
+        """
+        formato = formato_de(ruta)
+        temporal = ruta + ".parcial"
+        inicio = time.perf_counter()
+        total = 0
+        try:
+            with _abrir(temporal, formato) as destino:
+                if formato.startswith("csv"):
+                    escritor = csv.writer(destino)
+                    escritor.writerow(columnas)
+                    escribir = escritor.writerows
+                else:
+                    codificar = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_como_texto).encode
+
+                    def escribir(lote):
+                        # Un único write por bloque; fechas y decimales como texto
+                        destino.write("".join(codificar(dict(zip(columnas, fila))) + "\n" for fila in lote))
+                while True:
+                    lote = list(itertools.islice(filas, self.tamano_lote))
+                    if not lote:
+                        break
+                    escribir(lote)
+                    total += len(lote)
+                    if al_progresar:
+                        al_progresar(total)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        finally:
+            # Cierra el cursor si la exportación se interrumpe a mitad
+            filas.close()
+
+        segundos = time.perf_counter() - inicio
+        tamano = os.path.getsize(ruta)
+        return {
+            "filas": total,
+            "bytes": tamano,
+            "segundos": round(segundos, 3),
+            "filas_s": round(total / segundos) if segundos else None,
+            "mb_s": round(tamano / segundos / 1e6, 2) if segundos else None,
+        }
+
+
+def _como_texto(valor):
+    """
+    Serializa en JSON los tipos que devuelve el conector (fechas, Decimal).
+    """
+    if isinstance(valor, date):
+        return valor.isoformat(" ") if hasattr(valor, "hour") else valor.isoformat()
+    return str(valor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta movimientos o productos en streaming")
+    parser.add_argument("tabla", choices=("movimientos", "productos"), help="Datos a exportar")
+    parser.add_argument("fichero", help=f"Fichero de destino ({', '.join(FORMATOS)})")
+    parser.add_argument("--desde", help="Fecha mínima de los movimientos (AAAA-MM-DD)")
+    parser.add_argument("--hasta", help="Fecha máxima de los movimientos, exclusiva (AAAA-MM-DD)")
+    parser.add_argument("--producto", type=int, action="append", dest="productos",
+                        help="Solo los movimientos de este producto (se puede repetir)")
+    parser.add_argument("--lote", type=int, default=None, help="Filas por bloque (por defecto EXPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    exportador = StreamingExporter(InventoryManager(), args.lote)
+    progreso = lambda filas: print(f"\r{filas} filas exportadas", end="", flush=True)
+    if args.tabla == "movimientos":
+        desde = date.fromisoformat(args.desde) if args.desde else None
+        hasta = date.fromisoformat(args.hasta) if args.hasta else None
+        resultado = exportador.exportar_movimientos(args.fichero, desde, hasta, args.productos, progreso)
+    else:
+        resultado = exportador.exportar_productos(args.fichero, progreso)
+    print(f"\n{resultado['filas']} filas, {resultado['bytes'] / 1e6:.1f} MB en {resultado['segundos']:.1f}s "
+          f"({resultado['filas_s'] or 0} filas/s, {resultado['mb_s'] or 0} MB/s).")
+    cerrar_pools()
+
+
+if __name__ == "__main__":
+    main()
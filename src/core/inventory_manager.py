@@ -1,50 +1,253 @@
 # Gestor de inventario
+import os
+from contextlib import contextmanager
 from src.database.dao.productDAO import productDAO
 from src.database.dao.clientDAO import clientDAO
 from src.database.dao.supplierDAO import supplierDAO
-from src.database.dao.movementDAO import movementDAO
+from src.database.dao.movementDAO import movementDAO, StockInsuficienteError
 from src.models.product import Product
 from src.models.client import Client
 from src.models.supplier import Supplier
 from src.models.movement import Movement
+from src.database.db_manager import estadisticas_consultas, TransaccionRevertidaError
+from src.core.cache import TTLCache
+from src.core.batch_loader import RequestLoaders
+
+# Caché de consultas por ID (opcional en .env; CACHE_SIZE=0 la desactiva)
+cache_size = int(os.getenv('CACHE_SIZE', '0'))
+cache_ttl = float(os.getenv('CACHE_TTL', '30'))
+
+
+def _como_modelo(clase, datos):
+    """
+    Convierte una tupla/lista o un dict con los campos de la entidad en una instancia del modelo.
+    Si ya es una instancia, la devuelve tal cual.
+    """
+    if isinstance(datos, clase):
+        return datos
+    if isinstance(datos, dict):
+        return clase(**datos)
+    return clase(*datos)
+
+
+TIPOS_MOVIMIENTO = ("entrada", "salida")
+
+
+def _validar_movimiento(movimiento):
+    """
+    Comprueba el tipo y la cantidad de un movimiento antes de enviarlo a la base de datos.
+    Lanza ValueError si no son válidos.
+    """
+    if movimiento.tipo_movimiento not in TIPOS_MOVIMIENTO:
+        raise ValueError(f"Tipo de movimiento no válido: {movimiento.tipo_movimiento}")
+    if not isinstance(movimiento.cantidad, int) or movimiento.cantidad <= 0:
+        raise ValueError("La cantidad del movimiento debe ser un entero positivo.")
+
 
 class InventoryManager:
     """
     Clase que coordina las operaciones principales del almacén: productos, clientes, proveedores y movimientos.
     """
-    def __init__(self):
+    def __init__(self, tamano_cache=None, ttl_cache=None):
+        """
+        :param tamano_cache: int, entradas máximas por caché (0 la desactiva; por defecto CACHE_SIZE)
+        :param ttl_cache: float, segundos de validez de cada entrada (por defecto CACHE_TTL)
+        """
         # Inicializa los DAOs para cada entidad del sistema
         self.product_dao = productDAO()
         self.client_dao = clientDAO()
         self.supplier_dao = supplierDAO()
         self.movement_dao = movementDAO()
+        # Cachés de lectura para obtener_producto/obtener_cliente/obtener_proveedor y búsquedas por SKU
+        tamano_cache = cache_size if tamano_cache is None else tamano_cache
+        ttl_cache = cache_ttl if ttl_cache is None else ttl_cache
+        if tamano_cache > 0:
+            self._cache_productos = TTLCache(tamano_cache, ttl_cache)
+            self._cache_skus = TTLCache(tamano_cache, ttl_cache)  # sku -> id_producto
+            self._cache_clientes = TTLCache(tamano_cache, ttl_cache)
+            self._cache_proveedores = TTLCache(tamano_cache, ttl_cache)
+        else:
+            self._cache_productos = self._cache_skus = None
+            self._cache_clientes = self._cache_proveedores = None
+
+    def _invalidar_producto(self, id_producto):
+        """
+        Descarta de la caché un producto y las búsquedas por SKU que apuntan a él.
+        """
+        if self._cache_productos is not None:
+            self._cache_productos.invalidar(id_producto)
+            self._cache_skus.invalidar_valor(id_producto)
+
+    def _invalidar_stock(self, id_producto):
+        """
+        Descarta de la caché un producto cuyo stock ha cambiado. Un movimiento no cambia el SKU,
+        así que no se recorre la caché de SKUs (invalidar_valor es lineal en su tamaño).
+        """
+        if self._cache_productos is not None:
+            self._cache_productos.invalidar(id_producto)
+
+    def estadisticas_cache(self):
+        """
+        Devuelve los contadores de aciertos/fallos de cada caché, o un dict vacío si están desactivadas.
+        """
+        if self._cache_productos is None:
+            return {}
+        return {
+            "productos": self._cache_productos.estadisticas(),
+            "skus": self._cache_skus.estadisticas(),
+            "clientes": self._cache_clientes.estadisticas(),
+            "proveedores": self._cache_proveedores.estadisticas(),
+        }
+
+    def limpiar_cache(self):
+        """
+        Vacía todas las cachés de lectura.
+        """
+        if self._cache_productos is not None:
+            for cache in (self._cache_productos, self._cache_skus, self._cache_clientes, self._cache_proveedores):
+                cache.limpiar()
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Agrupa varias operaciones en una única transacción que se confirma al final del bloque:
+            with manager.transaccion():
+                manager.agregar_proveedor(...)
+                manager.agregar_productos([...])
+                manager.registrar_movimientos([...])
+        Si el bloque lanza una excepción se revierte todo. Si alguna operación falla en la base
+        de datos (devuelve None/False) también se revierte todo y se lanza TransaccionRevertidaError.
+        Se pueden anidar; la transacción interior se revierte sin afectar a la exterior.
+        """
+        try:
+            # Todos los DAOs comparten las conexiones del hilo: cualquiera sirve para abrirla
+            with self.product_dao.db.transaccion():
+                yield self
+        except BaseException:
+            # La caché puede contener datos de la transacción revertida
+            self.limpiar_cache()
+            raise
+
+    def cargadores(self):
+        """
+        Devuelve cargadores por lotes para una acción de la interfaz: las búsquedas por ID que se
+        anotan durante la acción se resuelven juntas con una consulta por entidad:
+            cargadores = manager.cargadores()
+            cargadores.productos.pedir_varios(m.id_producto for m in movimientos)
+            for m in movimientos:
+                producto = cargadores.productos.obtener(m.id_producto)  # una sola consulta, en la primera vuelta
+        """
+        return RequestLoaders(self)
+
+    def importar_csv(self, entidad, ruta, rechazos=None, tamano_lote=None, procesos=0, aplicar_stock=True):
+        """
+        Importa un fichero CSV de productos, clientes, proveedores o movimientos por bloques
+        (ver src/core/csv_importer.py).
+        :param rechazos: str, fichero CSV donde guardar las filas rechazadas con su línea y motivo
+        :param procesos: int, procesos para convertir los bloques en ficheros grandes
+        :param aplicar_stock: bool, si los movimientos actualizan el stock
+        :return: dict con leidas, importadas, rechazadas, segundos, filas_s y los primeros errores
+        """
+        # Importación diferida: el importador depende de este módulo
+        from src.core.csv_importer import CSVImporter
+        return CSVImporter(self, tamano_lote, procesos).importar(entidad, ruta, rechazos, aplicar_stock)
+
+    def exportar_movimientos(self, ruta, desde=None, hasta=None, id_productos=None):
+        """
+        Exporta en streaming los movimientos del intervalo [desde, hasta) y de los productos
+        indicados a CSV o JSON Lines, opcionalmente con gzip (ver src/core/exporter.py).
+        :return: dict con filas, bytes, segundos, filas_s y mb_s
+        """
+        # Importación diferida: el exportador depende de este módulo
+        from src.core.exporter import StreamingExporter
+        return StreamingExporter(self).exportar_movimientos(ruta, desde, hasta, id_productos)
+
+    def exportar_productos(self, ruta):
+        """
+        Exporta en streaming todos los productos con su stock actual (ver src/core/exporter.py).
+        :return: dict con filas, bytes, segundos, filas_s y mb_s
+        """
+        from src.core.exporter import StreamingExporter
+        return StreamingExporter(self).exportar_productos(ruta)
+
+    def estadisticas(self):
+        """
+        Devuelve las estadísticas de rendimiento del proceso: por cada consulta normalizada,
+        llamadas, filas, tiempo total y percentiles p50/p95/p99 (en ms); las consultas lentas
+        recientes con el sitio de la llamada; y los contadores de las cachés.
+        """
+        return {
+            "consultas": estadisticas_consultas.resumen(),
+            "lentas": estadisticas_consultas.lentas(),
+            "cache": self.estadisticas_cache(),
+        }
+
+    def volcar_estadisticas(self, destino=None, limite=20):
+        """
+        Escribe en `destino` (por defecto la salida estándar) una tabla con las consultas
+        que más tiempo acumulan y las consultas lentas recientes.
+        """
+        estadisticas_consultas.volcar(destino, limite)
+
+    def reiniciar_estadisticas(self):
+        """
+        Borra las estadísticas de consultas acumuladas.
+        """
+        estadisticas_consultas.reiniciar()
 
     # --- Productos ---
     def agregar_producto(self, *args, **kwargs):
         """
         Crea y agrega un nuevo producto al almacén.
+        :return: Product insertado, o None si la base de datos no lo aceptó
         """
         producto = Product(*args, **kwargs)
-        self.product_dao.crear_producto(producto)
+        if not self.product_dao.crear_producto(producto):
+            return None
         return producto
 
+    def agregar_productos(self, productos, tamano_lote=None):
+        """
+        Agrega varios productos en bloque (una sola transacción, inserciones por lotes).
+        Acepta objetos Product, tuplas con sus campos o dicts.
+        :return: list[(Product, str)] productos rechazados y el motivo
+        """
+        return self.product_dao.crear_productos((_como_modelo(Product, p) for p in productos), tamano_lote)
+
     def obtener_producto(self, id_producto):
         """
-        Obtiene un producto por su ID.
+        Obtiene un producto por su ID (desde la caché si está activada).
+        """
+        if self._cache_productos is None:
+            return self.product_dao.obtener_producto(id_producto)
+        return self._cache_productos.obtener(id_producto, self.product_dao.obtener_producto)
+
+    def obtener_productos(self, ids):
+        """
+        Obtiene varios productos por ID con pocas consultas (los de la caché no se consultan).
+        :return: dict id_producto -> Product (los IDs que no existen no aparecen)
         """
-        return self.product_dao.obtener_producto(id_producto)
+        if self._cache_productos is None:
+            return self.product_dao.obtener_productos(ids)
+        return self._cache_productos.obtener_varios(ids, self.product_dao.obtener_productos)
 
     def actualizar_producto(self, producto):
         """
         Actualiza los datos de un producto existente.
+        :return: Product actualizado, o None si la actualización falló
         """
-        self.product_dao.actualizar_producto(producto)
+        actualizado = self.product_dao.actualizar_producto(producto)
+        self._invalidar_producto(producto.id_producto)
+        return producto if actualizado else None
 
     def eliminar_producto(self, id_producto):
         """
         Elimina un producto por su ID.
+        :return: bool, True si existía y se eliminó
         """
-        self.product_dao.eliminar_producto(id_producto)
+        eliminado = self.product_dao.eliminar_producto(id_producto)
+        self._invalidar_producto(id_producto)
+        return eliminado
 
     def listar_productos(self):
         """
@@ -52,32 +255,115 @@ class InventoryManager:
         """
         return self.product_dao.listar_productos()
 
+    def listar_productos_pagina(self, limite=100, despues_de=None):
+        """
+        Devuelve una página de productos ordenada por ID.
+        :param despues_de: ID del último producto de la página anterior, o None para la primera
+        """
+        return self.product_dao.listar_productos_pagina(limite, despues_de)
+
+    def contar_productos(self):
+        """
+        Devuelve el número total de productos.
+        """
+        return self.product_dao.contar_productos()
+
+    def iter_productos(self, tamano_lote=None):
+        """
+        Recorre todos los productos en streaming, sin cargarlos en memoria.
+        """
+        return self.product_dao.iter_productos(tamano_lote)
+
+    def buscar_productos(self, texto, modo="prefijo", limite=None, despues_de=None):
+        """
+        Busca productos por nombre en la base de datos ("prefijo" o "contiene").
+        """
+        return self.product_dao.buscar_productos(texto, modo, limite, despues_de)
+
+    def buscar_producto_por_sku(self, sku):
+        """
+        Obtiene un producto por su SKU exacto (desde la caché si está activada).
+        """
+        if self._cache_productos is None:
+            return self.product_dao.buscar_por_sku(sku)
+        id_producto = self._cache_skus.consultar(sku)
+        if id_producto is not None:
+            producto = self._cache_productos.consultar(id_producto)
+            if producto is not None and producto.sku == sku:
+                return producto
+        producto = self.product_dao.buscar_por_sku(sku)
+        if producto is not None:
+            self._cache_productos.guardar(producto.id_producto, producto)
+            self._cache_skus.guardar(sku, producto.id_producto)
+        return producto
+
+    def existe_producto(self, id_producto):
+        """
+        Indica si ya existe un producto con ese ID.
+        """
+        return self.product_dao.existe_producto(id_producto)
+
+    def existe_sku(self, sku):
+        """
+        Indica si algún producto usa ya ese SKU.
+        """
+        return self.product_dao.existe_sku(sku)
+
     # --- Clientes ---
     def agregar_cliente(self, *args, **kwargs):
         """
         Crea y agrega un nuevo cliente.
+        :return: Client insertado, o None si la base de datos no lo aceptó
         """
         cliente = Client(*args, **kwargs)
-        self.client_dao.crear_cliente(cliente)
+        if not self.client_dao.crear_cliente(cliente):
+            return None
         return cliente
 
+    def agregar_clientes(self, clientes, tamano_lote=None):
+        """
+        Agrega varios clientes en bloque (una sola transacción, inserciones por lotes).
+        Acepta objetos Client, tuplas con sus campos o dicts.
+        :return: list[(Client, str)] clientes rechazados y el motivo
+        """
+        return self.client_dao.crear_clientes((_como_modelo(Client, c) for c in clientes), tamano_lote)
+
     def obtener_cliente(self, id_cliente):
         """
-        Obtiene un cliente por su ID.
+        Obtiene un cliente por su ID (desde la caché si está activada).
+        """
+        if self._cache_clientes is None:
+            return self.client_dao.obtener_cliente(id_cliente)
+        return self._cache_clientes.obtener(id_cliente, self.client_dao.obtener_cliente)
+
+    def obtener_clientes(self, ids):
+        """
+        Obtiene varios clientes por ID con pocas consultas (los de la caché no se consultan).
+        :return: dict id_cliente -> Client (los IDs que no existen no aparecen)
         """
-        return self.client_dao.obtener_cliente(id_cliente)
+        if self._cache_clientes is None:
+            return self.client_dao.obtener_clientes(ids)
+        return self._cache_clientes.obtener_varios(ids, self.client_dao.obtener_clientes)
 
     def actualizar_cliente(self, cliente):
         """
         Actualiza los datos de un cliente existente.
+        :return: Client actualizado, o None si la actualización falló
         """
-        self.client_dao.actualizar_cliente(cliente)
+        actualizado = self.client_dao.actualizar_cliente(cliente)
+        if self._cache_clientes is not None:
+            self._cache_clientes.invalidar(cliente.id_cliente)
+        return cliente if actualizado else None
 
     def eliminar_cliente(self, id_cliente):
         """
         Elimina un cliente por su ID.
+        :return: bool, True si existía y se eliminó
         """
-        self.client_dao.eliminar_cliente(id_cliente)
+        eliminado = self.client_dao.eliminar_cliente(id_cliente)
+        if self._cache_clientes is not None:
+            self._cache_clientes.invalidar(id_cliente)
+        return eliminado
 
     def listar_clientes(self):
         """
@@ -85,32 +371,92 @@ class InventoryManager:
         """
         return self.client_dao.listar_clientes()
 
+    def listar_clientes_pagina(self, limite=100, despues_de=None):
+        """
+        Devuelve una página de clientes ordenada por ID.
+        :param despues_de: ID del último cliente de la página anterior, o None para la primera
+        """
+        return self.client_dao.listar_clientes_pagina(limite, despues_de)
+
+    def contar_clientes(self):
+        """
+        Devuelve el número total de clientes.
+        """
+        return self.client_dao.contar_clientes()
+
+    def iter_clientes(self, tamano_lote=None):
+        """
+        Recorre todos los clientes en streaming, sin cargarlos en memoria.
+        """
+        return self.client_dao.iter_clientes(tamano_lote)
+
+    def buscar_clientes(self, texto, modo="prefijo", limite=None, despues_de=None):
+        """
+        Busca clientes por nombre en la base de datos ("prefijo" o "contiene").
+        """
+        return self.client_dao.buscar_clientes(texto, modo, limite, despues_de)
+
+    def existe_cliente(self, id_cliente):
+        """
+        Indica si ya existe un cliente con ese ID.
+        """
+        return self.client_dao.existe_cliente(id_cliente)
+
     # --- Proveedores ---
     def agregar_proveedor(self, *args, **kwargs):
         """
         Crea y agrega un nuevo proveedor.
+        :return: Supplier insertado, o None si la base de datos no lo aceptó
         """
         proveedor = Supplier(*args, **kwargs)
-        self.supplier_dao.crear_proveedor(proveedor)
+        if not self.supplier_dao.crear_proveedor(proveedor):
+            return None
         return proveedor
 
+    def agregar_proveedores(self, proveedores, tamano_lote=None):
+        """
+        Agrega varios proveedores en bloque (una sola transacción, inserciones por lotes).
+        Acepta objetos Supplier, tuplas con sus campos o dicts.
+        :return: list[(Supplier, str)] proveedores rechazados y el motivo
+        """
+        return self.supplier_dao.crear_proveedores((_como_modelo(Supplier, p) for p in proveedores), tamano_lote)
+
     def obtener_proveedor(self, id_proveedor):
         """
-        Obtiene un proveedor por su ID.
+        Obtiene un proveedor por su ID (desde la caché si está activada).
         """
-        return self.supplier_dao.obtener_proveedor(id_proveedor)
+        if self._cache_proveedores is None:
+            return self.supplier_dao.obtener_proveedor(id_proveedor)
+        return self._cache_proveedores.obtener(id_proveedor, self.supplier_dao.obtener_proveedor)
+
+    def obtener_proveedores(self, ids):
+        """
+        Obtiene varios proveedores por ID con pocas consultas (los de la caché no se consultan).
+        :return: dict id_proveedor -> Supplier (los IDs que no existen no aparecen)
+        """
+        if self._cache_proveedores is None:
+            return self.supplier_dao.obtener_proveedores(ids)
+        return self._cache_proveedores.obtener_varios(ids, self.supplier_dao.obtener_proveedores)
 
     def actualizar_proveedor(self, proveedor):
         """
         Actualiza los datos de un proveedor existente.
+        :return: Supplier actualizado, o None si la actualización falló
         """
-        self.supplier_dao.actualizar_proveedor(proveedor)
+        actualizado = self.supplier_dao.actualizar_proveedor(proveedor)
+        if self._cache_proveedores is not None:
+            self._cache_proveedores.invalidar(proveedor.id_proveedor)
+        return proveedor if actualizado else None
 
     def eliminar_proveedor(self, id_proveedor):
         """
         Elimina un proveedor por su ID.
+        :return: bool, True si existía y se eliminó
         """
-        self.supplier_dao.eliminar_proveedor(id_proveedor)
+        eliminado = self.supplier_dao.eliminar_proveedor(id_proveedor)
+        if self._cache_proveedores is not None:
+            self._cache_proveedores.invalidar(id_proveedor)
+        return eliminado
 
     def listar_proveedores(self):
         """
@@ -118,32 +464,138 @@ class InventoryManager:
         """
         return self.supplier_dao.listar_proveedores()
 
+    def listar_proveedores_pagina(self, limite=100, despues_de=None):
+        """
+        Devuelve una página de proveedores ordenada por ID.
+        :param despues_de: ID del último proveedor de la página anterior, o None para la primera
+        """
+        return self.supplier_dao.listar_proveedores_pagina(limite, despues_de)
+
+    def contar_proveedores(self):
+        """
+        Devuelve el número total de proveedores.
+        """
+        return self.supplier_dao.contar_proveedores()
+
+    def iter_proveedores(self, tamano_lote=None):
+        """
+        Recorre todos los proveedores en streaming, sin cargarlos en memoria.
+        """
+        return self.supplier_dao.iter_proveedores(tamano_lote)
+
+    def buscar_proveedores(self, texto, modo="prefijo", limite=None, despues_de=None):
+        """
+        Busca proveedores por nombre en la base de datos ("prefijo" o "contiene").
+        """
+        return self.supplier_dao.buscar_proveedores(texto, modo, limite, despues_de)
+
+    def existe_proveedor(self, id_proveedor):
+        """
+        Indica si ya existe un proveedor con ese ID.
+        """
+        return self.supplier_dao.existe_proveedor(id_proveedor)
+
     # --- Movimientos ---
     def registrar_movimiento(self, *args, **kwargs):
         """
-        Registra un nuevo movimiento de inventario (entrada/salida).
+        Registra un nuevo movimiento de inventario (entrada/salida) y actualiza el stock
+        del producto en la misma transacción.
+        :return: Movement registrado, o None si la base de datos no lo aceptó
+        :raises ValueError: si el tipo o la cantidad no son válidos
+        :raises StockInsuficienteError: si una salida dejaría el stock en negativo
         """
         movimiento = Movement(*args, **kwargs)
-        self.movement_dao.crear_movimiento(movimiento)
+        _validar_movimiento(movimiento)
+        try:
+            if not self.movement_dao.crear_movimiento_con_stock(movimiento):
+                return None
+        finally:
+            # El stock del producto ha podido cambiar
+            self._invalidar_stock(movimiento.id_producto)
         return movimiento
 
+    def registrar_movimientos(self, movimientos, tamano_lote=None):
+        """
+        Registra varios movimientos en bloque (una sola transacción, inserciones por lotes)
+        aplicando sus ajustes de stock. Las salidas sin stock suficiente se rechazan.
+        Acepta objetos Movement, tuplas con sus campos o dicts.
+        :return: list[(Movement, str)] movimientos rechazados y el motivo
+        """
+        validos = []
+        rechazados = []
+        for datos in movimientos:
+            movimiento = _como_modelo(Movement, datos)
+            try:
+                _validar_movimiento(movimiento)
+                validos.append(movimiento)
+            except ValueError as e:
+                rechazados.append((movimiento, str(e)))
+        fallos = self.movement_dao.crear_movimientos_con_stock(validos, tamano_lote)
+        for id_producto in {m.id_producto for m in validos}:
+            self._invalidar_stock(id_producto)
+        return rechazados + fallos
+
+    def agregar_movimientos(self, movimientos, tamano_lote=None):
+        """
+        Agrega varios movimientos en bloque como histórico, sin modificar el stock de los
+        productos (para importar movimientos ya reflejados en stock_actual).
+        Acepta objetos Movement, tuplas con sus campos o dicts.
+        :return: list[(Movement, str)] movimientos rechazados y el motivo
+        """
+        validos = []
+        rechazados = []
+        for datos in movimientos:
+            movimiento = _como_modelo(Movement, datos)
+            try:
+                _validar_movimiento(movimiento)
+                validos.append(movimiento)
+            except ValueError as e:
+                rechazados.append((movimiento, str(e)))
+        return rechazados + self.movement_dao.crear_movimientos(validos, tamano_lote)
+
     def obtener_movimiento(self, id_movimiento):
         """
         Obtiene un movimiento por su ID.
         """
         return self.movement_dao.obtener_movimiento(id_movimiento)
 
-    def actualizar_movimiento(self, movimiento):
+    def obtener_movimientos(self, ids):
+        """
+        Obtiene varios movimientos por ID con pocas consultas.
+        :return: dict id_movimiento -> Movement (los IDs que no existen no aparecen)
         """
-        Actualiza los datos de un movimiento existente.
+        return self.movement_dao.obtener_movimientos(ids)
+
+    def actualizar_movimiento(self, movimiento):
         """
-        self.movement_dao.actualizar_movimiento(movimiento)
+        Actualiza los datos de un movimiento existente y corrige el stock de los productos
+        afectados en la misma transacción.
+        :return: Movement actualizado, o None si no existía o la actualización falló
+        :raises ValueError: si el tipo o la cantidad no son válidos
+        :raises StockInsuficienteError: si el cambio dejaría el stock en negativo
+        """
+        _validar_movimiento(movimiento)
+        # La transacción devuelve el movimiento tal como estaba, leído dentro de ella; si lanza
+        # StockInsuficienteError no se ha cambiado nada y la caché sigue siendo válida
+        anterior = self.movement_dao.actualizar_movimiento_con_stock(movimiento)
+        if anterior is None:
+            return None
+        # El stock del producto anterior y del nuevo ha cambiado
+        self._invalidar_stock(anterior.id_producto)
+        self._invalidar_stock(movimiento.id_producto)
+        return movimiento
 
     def eliminar_movimiento(self, id_movimiento):
         """
-        Elimina un movimiento por su ID.
+        Elimina un movimiento por su ID y deshace su efecto en el stock del producto.
+        :return: bool, True si existía y se eliminó
+        :raises StockInsuficienteError: si al deshacer una entrada el stock quedaría en negativo
         """
-        self.movement_dao.eliminar_movimiento(id_movimiento)
+        eliminado = self.movement_dao.eliminar_movimiento_con_stock(id_movimiento)
+        if eliminado is None:
+            return False
+        self._invalidar_stock(eliminado.id_producto)
+        return True
 
     def listar_movimientos(self):
         """
@@ -151,4 +603,56 @@ class InventoryManager:
         """
         return self.movement_dao.listar_movimientos()
 
-    
+    def listar_movimientos_pagina(self, limite=100, despues_de=None, por_fecha=False, descendente=False):
+        """
+        Devuelve una página de movimientos ordenada por ID o por fecha.
+        :param despues_de: cursor de la página anterior (ver cursor_movimiento), o None para la primera
+        """
+        return self.movement_dao.listar_movimientos_pagina(limite, despues_de, por_fecha, descendente)
+
+    def cursor_movimiento(self, movimiento, por_fecha=False):
+        """
+        Devuelve el cursor para pedir la página que sigue a `movimiento`.
+        """
+        return self.movement_dao.cursor_pagina(movimiento, por_fecha)
+
+    def contar_movimientos(self):
+        """
+        Devuelve el número total de movimientos.
+        """
+        return self.movement_dao.contar_movimientos()
+
+    def iter_movimientos(self, tamano_lote=None, desde=None, hasta=None, id_productos=None):
+        """
+        Recorre los movimientos en streaming, sin cargarlos en memoria, opcionalmente
+        filtrados por intervalo de fechas [desde, hasta) y por productos.
+        """
+        return self.movement_dao.iter_movimientos(tamano_lote, desde, hasta, id_productos)
+
+    def buscar_movimientos_por_fecha(self, desde=None, hasta=None, limite=None, despues_de=None):
+        """
+        Devuelve los movimientos con fecha en el intervalo [desde, hasta).
+        """
+        return self.movement_dao.buscar_movimientos_por_fecha(desde, hasta, limite, despues_de)
+
+    def listar_movimientos_detalle(self, limite=100, despues_de=None, desde=None, hasta=None):
+        """
+        Devuelve una página de movimientos con el nombre y el SKU de su producto y el nombre de su
+        cliente o proveedor, obtenida con una sola consulta. Sin filtro de fechas se ordena por ID
+        (cursor: ID); con [desde, hasta), por fecha (cursor: (fecha_movimiento, id_movimiento)).
+        :return: list[MovementDetail]
+        """
+        return self.movement_dao.listar_detalles_pagina(limite, despues_de, desde, hasta)
+
+    def obtener_movimiento_detalle(self, id_movimiento):
+        """
+        Obtiene un movimiento con los datos de su producto y su cliente o proveedor.
+        :return: MovementDetail o None
+        """
+        return self.movement_dao.obtener_detalle(id_movimiento)
+
+    def existe_movimiento(self, id_movimiento):
+        """
+        Indica si ya existe un movimiento con ese ID.
+        """
+        return self.movement_dao.existe_movimiento(id_movimiento)
@@ -0,0 +1,180 @@
+# Grabación diferida de movimientos para entradas de alta frecuencia (escáneres)
+import os
+import threading
+import time
+from collections import deque
+from src.core.inventory_manager import _como_modelo, _validar_movimiento
+from src.models.movement import Movement
+
+# Parámetros por defecto del grabador (opcionales en .env)
+movement_buffer_batch = int(os.getenv('MOVEMENT_BUFFER_BATCH', '200'))
+movement_buffer_interval = float(os.getenv('MOVEMENT_BUFFER_INTERVAL', '0.5'))
+movement_buffer_capacity = int(os.getenv('MOVEMENT_BUFFER_CAPACITY', '10000'))
+
+
+class ColaLlenaError(Exception):
+    """
+    Se lanza cuando la cola del grabador sigue llena después del tiempo de espera:
+    la base de datos no da abasto y quien registra debe frenar o avisar.
+    """
+    def __init__(self, pendientes):
+        super().__init__(f"La cola de movimientos está llena ({pendientes} pendientes de grabar).")
+        self.pendientes = pendientes
+
+
+class BufferedMovementRecorder:
+    """
+    Registra movimientos de forma asíncrona: registrar() solo valida y encola, y un hilo en
+    segundo plano los graba en bloques con InventoryManager.registrar_movimientos() (una
+    transacción por bloque) cuando se juntan `tamano_lote` movimientos o cuando el más antiguo
+    lleva `intervalo` segundos esperando.
+
+    Un movimiento encolado no está grabado hasta que flush() o close() terminan: si el proceso
+    muere antes se pierde. Los movimientos que la base de datos rechaza (p. ej. salidas sin
+    stock) se guardan en `rechazados` y se notifican a `al_rechazar`.
+
+    Uso:
+        with BufferedMovementRecorder(manager) as grabador:
+            grabador.registrar((id_movimiento, id_producto, "salida", 1, fecha, ref, usuario, cliente))
+    """
+    def __init__(self, manager, tamano_lote=None, intervalo=None, capacidad=None, espera=1.0, al_rechazar=None):
+        """
+        :param manager: InventoryManager con el que se graban los movimientos
+        :param tamano_lote: int, movimientos por bloque (por defecto MOVEMENT_BUFFER_BATCH)
+        :param intervalo: float, segundos máximos que un movimiento espera en la cola (por defecto MOVEMENT_BUFFER_INTERVAL)
+        :param capacidad: int, movimientos pendientes a partir de los cuales registrar() espera (por defecto MOVEMENT_BUFFER_CAPACITY)
+        :param espera: float, segundos que registrar() espera con la cola llena antes de lanzar ColaLlenaError
+        :param al_rechazar: función (Movement, motivo) llamada desde el hilo de grabación por cada rechazo
+        """
+        self.manager = manager
+        self.tamano_lote = max(1, tamano_lote or movement_buffer_batch)
+        self.intervalo = intervalo if intervalo is not None else movement_buffer_interval
+        self.capacidad = max(1, capacidad or movement_buffer_capacity)
+        self.espera = espera
+        self.al_rechazar = al_rechazar
+        self.rechazados = deque(maxlen=1000)
+        self._cola = deque()    # (instante en que se encoló, Movement), del más antiguo al más reciente
+        self._condicion = threading.Condition()
+        self._encolados = 0     # total de movimientos aceptados por registrar()
+        self._grabados = 0      # total de movimientos ya procesados (grabados o rechazados)
+        self._vaciar_hasta = 0  # flush() pide grabar hasta este número de encolados
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._bucle, name="grabador-movimientos", daemon=True)
+        self._hilo.start()
+
+    @property
+    def pendientes(self):
+        """
+        Número de movimientos encolados que aún no se han grabado.
+        """
+        with self._condicion:
+            return self._encolados - self._grabados
+
+    def registrar(self, movimiento, espera=None):
+        """
+        Valida un movimiento y lo encola para grabarlo en segundo plano.
+        Acepta un objeto Movement, una tupla con sus campos o un dict.
+        :param espera: float, segundos de espera si la cola está llena (por defecto el del constructor)
+        :return: Movement encolado
+        :raises ValueError: si el tipo o la cantidad no son válidos
+        :raises ColaLlenaError: si la cola sigue llena tras la espera
+        :raises RuntimeError: si el grabador ya está cerrado
+        """
+        movimiento = _como_modelo(Movement, movimiento)
+        _validar_movimiento(movimiento)
+        espera = self.espera if espera is None else espera
+        with self._condicion:
+            limite = time.monotonic() + espera
+            while not self._cerrado and len(self._cola) >= self.capacidad:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise ColaLlenaError(len(self._cola))
+                self._condicion.wait(restante)
+            if self._cerrado:
+                raise RuntimeError("El grabador de movimientos está cerrado.")
+            self._cola.append((time.monotonic(), movimiento))
+            self._encolados += 1
+            if len(self._cola) == 1 or len(self._cola) >= self.tamano_lote:
+                self._condicion.notify_all()
+        return movimiento
+
+    def flush(self, timeout=None):
+        """
+        Graba todo lo encolado hasta ahora sin esperar a los umbrales y bloquea hasta que
+        esté confirmado en la base de datos (o rechazado).
+        :param timeout: float, segundos máximos de espera (None espera lo necesario)
+        :return: bool, False si se agotó el tiempo antes de terminar
+        """
+        with self._condicion:
+            objetivo = self._encolados
+            self._vaciar_hasta = max(self._vaciar_hasta, objetivo)
+            self._condicion.notify_all()
+            return self._condicion.wait_for(lambda: self._grabados >= objetivo or not self._hilo.is_alive(),
+                                            timeout) and self._grabados >= objetivo
+
+    def close(self, timeout=None):
+        """
+        Deja de aceptar movimientos, graba los pendientes y detiene el hilo de grabación.
+        :return: bool, False si quedaron movimientos sin grabar al agotarse el tiempo
+        """
+        with self._condicion:
+            self._cerrado = True
+            self._condicion.notify_all()
+        self._hilo.join(timeout)
+        return not self._hilo.is_alive()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.close()
+
+    def _siguiente_lote(self):
+        """
+        Espera a que se cumpla algún umbral y saca de la cola el siguiente bloque.
+        Devuelve None cuando el grabador está cerrado y la cola vacía.
+        """
+        with self._condicion:
+            while True:
+                if len(self._cola) >= self.tamano_lote:
+                    break
+                if self._cola and (self._cerrado or self._vaciar_hasta > self._grabados):
+                    break
+                if not self._cola:
+                    if self._cerrado:
+                        return None
+                    self._condicion.wait()
+                    continue
+                # El plazo lo marca el movimiento más antiguo que sigue en la cola
+                restante = self._cola[0][0] + self.intervalo - time.monotonic()
+                if restante <= 0:
+                    break
+                self._condicion.wait(restante)
+            lote = [self._cola.popleft()[1] for _ in range(min(self.tamano_lote, len(self._cola)))]
+            # Hay hueco en la cola para quien estuviera esperando
+            self._condicion.notify_all()
+            return lote
+
+    def _bucle(self):
+        """
+        Hilo de grabación: graba bloques hasta que se cierra el grabador.
+        """
+        while True:
+            lote = self._siguiente_lote()
+            if lote is None:
+                return
+            try:
+                fallos = self.manager.registrar_movimientos(lote, self.tamano_lote)
+            except Exception as e:
+                print(f"Error al grabar movimientos: {e}")
+                fallos = [(m, str(e)) for m in lote]
+            for movimiento, motivo in fallos:
+                self.rechazados.append((movimiento, motivo))
+                if self.al_rechazar:
+                    try:
+                        self.al_rechazar(movimiento, motivo)
+                    except Exception as e:
+                        print(f"Error al notificar un movimiento rechazado: {e}")
+            with self._condicion:
+                self._grabados += len(lote)
+                self._condicion.notify_all()
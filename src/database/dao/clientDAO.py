@@ -1,6 +1,7 @@
 # DAO para la entidad Cliente
-from src.database.db_manager import db_manager, host, user, password, database
+from src.database.db_manager import crear_db_manager, patron_like, sentencia, lotes_in
 from src.models.client import Client
+from src.models.factory import fabrica_filas
 
 
 class clientDAO:
@@ -8,20 +9,63 @@ class clientDAO:
     DAO para operaciones CRUD sobre la entidad Cliente.
     """
     def __init__(self):
-        self.db = db_manager(host, user, password, database)
+        self.db = crear_db_manager()
+
+    # Conversión de listas de filas en objetos Client
+    _a_modelos = staticmethod(fabrica_filas(Client))
+
+    # Columnas en el orden del constructor de Client
+    _COLUMNAS = "id_cliente, nombre_cliente, telefono, email, direccion"
+
+    # Sentencia de inserción compartida por las altas individuales y masivas
+    _SQL_INSERTAR = sentencia("INSERT INTO clientes (id_cliente, nombre_cliente, direccion, telefono, email) "
+                              "VALUES (%s, %s, %s, %s, %s)")
+
+    # Sentencias fijas: se clasifican (lectura o escritura) al definir la clase y cada conexión
+    # las prepara una sola vez (ver db_manager.sentencia)
+    _SQL_OBTENER = sentencia(f"SELECT {_COLUMNAS} FROM clientes WHERE id_cliente = %s")
+    _SQL_ACTUALIZAR = sentencia("UPDATE clientes SET nombre_cliente=%s, direccion=%s, telefono=%s, email=%s "
+                                "WHERE id_cliente=%s")
+    _SQL_ELIMINAR = sentencia("DELETE FROM clientes WHERE id_cliente = %s")
+    _SQL_EXISTE = sentencia("SELECT 1 FROM clientes WHERE id_cliente = %s LIMIT 1")
+    _SQL_CONTAR = sentencia("SELECT COUNT(*) FROM clientes")
+    _SQL_PRIMERA_PAGINA = sentencia(f"SELECT {_COLUMNAS} FROM clientes ORDER BY id_cliente LIMIT %s")
+    _SQL_PAGINA_SIGUIENTE = sentencia(f"SELECT {_COLUMNAS} FROM clientes WHERE id_cliente > %s "
+                                      "ORDER BY id_cliente LIMIT %s")
+
+    @staticmethod
+    def _valores(cliente):
+        """
+        Devuelve los valores de inserción de un cliente en el orden de _SQL_INSERTAR.
+        """
+        return (cliente.id_cliente, cliente.nombre_cliente, cliente.direccion, cliente.telefono, cliente.email)
 
     def crear_cliente(self, cliente):
         """
         Inserta un nuevo cliente en la base de datos.
         :param cliente: Client
+        :return: bool, True si se insertó
         """
         try:
-            query = ("INSERT INTO clientes (id_cliente, nombre_cliente, direccion, telefono, email) "
-                    "VALUES (%s, %s, %s, %s, %s)")
-            values = (cliente.id_cliente, cliente.nombre_cliente, cliente.direccion, cliente.telefono, cliente.email)
-            self.db.execute_query(query, values)
+            return self.db.execute_query(self._SQL_INSERTAR, self._valores(cliente), rowcount=True) == 1
         except Exception as e:
             print(f"Error al crear cliente: {e}")
+            return False
+
+    def crear_clientes(self, clientes, tamano_lote=None):
+        """
+        Inserta varios clientes en una única transacción, en lotes de `tamano_lote` filas.
+        :param clientes: iterable de Client
+        :param tamano_lote: int, filas por sentencia (por defecto DB_BULK_CHUNK_SIZE)
+        :return: list[(Client, str)] clientes rechazados y el motivo
+        """
+        clientes = list(clientes)
+        try:
+            fallos = self.db.execute_many(self._SQL_INSERTAR, [self._valores(c) for c in clientes], tamano_lote)
+            return [(clientes[i], error) for i, error in fallos]
+        except Exception as e:
+            print(f"Error al crear clientes: {e}")
+            return [(c, str(e)) for c in clientes]
 
     def obtener_cliente(self, id_cliente):
         """
@@ -30,8 +74,7 @@ class clientDAO:
         :return: Client o None
         """
         try:
-            query = "SELECT * FROM clientes WHERE id_cliente = %s"
-            row = self.db.execute_query(query, (id_cliente,), fetch_one=True)
+            row = self.db.execute_query(self._SQL_OBTENER, (id_cliente,), fetch_one=True)
             if row:
                 return Client(*row)
             return None
@@ -39,29 +82,49 @@ class clientDAO:
             print(f"Error al obtener cliente: {e}")
             return None
 
+    def obtener_clientes(self, ids):
+        """
+        Obtiene varios clientes por ID con consultas `IN (...)` por lotes, en lugar de una por ID.
+        :param ids: iterable de int (se ignoran los repetidos y los None)
+        :return: dict id_cliente -> Client (los IDs que no existen no aparecen)
+        """
+        try:
+            clientes = {}
+            for marcadores, lote in lotes_in(ids):
+                query = sentencia(f"SELECT {self._COLUMNAS} FROM clientes WHERE id_cliente IN ({marcadores})")
+                rows = self.db.execute_query(query, lote, fetch_all=True)
+                for cliente in self._a_modelos(rows or []):
+                    clientes[cliente.id_cliente] = cliente
+            return clientes
+        except Exception as e:
+            print(f"Error al obtener clientes: {e}")
+            return {}
+
     def actualizar_cliente(self, cliente):
         """
         Actualiza los datos de un cliente existente.
         :param cliente: Client
+        :return: bool, True si la sentencia se ejecutó sin errores
         """
         try:
-            query = ("UPDATE clientes SET nombre_cliente=%s, direccion=%s, telefono=%s, email=%s "
-                    "WHERE id_cliente=%s")
             values = (cliente.nombre_cliente, cliente.direccion, cliente.telefono, cliente.email, cliente.id_cliente)
-            self.db.execute_query(query, values)
+            # MySQL solo cuenta las filas que cambian, así que no se exige rowcount > 0
+            return self.db.execute_query(self._SQL_ACTUALIZAR, values, rowcount=True) is not None
         except Exception as e:
             print(f"Error al actualizar cliente: {e}")
+            return False
 
     def eliminar_cliente(self, id_cliente):
         """
         Elimina un cliente por su ID.
         :param id_cliente: int
+        :return: bool, True si existía y se eliminó
         """
         try:
-            query = "DELETE FROM clientes WHERE id_cliente = %s"
-            self.db.execute_query(query, (id_cliente,))
+            return bool(self.db.execute_query(self._SQL_ELIMINAR, (id_cliente,), rowcount=True))
         except Exception as e:
             print(f"Error al eliminar cliente: {e}")
+            return False
 
     def listar_clientes(self):
         """
@@ -69,12 +132,12 @@ class clientDAO:
         :return: list[Client]
         """
         try:
-            query = "SELECT id_cliente, nombre_cliente, direccion, telefono, email FROM clientes"
+            query = f"SELECT {self._COLUMNAS} FROM clientes"
             rows = self.db.execute_query(query, fetch_all=True)
             if rows is None:
                 return []
             if isinstance(rows, list):
-                return [Client(*row) for row in rows]
+                return self._a_modelos(rows)
             # Si rows no es una lista, intenta convertirlo en lista si es posible
             try:
                 return [Client(*rows)]
@@ -83,3 +146,88 @@ class clientDAO:
         except Exception as e:
             print(f"Error al listar clientes: {e}")
             return []
+
+    def listar_clientes_pagina(self, limite=100, despues_de=None):
+        """
+        Devuelve una página de clientes ordenada por ID usando paginación por clave
+        (solo lee las filas de la página, sin OFFSET).
+        :param limite: int, tamaño de página
+        :param despues_de: int o None, ID del último cliente de la página anterior
+        :return: list[Client]
+        """
+        try:
+            if despues_de is None:
+                query = self._SQL_PRIMERA_PAGINA
+                params = (limite,)
+            else:
+                query = self._SQL_PAGINA_SIGUIENTE
+                params = (despues_de, limite)
+            rows = self.db.execute_query(query, params, fetch_all=True)
+            return self._a_modelos(rows or [])
+        except Exception as e:
+            print(f"Error al listar página de clientes: {e}")
+            return []
+
+    def contar_clientes(self):
+        """
+        Devuelve el número total de clientes.
+        :return: int
+        """
+        try:
+            row = self.db.execute_query(self._SQL_CONTAR, fetch_one=True)
+            return row[0] if row else 0
+        except Exception as e:
+            print(f"Error al contar clientes: {e}")
+            return 0
+
+    def buscar_clientes(self, texto, modo="prefijo", limite=None, despues_de=None):
+        """
+        Busca clientes por nombre en el servidor, devolviendo solo las filas que coinciden.
+        :param texto: str, texto a buscar (sin distinguir mayúsculas)
+        :param modo: "prefijo" (nombre empieza por el texto, usa el índice) o "contiene"
+        :param limite: int o None, número máximo de resultados
+        :param despues_de: int o None, ID del último resultado de la página anterior
+        :return: list[Client]
+        """
+        try:
+            query = f"SELECT {self._COLUMNAS} FROM clientes WHERE nombre_cliente LIKE %s ESCAPE '!'"
+            params = [patron_like(texto, modo)]
+            if despues_de is not None:
+                # El "+" impide que SQLite recorra la clave primaria desde el cursor en lugar de
+                # usar el índice del nombre (MySQL lo ignora)
+                query += " AND +id_cliente > %s"
+                params.append(despues_de)
+            query += " ORDER BY id_cliente"
+            if limite is not None:
+                query += " LIMIT %s"
+                params.append(limite)
+            rows = self.db.execute_query(query, tuple(params), fetch_all=True)
+            return self._a_modelos(rows or [])
+        except Exception as e:
+            print(f"Error al buscar clientes: {e}")
+            return []
+
+    def existe_cliente(self, id_cliente):
+        """
+        Indica si existe un cliente con el ID dado (una única búsqueda por clave primaria).
+        :param id_cliente: int
+        :return: bool
+        """
+        try:
+            return self.db.execute_query(self._SQL_EXISTE, (id_cliente,), fetch_one=True) is not None
+        except Exception as e:
+            print(f"Error al comprobar cliente: {e}")
+            return False
+
+    def iter_clientes(self, tamano_lote=None):
+        """
+        Recorre todos los clientes ordenados por ID sin cargarlos en memoria: las filas se leen
+        del servidor en bloques de `tamano_lote` y se convierten en objetos a medida que se piden.
+        :param tamano_lote: int, filas por lectura (por defecto DB_STREAM_BATCH_SIZE)
+        :return: generador de Client
+        :raises Exception: el error de la base de datos si el recorrido falla a mitad; no se captura
+                           para que quien recorre la tabla no confunda un fallo con el final
+        """
+        query = f"SELECT {self._COLUMNAS} FROM clientes ORDER BY id_cliente"
+        for row in self.db.iter_query(query, batch_size=tamano_lote):
+            yield Client(*row)
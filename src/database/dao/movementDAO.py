@@ -1,5 +1,21 @@
-from src.database.db_manager import db_manager, host, user, password, database
+from src.database.db_manager import crear_db_manager, bulk_chunk_size, sentencia, lotes_in
 from src.models.movement import Movement
+from src.models.movement_detail import MovementDetail
+from src.models.factory import fabrica_filas
+
+
+class StockInsuficienteError(Exception):
+    """
+    Se lanza cuando una salida dejaría el stock del producto por debajo de cero.
+    """
+    def __init__(self, movimiento, operacion=None):
+        """
+        :param movimiento: movement que no se pudo aplicar
+        :param operacion: str, lo que se intentaba (por defecto la salida del movimiento)
+        """
+        operacion = operacion or f"una salida de {movimiento.cantidad} unidades"
+        super().__init__(f"Stock insuficiente en el producto {movimiento.id_producto} para {operacion}.")
+        self.movimiento = movimiento
 
 
 class movementDAO:
@@ -7,29 +23,89 @@ class movementDAO:
     DAO para operaciones CRUD sobre la entidad Movimiento.
     """
     def __init__(self):
-        self.db = db_manager(host, user, password, database)
+        self.db = crear_db_manager()
+
+    # Conversión de listas de filas en objetos Movement y MovementDetail
+    _a_modelos = staticmethod(fabrica_filas(Movement))
+    _a_detalles = staticmethod(fabrica_filas(MovementDetail))
+
+    # Columnas en el orden del constructor de Movement
+    _COLUMNAS = "id_movimiento, id_producto, tipo_movimiento, cantidad, fecha_movimiento, referencia_origen, id_usuario, id_cliente_proveedor"
+    # Nombres de las columnas en el orden de las tuplas que entrega iter_filas
+    COLUMNAS = tuple(c.strip() for c in _COLUMNAS.split(","))
+
+    # Sentencia de inserción compartida por las altas individuales y masivas
+    _SQL_INSERTAR = sentencia("INSERT INTO movimientos (id_movimiento, id_producto, tipo_movimiento, cantidad, fecha_movimiento, referencia_origen, id_usuario, id_cliente_proveedor) "
+                              "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)")
+
+    # Sentencias fijas: se clasifican (lectura o escritura) al definir la clase y cada conexión
+    # las prepara una sola vez (ver db_manager.sentencia)
+    _SQL_OBTENER = sentencia(f"SELECT {_COLUMNAS} FROM movimientos WHERE id_movimiento = %s")
+    _SQL_ACTUALIZAR = sentencia("UPDATE movimientos SET id_producto=%s, tipo_movimiento=%s, cantidad=%s, fecha_movimiento=%s, referencia_origen=%s, id_usuario=%s, id_cliente_proveedor=%s "
+                                "WHERE id_movimiento=%s")
+    _SQL_ELIMINAR = sentencia("DELETE FROM movimientos WHERE id_movimiento = %s")
+    _SQL_EXISTE = sentencia("SELECT 1 FROM movimientos WHERE id_movimiento = %s LIMIT 1")
+    _SQL_CONTAR = sentencia("SELECT COUNT(*) FROM movimientos")
+
+    # Movimientos con su producto y su cliente (salidas) o proveedor (entradas), en el orden de
+    # MovementDetail. Todas las uniones son por clave primaria, así que con ORDER BY ... LIMIT
+    # solo se leen las filas de la página.
+    _SQL_DETALLE = ("SELECT m.id_movimiento, m.id_producto, m.tipo_movimiento, m.cantidad, m.fecha_movimiento, "
+                    "m.referencia_origen, m.id_usuario, m.id_cliente_proveedor, p.nombre_producto, p.sku, "
+                    "COALESCE(c.nombre_cliente, pr.nombre_proveedor) "
+                    "FROM movimientos m "
+                    "LEFT JOIN productos p ON p.id_producto = m.id_producto "
+                    "LEFT JOIN clientes c ON m.tipo_movimiento = 'salida' AND c.id_cliente = m.id_cliente_proveedor "
+                    "LEFT JOIN proveedores pr ON m.tipo_movimiento = 'entrada' AND pr.id_proveedor = m.id_cliente_proveedor")
+    _SQL_OBTENER_DETALLE = sentencia(_SQL_DETALLE + " WHERE m.id_movimiento = %s")
+
+    @staticmethod
+    def _valores(movimiento):
+        """
+        Devuelve los valores de inserción de un movimiento en el orden de _SQL_INSERTAR.
+        """
+        return (
+            movimiento.id_movimiento,
+            movimiento.id_producto,
+            movimiento.tipo_movimiento,
+            movimiento.cantidad,
+            movimiento.fecha_movimiento,
+            movimiento.referencia_origen,
+            movimiento.id_usuario,
+            movimiento.id_cliente_proveedor
+        )
+
+    # Ajustes de stock: la salida solo se aplica si no deja el stock en negativo
+    _SQL_ENTRADA_STOCK = sentencia("UPDATE productos SET stock_actual = COALESCE(stock_actual, 0) + %s WHERE id_producto = %s")
+    _SQL_SALIDA_STOCK = sentencia("UPDATE productos SET stock_actual = COALESCE(stock_actual, 0) - %s "
+                                  "WHERE id_producto = %s AND COALESCE(stock_actual, 0) >= %s")
 
     def crear_movimiento(self, movimiento):
         """
         Inserta un nuevo movimiento en la base de datos.
         :param movimiento: movement
+        :return: bool, True si se insertó
         """
         try:
-            query = ("INSERT INTO movimientos (id_movimiento, id_producto, tipo_movimiento, cantidad, fecha_movimiento, referencia_origen, id_usuario, id_cliente_proveedor) "
-                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)")
-            values = (
-                movimiento.id_movimiento,
-                movimiento.id_producto,
-                movimiento.tipo_movimiento,
-                movimiento.cantidad,
-                movimiento.fecha_movimiento,
-                movimiento.referencia_origen,
-                movimiento.id_usuario,
-                movimiento.id_cliente_proveedor
-            )
-            self.db.execute_query(query, values)
+            return self.db.execute_query(self._SQL_INSERTAR, self._valores(movimiento), rowcount=True) == 1
         except Exception as e:
             print(f"Error al crear movimiento: {e}")
+            return False
+
+    def crear_movimientos(self, movimientos, tamano_lote=None):
+        """
+        Inserta varios movimientos en una única transacción, en lotes de `tamano_lote` filas.
+        :param movimientos: iterable de movement
+        :param tamano_lote: int, filas por sentencia (por defecto DB_BULK_CHUNK_SIZE)
+        :return: list[(movement, str)] movimientos rechazados y el motivo
+        """
+        movimientos = list(movimientos)
+        try:
+            fallos = self.db.execute_many(self._SQL_INSERTAR, [self._valores(m) for m in movimientos], tamano_lote)
+            return [(movimientos[i], error) for i, error in fallos]
+        except Exception as e:
+            print(f"Error al crear movimientos: {e}")
+            return [(m, str(e)) for m in movimientos]
 
     def obtener_movimiento(self, id_movimiento):
         """
@@ -38,8 +114,7 @@ class movementDAO:
         :return: movement o None
         """
         try:
-            query = "SELECT id_movimiento, id_producto, tipo_movimiento, cantidad, fecha_movimiento, referencia_origen, id_usuario, id_cliente_proveedor FROM movimientos WHERE id_movimiento = %s"
-            row = self.db.execute_query(query, (id_movimiento,), fetch_one=True)
+            row = self.db.execute_query(self._SQL_OBTENER, (id_movimiento,), fetch_one=True)
             if row:
                 return Movement(*row)
             return None
@@ -47,14 +122,31 @@ class movementDAO:
             print(f"Error al obtener movimiento: {e}")
             return None
 
+    def obtener_movimientos(self, ids):
+        """
+        Obtiene varios movimientos por ID con consultas `IN (...)` por lotes, en lugar de una por ID.
+        :param ids: iterable de int (se ignoran los repetidos y los None)
+        :return: dict id_movimiento -> movement (los IDs que no existen no aparecen)
+        """
+        try:
+            movimientos = {}
+            for marcadores, lote in lotes_in(ids):
+                query = sentencia(f"SELECT {self._COLUMNAS} FROM movimientos WHERE id_movimiento IN ({marcadores})")
+                rows = self.db.execute_query(query, lote, fetch_all=True)
+                for movimiento in self._a_modelos(rows or []):
+                    movimientos[movimiento.id_movimiento] = movimiento
+            return movimientos
+        except Exception as e:
+            print(f"Error al obtener movimientos: {e}")
+            return {}
+
     def actualizar_movimiento(self, movimiento):
         """
         Actualiza los datos de un movimiento existente.
         :param movimiento: movement
+        :return: bool, True si la sentencia se ejecutó sin errores
         """
         try:
-            query = ("UPDATE movimientos SET id_producto=%s, tipo_movimiento=%s, cantidad=%s, fecha_movimiento=%s, referencia_origen=%s, id_usuario=%s, id_cliente_proveedor=%s "
-                    "WHERE id_movimiento=%s")
             values = (
                 movimiento.id_producto,
                 movimiento.tipo_movimiento,
@@ -65,20 +157,23 @@ class movementDAO:
                 movimiento.id_cliente_proveedor,
                 movimiento.id_movimiento
             )
-            self.db.execute_query(query, values)
+            # MySQL solo cuenta las filas que cambian, así que no se exige rowcount > 0
+            return self.db.execute_query(self._SQL_ACTUALIZAR, values, rowcount=True) is not None
         except Exception as e:
             print(f"Error al actualizar movimiento: {e}")
+            return False
 
     def eliminar_movimiento(self, id_movimiento):
         """
         Elimina un movimiento por su ID.
         :param id_movimiento: int
+        :return: bool, True si existía y se eliminó
         """
         try:
-            query = "DELETE FROM movimientos WHERE id_movimiento = %s"
-            self.db.execute_query(query, (id_movimiento,))
+            return bool(self.db.execute_query(self._SQL_ELIMINAR, (id_movimiento,), rowcount=True))
         except Exception as e:
             print(f"Error al eliminar movimiento: {e}")
+            return False
 
     def listar_movimientos(self):
         """
@@ -86,12 +181,12 @@ class movementDAO:
         :return: list[movement]
         """
         try:
-            query = "SELECT id_movimiento, id_producto, tipo_movimiento, cantidad, fecha_movimiento, referencia_origen, id_usuario, id_cliente_proveedor FROM movimientos"
+            query = f"SELECT {self._COLUMNAS} FROM movimientos"
             rows = self.db.execute_query(query, fetch_all=True)
             if rows is None:
                 return []
             if isinstance(rows, list):
-                return [Movement(*row) for row in rows]
+                return self._a_modelos(rows)
             try:
                 return [Movement(*rows)]
             except Exception:
@@ -99,3 +194,406 @@ class movementDAO:
         except Exception as e:
             print(f"Error al listar movimientos: {e}")
             return []
+
+    def listar_movimientos_pagina(self, limite=100, despues_de=None, por_fecha=False, descendente=False):
+        """
+        Devuelve una página de movimientos usando paginación por clave (sin OFFSET).
+        Por defecto se ordena por ID; con por_fecha=True se ordena por (fecha_movimiento, id_movimiento).
+        :param limite: int, tamaño de página
+        :param despues_de: cursor del último movimiento de la página anterior, o None para la primera:
+                           int (ID) si se ordena por ID, tupla (fecha_movimiento, id_movimiento) si por fecha
+        :param por_fecha: bool, ordenar por fecha de movimiento
+        :param descendente: bool, recorrer de más reciente a más antiguo
+        :return: list[movement]
+        """
+        try:
+            comparador = "<" if descendente else ">"
+            direccion = "DESC" if descendente else "ASC"
+            if por_fecha:
+                orden = f"fecha_movimiento {direccion}, id_movimiento {direccion}"
+                # La primera condición, redundante, acota el rango del índice de fecha: con solo
+                # el OR se leería el índice desde el principio hasta llegar al cursor
+                condicion = (f"fecha_movimiento {comparador}= %s AND (fecha_movimiento {comparador} %s OR "
+                             f"(fecha_movimiento = %s AND id_movimiento {comparador} %s))")
+                params_cursor = ((despues_de[0], despues_de[0], despues_de[0], despues_de[1])
+                                 if despues_de is not None else ())
+            else:
+                orden = f"id_movimiento {direccion}"
+                condicion = f"id_movimiento {comparador} %s"
+                params_cursor = (despues_de,) if despues_de is not None else ()
+            if despues_de is None:
+                query = f"SELECT {self._COLUMNAS} FROM movimientos ORDER BY {orden} LIMIT %s"
+            else:
+                query = f"SELECT {self._COLUMNAS} FROM movimientos WHERE {condicion} ORDER BY {orden} LIMIT %s"
+            # Pocas variantes posibles: cada una se prepara una vez por conexión
+            rows = self.db.execute_query(sentencia(query), params_cursor + (limite,), fetch_all=True)
+            return self._a_modelos(rows or [])
+        except Exception as e:
+            print(f"Error al listar página de movimientos: {e}")
+            return []
+
+    @staticmethod
+    def cursor_pagina(movimiento, por_fecha=False):
+        """
+        Devuelve el cursor para pedir la página siguiente a la que termina en `movimiento`.
+        """
+        if por_fecha:
+            return (movimiento.fecha_movimiento, movimiento.id_movimiento)
+        return movimiento.id_movimiento
+
+    def contar_movimientos(self):
+        """
+        Devuelve el número total de movimientos.
+        :return: int
+        """
+        try:
+            row = self.db.execute_query(self._SQL_CONTAR, fetch_one=True)
+            return row[0] if row else 0
+        except Exception as e:
+            print(f"Error al contar movimientos: {e}")
+            return 0
+
+    def buscar_movimientos_por_fecha(self, desde=None, hasta=None, limite=None, despues_de=None):
+        """
+        Devuelve los movimientos con fecha en el intervalo [desde, hasta), ordenados por fecha.
+        :param desde: datetime/date o None para no acotar por abajo
+        :param hasta: datetime/date o None para no acotar por arriba (exclusivo)
+        :param limite: int o None, número máximo de resultados
+        :param despues_de: tupla (fecha_movimiento, id_movimiento) del último resultado de la página anterior
+        :return: list[movement]
+        """
+        try:
+            condiciones = []
+            params = []
+            if despues_de is not None:
+                # Antes que `desde`: SQLite acota el índice con la primera cota inferior que encuentra,
+                # y la del cursor evita leer de nuevo las páginas anteriores
+                condiciones.append("fecha_movimiento >= %s AND "
+                                   "(fecha_movimiento > %s OR (fecha_movimiento = %s AND id_movimiento > %s))")
+                params.extend((despues_de[0], despues_de[0], despues_de[0], despues_de[1]))
+            if desde is not None:
+                condiciones.append("fecha_movimiento >= %s")
+                params.append(desde)
+            if hasta is not None:
+                condiciones.append("fecha_movimiento < %s")
+                params.append(hasta)
+            query = f"SELECT {self._COLUMNAS} FROM movimientos"
+            if condiciones:
+                query += " WHERE " + " AND ".join(condiciones)
+            query += " ORDER BY fecha_movimiento, id_movimiento"
+            if limite is not None:
+                query += " LIMIT %s"
+                params.append(limite)
+            rows = self.db.execute_query(query, tuple(params), fetch_all=True)
+            return self._a_modelos(rows or [])
+        except Exception as e:
+            print(f"Error al buscar movimientos por fecha: {e}")
+            return []
+
+    def obtener_detalle(self, id_movimiento):
+        """
+        Obtiene un movimiento con los datos de su producto y su cliente o proveedor.
+        :param id_movimiento: int
+        :return: MovementDetail o None
+        """
+        try:
+            row = self.db.execute_query(self._SQL_OBTENER_DETALLE, (id_movimiento,), fetch_one=True)
+            if row:
+                return MovementDetail(*row)
+            return None
+        except Exception as e:
+            print(f"Error al obtener detalle de movimiento: {e}")
+            return None
+
+    def listar_detalles_pagina(self, limite=100, despues_de=None, desde=None, hasta=None):
+        """
+        Devuelve una página de movimientos con el nombre y el SKU de su producto y el nombre de su
+        cliente o proveedor, en una sola consulta y con paginación por clave (sin OFFSET).
+        Sin filtro de fechas se ordena por ID; con filtro, por (fecha_movimiento, id_movimiento).
+        :param limite: int, tamaño de página
+        :param despues_de: cursor del último movimiento de la página anterior, o None para la primera:
+                           int (ID) sin filtro de fechas, tupla (fecha_movimiento, id_movimiento) con filtro
+        :param desde: datetime/date o None, fecha mínima
+        :param hasta: datetime/date o None, fecha máxima (exclusiva)
+        :return: list[MovementDetail]
+        """
+        try:
+            por_fecha = desde is not None or hasta is not None
+            condiciones = []
+            params = []
+            if despues_de is not None:
+                if por_fecha:
+                    # Antes que `desde`, como en buscar_movimientos_por_fecha
+                    condiciones.append("m.fecha_movimiento >= %s AND "
+                                       "(m.fecha_movimiento > %s OR (m.fecha_movimiento = %s AND m.id_movimiento > %s))")
+                    params.extend((despues_de[0], despues_de[0], despues_de[0], despues_de[1]))
+                else:
+                    condiciones.append("m.id_movimiento > %s")
+                    params.append(despues_de)
+            if desde is not None:
+                condiciones.append("m.fecha_movimiento >= %s")
+                params.append(desde)
+            if hasta is not None:
+                condiciones.append("m.fecha_movimiento < %s")
+                params.append(hasta)
+            query = self._SQL_DETALLE
+            if condiciones:
+                query += " WHERE " + " AND ".join(condiciones)
+            query += " ORDER BY m.fecha_movimiento, m.id_movimiento" if por_fecha else " ORDER BY m.id_movimiento"
+            query += " LIMIT %s"
+            params.append(limite)
+            # Pocas variantes posibles: cada una se prepara una vez por conexión
+            rows = self.db.execute_query(sentencia(query), tuple(params), fetch_all=True)
+            return self._a_detalles(rows or [])
+        except Exception as e:
+            print(f"Error al listar detalle de movimientos: {e}")
+            return []
+
+    def existe_movimiento(self, id_movimiento):
+        """
+        Indica si existe un movimiento con el ID dado (una única búsqueda por clave primaria).
+        :param id_movimiento: int
+        :return: bool
+        """
+        try:
+            return self.db.execute_query(self._SQL_EXISTE, (id_movimiento,), fetch_one=True) is not None
+        except Exception as e:
+            print(f"Error al comprobar movimiento: {e}")
+            return False
+
+    def _consulta_recorrido(self, desde=None, hasta=None, id_productos=None):
+        """
+        Construye la consulta de los recorridos completos con sus filtros.
+        Con filtro de fechas se ordena por fecha (usa el índice de fecha); si no, por ID.
+        :return: (consulta, parámetros)
+        """
+        condiciones = []
+        params = []
+        if desde is not None:
+            condiciones.append("fecha_movimiento >= %s")
+            params.append(desde)
+        if hasta is not None:
+            condiciones.append("fecha_movimiento < %s")
+            params.append(hasta)
+        if id_productos is not None:
+            id_productos = list(id_productos)
+            condiciones.append(f"id_producto IN ({', '.join(['%s'] * len(id_productos))})" if id_productos else "1 = 0")
+            params.extend(id_productos)
+        query = f"SELECT {self._COLUMNAS} FROM movimientos"
+        if condiciones:
+            query += " WHERE " + " AND ".join(condiciones)
+        if desde is not None or hasta is not None:
+            query += " ORDER BY fecha_movimiento, id_movimiento"
+        else:
+            query += " ORDER BY id_movimiento"
+        return query, tuple(params)
+
+    def iter_movimientos(self, tamano_lote=None, desde=None, hasta=None, id_productos=None):
+        """
+        Recorre los movimientos sin cargarlos en memoria: las filas se leen del servidor en
+        bloques de `tamano_lote` y se convierten en objetos a medida que se piden.
+        Sin filtros de fecha se ordenan por ID; con ellos, por fecha.
+        :param tamano_lote: int, filas por lectura (por defecto DB_STREAM_BATCH_SIZE)
+        :param desde: datetime/date o None, fecha mínima
+        :param hasta: datetime/date o None, fecha máxima (exclusiva)
+        :param id_productos: iterable de int o None, solo los movimientos de esos productos
+        :return: generador de movement
+        """
+        for row in self.iter_filas(tamano_lote, desde, hasta, id_productos):
+            yield Movement(*row)
+
+    def iter_filas(self, tamano_lote=None, desde=None, hasta=None, id_productos=None):
+        """
+        Igual que iter_movimientos pero entrega las filas tal cual (tuplas en el orden de
+        COLUMNAS), sin crear objetos: es lo más rápido para exportar.
+        :return: generador de tuplas
+        :raises Exception: el error de la base de datos si el recorrido falla a mitad; no se captura
+                           para que una exportación no dé por completo un fichero truncado
+        """
+        query, params = self._consulta_recorrido(desde, hasta, id_productos)
+        yield from self.db.iter_query(query, params, batch_size=tamano_lote)
+
+    @staticmethod
+    def _efecto(movimiento):
+        """
+        Devuelve la variación de stock que produce un movimiento (negativa en las salidas).
+        """
+        return -movimiento.cantidad if movimiento.tipo_movimiento == "salida" else movimiento.cantidad
+
+    def _ajustar_stock(self, cursor, id_producto, delta, movimiento, operacion=None):
+        """
+        Suma `delta` al stock del producto con el cursor de la transacción en curso. Si el
+        delta es negativo solo se aplica cuando no deja el stock por debajo de cero.
+        :raises StockInsuficienteError: si la resta supera el stock disponible
+        """
+        if delta < 0:
+            cursor.execute(self._SQL_SALIDA_STOCK, (-delta, id_producto, -delta))
+            if cursor.rowcount == 0:
+                raise StockInsuficienteError(movimiento, operacion)
+        elif delta > 0:
+            cursor.execute(self._SQL_ENTRADA_STOCK, (delta, id_producto))
+
+    def _aplicar_con_stock(self, cursor, movimiento):
+        """
+        Ajusta el stock del producto y después inserta el movimiento, usando el cursor de la
+        transacción en curso. Se actualiza primero para bloquear la fila del producto antes de
+        que la clave foránea del INSERT la lea, evitando interbloqueos entre puestos.
+        """
+        self._ajustar_stock(cursor, movimiento.id_producto, self._efecto(movimiento), movimiento)
+        cursor.execute(self._SQL_INSERTAR, self._valores(movimiento))
+
+    def _leer_para_cambiar(self, cursor, id_movimiento):
+        """
+        Lee un movimiento con el cursor de la transacción en curso, antes de modificarlo o borrarlo.
+        :return: movement o None
+        """
+        cursor.execute(self._SQL_OBTENER, (id_movimiento,))
+        # fetchall consume el resultado entero, como exige el cursor sin búfer de MySQL
+        rows = cursor.fetchall()
+        return Movement(*rows[0]) if rows else None
+
+    def actualizar_movimiento_con_stock(self, movimiento):
+        """
+        Actualiza un movimiento y corrige productos.stock_actual en la misma transacción: se
+        deshace el efecto del movimiento anterior y se aplica el del nuevo. Si el producto no
+        cambia se aplica solo la diferencia. Se rechaza si algún stock quedaría en negativo.
+        :param movimiento: movement con los datos nuevos
+        :return: movement tal como estaba antes del cambio, o None si no existía o la actualización falló
+        :raises StockInsuficienteError: si el cambio deja el stock de algún producto en negativo
+        """
+        def aplicar(cursor):
+            anterior = self._leer_para_cambiar(cursor, movimiento.id_movimiento)
+            if anterior is None:
+                return None
+            operacion = f"modificar el movimiento {movimiento.id_movimiento}"
+            deltas = {anterior.id_producto: -self._efecto(anterior)}
+            deltas[movimiento.id_producto] = deltas.get(movimiento.id_producto, 0) + self._efecto(movimiento)
+            # Orden fijo de los productos para no interbloquearse con otros puestos
+            for id_producto in sorted(deltas):
+                self._ajustar_stock(cursor, id_producto, deltas[id_producto], movimiento, operacion)
+            cursor.execute(self._SQL_ACTUALIZAR, self._valores(movimiento)[1:] + (movimiento.id_movimiento,))
+            return anterior
+
+        try:
+            return self.db.execute_transaction(aplicar)
+        except StockInsuficienteError:
+            raise
+        except Exception as e:
+            print(f"Error al actualizar movimiento: {e}")
+            return None
+
+    def eliminar_movimiento_con_stock(self, id_movimiento):
+        """
+        Elimina un movimiento y deshace su efecto en productos.stock_actual en la misma
+        transacción. Borrar una entrada cuyo stock ya ha salido se rechaza.
+        :param id_movimiento: int
+        :return: movement eliminado, o None si no existía o la eliminación falló
+        :raises StockInsuficienteError: si al deshacer una entrada el stock quedaría en negativo
+        """
+        def aplicar(cursor):
+            anterior = self._leer_para_cambiar(cursor, id_movimiento)
+            if anterior is None:
+                return None
+            self._ajustar_stock(cursor, anterior.id_producto, -self._efecto(anterior), anterior,
+                                f"anular una entrada de {anterior.cantidad} unidades")
+            cursor.execute(self._SQL_ELIMINAR, (id_movimiento,))
+            return anterior
+
+        try:
+            return self.db.execute_transaction(aplicar)
+        except StockInsuficienteError:
+            raise
+        except Exception as e:
+            print(f"Error al eliminar movimiento: {e}")
+            return None
+
+    def crear_movimiento_con_stock(self, movimiento):
+        """
+        Inserta un movimiento y actualiza productos.stock_actual en la misma transacción,
+        sin leer antes el stock. Una salida que dejaría el stock en negativo se rechaza.
+        :param movimiento: movement
+        :return: bool, True si se registró
+        :raises StockInsuficienteError: si la salida supera el stock disponible
+        """
+        try:
+            self.db.execute_transaction(lambda cursor: self._aplicar_con_stock(cursor, movimiento))
+            return True
+        except StockInsuficienteError:
+            raise
+        except Exception as e:
+            print(f"Error al crear movimiento: {e}")
+            return False
+
+    def crear_movimientos_con_stock(self, movimientos, tamano_lote=None):
+        """
+        Inserta varios movimientos y aplica sus ajustes de stock en una única transacción.
+        Cada lote se resuelve con un UPDATE de stock (neto por producto) y un INSERT múltiple;
+        si el lote falla o alguna salida no tiene stock, se repite movimiento a movimiento y
+        solo se descartan los movimientos que fallan.
+        :param movimientos: iterable de movement
+        :param tamano_lote: int, movimientos por lote (por defecto DB_BULK_CHUNK_SIZE)
+        :return: list[(movement, str)] movimientos rechazados y el motivo
+        """
+        movimientos = list(movimientos)
+        if not movimientos:
+            return []
+        tamano_lote = max(1, tamano_lote or bulk_chunk_size)
+
+        def aplicar(cursor):
+            fallos = []
+            for inicio in range(0, len(movimientos), tamano_lote):
+                lote = movimientos[inicio:inicio + tamano_lote]
+                cursor.execute("SAVEPOINT lote")
+                try:
+                    self._aplicar_lote_con_stock(cursor, lote)
+                    cursor.execute("RELEASE SAVEPOINT lote")
+                    continue
+                except Exception:
+                    cursor.execute("ROLLBACK TO SAVEPOINT lote")
+                for movimiento in lote:
+                    cursor.execute("SAVEPOINT fila")
+                    try:
+                        self._aplicar_con_stock(cursor, movimiento)
+                        cursor.execute("RELEASE SAVEPOINT fila")
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT fila")
+                        fallos.append((movimiento, str(e)))
+            return fallos
+
+        try:
+            return self.db.execute_transaction(aplicar)
+        except Exception as e:
+            print(f"Error al crear movimientos: {e}")
+            return [(m, str(e)) for m in movimientos]
+
+    def _aplicar_lote_con_stock(self, cursor, lote):
+        """
+        Aplica el ajuste neto de stock de un lote en un único UPDATE condicional y luego inserta
+        todos sus movimientos. El UPDATE exige que el saldo de cada producto no baje de cero en
+        ningún punto del lote siguiendo el orden de entrada, no solo al final: una salida que
+        precede a la entrada que la cubriría se rechaza igual que fila a fila.
+        Lanza ValueError si algún saldo intermedio quedaría en negativo o el producto no existe.
+        """
+        deltas = {}
+        minimos = {}
+        for m in lote:
+            signo = -1 if m.tipo_movimiento == "salida" else 1
+            deltas[m.id_producto] = deltas.get(m.id_producto, 0) + signo * m.cantidad
+            minimos[m.id_producto] = min(minimos.get(m.id_producto, 0), deltas[m.id_producto])
+        if any(deltas[id_producto] == 0 and minimo < 0 for id_producto, minimo in minimos.items()):
+            # Sin cambio neto el UPDATE no cuenta la fila en MySQL y no se puede comprobar el saldo
+            raise ValueError("El lote tiene salidas que dependen de entradas posteriores.")
+        ids = sorted(id_producto for id_producto, delta in deltas.items() if delta != 0)
+        if ids:
+            casos = " ".join("WHEN %s THEN %s" for _ in ids)
+            params_casos = tuple(valor for id_producto in ids for valor in (id_producto, deltas[id_producto]))
+            params_minimos = tuple(valor for id_producto in ids for valor in (id_producto, minimos[id_producto]))
+            marcadores = ", ".join(["%s"] * len(ids))
+            query = (f"UPDATE productos SET stock_actual = COALESCE(stock_actual, 0) + CASE id_producto {casos} END "
+                     f"WHERE id_producto IN ({marcadores}) "
+                     f"AND COALESCE(stock_actual, 0) + CASE id_producto {casos} END >= 0")
+            cursor.execute(query, params_casos + tuple(ids) + params_minimos)
+            if cursor.rowcount != len(ids):
+                raise ValueError("El lote deja algún producto sin stock o referencia un producto inexistente.")
+        cursor.executemany(self._SQL_INSERTAR, [self._valores(m) for m in lote])
+
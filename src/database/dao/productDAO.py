@@ -1,37 +1,85 @@
 # DAO para la entidad Producto
-from src.database.db_manager import db_manager, host, user, password, database
+from src.database.db_manager import crear_db_manager, patron_like, sentencia, lotes_in
 from src.models.product import Product
+from src.models.factory import fabrica_filas
 
 class productDAO:
     """
     DAO para operaciones CRUD sobre la entidad Producto.
     """
     def __init__(self):
-        self.db = db_manager(host, user, password, database)
+        self.db = crear_db_manager()
+
+    # Conversión de listas de filas en objetos Product
+    _a_modelos = staticmethod(fabrica_filas(Product))
+
+    # Columnas en el orden del constructor de Product
+    _COLUMNAS = "id_producto, nombre_producto, descripcion, sku, precio_unitario, stock_actual, stock_minimo, ubicacion, id_proveedor, fecha_alta"
+    # Nombres de las columnas en el orden de las tuplas que entrega iter_filas
+    COLUMNAS = tuple(c.strip() for c in _COLUMNAS.split(","))
+
+    # Sentencia de inserción compartida por las altas individuales y masivas
+    _SQL_INSERTAR = sentencia("INSERT INTO productos (id_producto, nombre_producto, descripcion, sku, precio_unitario, stock_actual, stock_minimo, ubicacion, id_proveedor, fecha_alta) "
+                              "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)")
+
+    # Sentencias fijas: se clasifican (lectura o escritura) al definir la clase y cada conexión
+    # las prepara una sola vez (ver db_manager.sentencia)
+    _SQL_OBTENER = sentencia(f"SELECT {_COLUMNAS} FROM productos WHERE id_producto = %s")
+    _SQL_ACTUALIZAR = sentencia("UPDATE productos SET nombre_producto=%s, descripcion=%s, sku=%s, precio_unitario=%s, stock_actual=%s, stock_minimo=%s, ubicacion=%s, id_proveedor=%s, fecha_alta=%s "
+                                "WHERE id_producto=%s")
+    _SQL_ELIMINAR = sentencia("DELETE FROM productos WHERE id_producto = %s")
+    _SQL_EXISTE = sentencia("SELECT 1 FROM productos WHERE id_producto = %s LIMIT 1")
+    _SQL_CONTAR = sentencia("SELECT COUNT(*) FROM productos")
+    _SQL_PRIMERA_PAGINA = sentencia(f"SELECT {_COLUMNAS} FROM productos ORDER BY id_producto LIMIT %s")
+    _SQL_PAGINA_SIGUIENTE = sentencia(f"SELECT {_COLUMNAS} FROM productos WHERE id_producto > %s "
+                                      "ORDER BY id_producto LIMIT %s")
+    _SQL_POR_SKU = sentencia(f"SELECT {_COLUMNAS} FROM productos WHERE sku = %s")
+    _SQL_EXISTE_SKU = sentencia("SELECT 1 FROM productos WHERE sku = %s LIMIT 1")
+
+    @staticmethod
+    def _valores(producto):
+        """
+        Devuelve los valores de inserción de un producto en el orden de _SQL_INSERTAR.
+        """
+        return (
+            producto.id_producto,
+            producto.nombre_producto,
+            producto.descripcion,
+            producto.sku,
+            producto.precio_unitario,
+            producto.stock_actual,
+            producto.stock_minimo,
+            producto.ubicacion,
+            producto.id_proveedor,
+            producto.fecha_alta
+        )
 
     def crear_producto(self, producto):
         """
         Inserta un nuevo producto en la base de datos.
         :param producto: Product
+        :return: bool, True si se insertó
         """
         try:
-            query = ("INSERT INTO productos (id_producto, nombre_producto, descripcion, sku, precio_unitario, stock_actual, stock_minimo, ubicacion, id_proveedor, fecha_alta) "
-                    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)")
-            values = (
-                producto.id_producto,
-                producto.nombre_producto,
-                producto.descripcion,
-                producto.sku,
-                producto.precio_unitario,
-                producto.stock_actual,
-                producto.stock_minimo,
-                producto.ubicacion,
-                producto.id_proveedor,
-                producto.fecha_alta
-            )
-            self.db.execute_query(query, values)
+            return self.db.execute_query(self._SQL_INSERTAR, self._valores(producto), rowcount=True) == 1
         except Exception as e:
             print(f"Error al crear producto: {e}")
+            return False
+
+    def crear_productos(self, productos, tamano_lote=None):
+        """
+        Inserta varios productos en una única transacción, en lotes de `tamano_lote` filas.
+        :param productos: iterable de Product
+        :param tamano_lote: int, filas por sentencia (por defecto DB_BULK_CHUNK_SIZE)
+        :return: list[(Product, str)] productos rechazados y el motivo
+        """
+        productos = list(productos)
+        try:
+            fallos = self.db.execute_many(self._SQL_INSERTAR, [self._valores(p) for p in productos], tamano_lote)
+            return [(productos[i], error) for i, error in fallos]
+        except Exception as e:
+            print(f"Error al crear productos: {e}")
+            return [(p, str(e)) for p in productos]
 
     def obtener_producto(self, id_producto):
         """
@@ -40,8 +88,7 @@ class productDAO:
         :return: Product o None
         """
         try:
-            query = "SELECT id_producto, nombre_producto, descripcion, sku, precio_unitario, stock_actual, stock_minimo, ubicacion, id_proveedor, fecha_alta FROM productos WHERE id_producto = %s"
-            row = self.db.execute_query(query, (id_producto,), fetch_one=True)
+            row = self.db.execute_query(self._SQL_OBTENER, (id_producto,), fetch_one=True)
             if row:
                 return Product(*row)
             return None
@@ -49,14 +96,31 @@ class productDAO:
             print(f"Error al obtener producto: {e}")
             return None
 
+    def obtener_productos(self, ids):
+        """
+        Obtiene varios productos por ID con consultas `IN (...)` por lotes, en lugar de una por ID.
+        :param ids: iterable de int (se ignoran los repetidos y los None)
+        :return: dict id_producto -> Product (los IDs que no existen no aparecen)
+        """
+        try:
+            productos = {}
+            for marcadores, lote in lotes_in(ids):
+                query = sentencia(f"SELECT {self._COLUMNAS} FROM productos WHERE id_producto IN ({marcadores})")
+                rows = self.db.execute_query(query, lote, fetch_all=True)
+                for producto in self._a_modelos(rows or []):
+                    productos[producto.id_producto] = producto
+            return productos
+        except Exception as e:
+            print(f"Error al obtener productos: {e}")
+            return {}
+
     def actualizar_producto(self, producto):
         """
         Actualiza los datos de un producto existente.
         :param producto: Product
+        :return: bool, True si la sentencia se ejecutó sin errores
         """
         try:
-            query = ("UPDATE productos SET nombre_producto=%s, descripcion=%s, sku=%s, precio_unitario=%s, stock_actual=%s, stock_minimo=%s, ubicacion=%s, id_proveedor=%s, fecha_alta=%s "
-                    "WHERE id_producto=%s")
             values = (
                 producto.nombre_producto,
                 producto.descripcion,
@@ -69,20 +133,23 @@ class productDAO:
                 producto.fecha_alta,
                 producto.id_producto
             )
-            self.db.execute_query(query, values)
+            # MySQL solo cuenta las filas que cambian, así que no se exige rowcount > 0
+            return self.db.execute_query(self._SQL_ACTUALIZAR, values, rowcount=True) is not None
         except Exception as e:
             print(f"Error al actualizar producto: {e}")
+            return False
 
     def eliminar_producto(self, id_producto):
         """
         Elimina un producto por su ID.
         :param id_producto: int
+        :return: bool, True si existía y se eliminó
         """
         try:
-            query = "DELETE FROM productos WHERE id_producto = %s"
-            self.db.execute_query(query, (id_producto,))
+            return bool(self.db.execute_query(self._SQL_ELIMINAR, (id_producto,), rowcount=True))
         except Exception as e:
             print(f"Error al eliminar producto: {e}")
+            return False
 
     def listar_productos(self):
         """
@@ -90,12 +157,12 @@ class productDAO:
         :return: list[Product]
         """
         try:
-            query = "SELECT id_producto, nombre_producto, descripcion, sku, precio_unitario, stock_actual, stock_minimo, ubicacion, id_proveedor, fecha_alta FROM productos"
+            query = f"SELECT {self._COLUMNAS} FROM productos"
             rows = self.db.execute_query(query, fetch_all=True)
             if rows is None:
                 return []
             if isinstance(rows, list):
-                return [Product(*row) for row in rows]
+                return self._a_modelos(rows)
             try:
                 return [Product(*rows)]
             except Exception:
@@ -103,3 +170,126 @@ class productDAO:
         except Exception as e:
             print(f"Error al listar productos: {e}")
             return []
+
+    def listar_productos_pagina(self, limite=100, despues_de=None):
+        """
+        Devuelve una página de productos ordenada por ID usando paginación por clave
+        (solo lee las filas de la página, sin OFFSET).
+        :param limite: int, tamaño de página
+        :param despues_de: int o None, ID del último producto de la página anterior
+        :return: list[Product]
+        """
+        try:
+            if despues_de is None:
+                query = self._SQL_PRIMERA_PAGINA
+                params = (limite,)
+            else:
+                query = self._SQL_PAGINA_SIGUIENTE
+                params = (despues_de, limite)
+            rows = self.db.execute_query(query, params, fetch_all=True)
+            return self._a_modelos(rows or [])
+        except Exception as e:
+            print(f"Error al listar página de productos: {e}")
+            return []
+
+    def contar_productos(self):
+        """
+        Devuelve el número total de productos.
+        :return: int
+        """
+        try:
+            row = self.db.execute_query(self._SQL_CONTAR, fetch_one=True)
+            return row[0] if row else 0
+        except Exception as e:
+            print(f"Error al contar productos: {e}")
+            return 0
+
+    def buscar_productos(self, texto, modo="prefijo", limite=None, despues_de=None):
+        """
+        Busca productos por nombre en el servidor, devolviendo solo las filas que coinciden.
+        :param texto: str, texto a buscar (sin distinguir mayúsculas)
+        :param modo: "prefijo" (nombre empieza por el texto, usa el índice) o "contiene"
+        :param limite: int o None, número máximo de resultados
+        :param despues_de: int o None, ID del último resultado de la página anterior
+        :return: list[Product]
+        """
+        try:
+            query = f"SELECT {self._COLUMNAS} FROM productos WHERE nombre_producto LIKE %s ESCAPE '!'"
+            params = [patron_like(texto, modo)]
+            if despues_de is not None:
+                # El "+" impide que SQLite recorra la clave primaria desde el cursor en lugar de
+                # usar el índice del nombre (MySQL lo ignora)
+                query += " AND +id_producto > %s"
+                params.append(despues_de)
+            query += " ORDER BY id_producto"
+            if limite is not None:
+                query += " LIMIT %s"
+                params.append(limite)
+            rows = self.db.execute_query(query, tuple(params), fetch_all=True)
+            return self._a_modelos(rows or [])
+        except Exception as e:
+            print(f"Error al buscar productos: {e}")
+            return []
+
+    def buscar_por_sku(self, sku):
+        """
+        Obtiene un producto por su SKU exacto (clave única).
+        :param sku: str
+        :return: Product o None
+        """
+        try:
+            row = self.db.execute_query(self._SQL_POR_SKU, (sku,), fetch_one=True)
+            if row:
+                return Product(*row)
+            return None
+        except Exception as e:
+            print(f"Error al buscar producto por SKU: {e}")
+            return None
+
+    def existe_producto(self, id_producto):
+        """
+        Indica si existe un producto con el ID dado (una única búsqueda por clave primaria).
+        :param id_producto: int
+        :return: bool
+        """
+        try:
+            return self.db.execute_query(self._SQL_EXISTE, (id_producto,), fetch_one=True) is not None
+        except Exception as e:
+            print(f"Error al comprobar producto: {e}")
+            return False
+
+    def existe_sku(self, sku):
+        """
+        Indica si algún producto usa ya el SKU dado (búsqueda por la clave única).
+        :param sku: str
+        :return: bool
+        """
+        try:
+            return self.db.execute_query(self._SQL_EXISTE_SKU, (sku,), fetch_one=True) is not None
+        except Exception as e:
+            print(f"Error al comprobar SKU: {e}")
+            return False
+
+    def iter_productos(self, tamano_lote=None):
+        """
+        Recorre todos los productos ordenados por ID sin cargarlos en memoria: las filas se leen
+        del servidor en bloques de `tamano_lote` y se convierten en objetos a medida que se piden.
+        :param tamano_lote: int, filas por lectura (por defecto DB_STREAM_BATCH_SIZE)
+        :return: generador de Product
+        :raises Exception: el error de la base de datos si el recorrido falla a mitad; no se captura
+                           para que quien recorre la tabla no confunda un fallo con el final
+        """
+        query = f"SELECT {self._COLUMNAS} FROM productos ORDER BY id_producto"
+        for row in self.db.iter_query(query, batch_size=tamano_lote):
+            yield Product(*row)
+
+    def iter_filas(self, tamano_lote=None):
+        """
+        Recorre todos los productos ordenados por ID entregando las filas tal cual (tuplas en
+        el orden de COLUMNAS), sin crear objetos: es lo más rápido para exportar.
+        :param tamano_lote: int, filas por lectura (por defecto DB_STREAM_BATCH_SIZE)
+        :return: generador de tuplas
+        :raises Exception: el error de la base de datos si el recorrido falla a mitad
+        """
+        query = f"SELECT {self._COLUMNAS} FROM productos ORDER BY id_producto"
+        yield from self.db.iter_query(query, batch_size=tamano_lote)
@@ -1,32 +1,76 @@
 # DAO para la entidad Proveedor
-from src.database.db_manager import db_manager, host, user, password, database
+from src.database.db_manager import crear_db_manager, patron_like, sentencia, lotes_in
 from src.models.supplier import Supplier
+from src.models.factory import fabrica_filas
 
 class supplierDAO:
     """
     DAO para operaciones CRUD sobre la entidad Proveedor.
     """
     def __init__(self):
-        self.db = db_manager(host, user, password, database)
+        self.db = crear_db_manager()
+
+    # Conversión de listas de filas en objetos Supplier
+    _a_modelos = staticmethod(fabrica_filas(Supplier))
+
+    # Columnas en el orden del constructor de Supplier
+    _COLUMNAS = "id_proveedor, nombre_proveedor, telefono, email, direccion"
+
+    # Sentencia de inserción compartida por las altas individuales y masivas
+    _SQL_INSERTAR = sentencia("INSERT INTO proveedores (id_proveedor, nombre_proveedor, telefono, email, direccion) "
+                              "VALUES (%s, %s, %s, %s, %s)")
+
+    # Sentencias fijas: se clasifican (lectura o escritura) al definir la clase y cada conexión
+    # las prepara una sola vez (ver db_manager.sentencia)
+    _SQL_OBTENER = sentencia(f"SELECT {_COLUMNAS} FROM proveedores WHERE id_proveedor = %s")
+    _SQL_ACTUALIZAR = sentencia("UPDATE proveedores SET nombre_proveedor=%s, telefono=%s, email=%s, direccion=%s "
+                                "WHERE id_proveedor=%s")
+    _SQL_ELIMINAR = sentencia("DELETE FROM proveedores WHERE id_proveedor = %s")
+    _SQL_EXISTE = sentencia("SELECT 1 FROM proveedores WHERE id_proveedor = %s LIMIT 1")
+    _SQL_CONTAR = sentencia("SELECT COUNT(*) FROM proveedores")
+    _SQL_PRIMERA_PAGINA = sentencia(f"SELECT {_COLUMNAS} FROM proveedores ORDER BY id_proveedor LIMIT %s")
+    _SQL_PAGINA_SIGUIENTE = sentencia(f"SELECT {_COLUMNAS} FROM proveedores WHERE id_proveedor > %s "
+                                      "ORDER BY id_proveedor LIMIT %s")
+
+    @staticmethod
+    def _valores(proveedor):
+        """
+        Devuelve los valores de inserción de un proveedor en el orden de _SQL_INSERTAR.
+        """
+        return (
+            proveedor.id_proveedor,
+            proveedor.nombre_proveedor,
+            proveedor.telefono,
+            proveedor.email,
+            proveedor.direccion
+        )
 
     def crear_proveedor(self, proveedor):
         """
         Inserta un nuevo proveedor en la base de datos.
         :param proveedor: Supplier
+        :return: bool, True si se insertó
         """
         try:
-            query = ("INSERT INTO proveedores (id_proveedor, nombre_proveedor, telefono, email, direccion) "
-                    "VALUES (%s, %s, %s, %s, %s)")
-            values = (
-                proveedor.id_proveedor,
-                proveedor.nombre_proveedor,
-                proveedor.telefono,
-                proveedor.email,
-                proveedor.direccion
-            )
-            self.db.execute_query(query, values)
+            return self.db.execute_query(self._SQL_INSERTAR, self._valores(proveedor), rowcount=True) == 1
         except Exception as e:
             print(f"Error al crear proveedor: {e}")
+            return False
+
+    def crear_proveedores(self, proveedores, tamano_lote=None):
+        """
+        Inserta varios proveedores en una única transacción, en lotes de `tamano_lote` filas.
+        :param proveedores: iterable de Supplier
+        :param tamano_lote: int, filas por sentencia (por defecto DB_BULK_CHUNK_SIZE)
+        :return: list[(Supplier, str)] proveedores rechazados y el motivo
+        """
+        proveedores = list(proveedores)
+        try:
+            fallos = self.db.execute_many(self._SQL_INSERTAR, [self._valores(p) for p in proveedores], tamano_lote)
+            return [(proveedores[i], error) for i, error in fallos]
+        except Exception as e:
+            print(f"Error al crear proveedores: {e}")
+            return [(p, str(e)) for p in proveedores]
 
     def obtener_proveedor(self, id_proveedor):
         """
@@ -35,8 +79,7 @@ class supplierDAO:
         :return: Supplier o None
         """
         try:
-            query = "SELECT id_proveedor, nombre_proveedor, telefono, email, direccion FROM proveedores WHERE id_proveedor = %s"
-            row = self.db.execute_query(query, (id_proveedor,), fetch_one=True)
+            row = self.db.execute_query(self._SQL_OBTENER, (id_proveedor,), fetch_one=True)
             if row:
                 return Supplier(*row)
             return None
@@ -44,14 +87,31 @@ class supplierDAO:
             print(f"Error al obtener proveedor: {e}")
             return None
 
+    def obtener_proveedores(self, ids):
+        """
+        Obtiene varios proveedores por ID con consultas `IN (...)` por lotes, en lugar de una por ID.
+        :param ids: iterable de int (se ignoran los repetidos y los None)
+        :return: dict id_proveedor -> Supplier (los IDs que no existen no aparecen)
+        """
+        try:
+            proveedores = {}
+            for marcadores, lote in lotes_in(ids):
+                query = sentencia(f"SELECT {self._COLUMNAS} FROM proveedores WHERE id_proveedor IN ({marcadores})")
+                rows = self.db.execute_query(query, lote, fetch_all=True)
+                for proveedor in self._a_modelos(rows or []):
+                    proveedores[proveedor.id_proveedor] = proveedor
+            return proveedores
+        except Exception as e:
+            print(f"Error al obtener proveedores: {e}")
+            return {}
+
     def actualizar_proveedor(self, proveedor):
         """
         Actualiza los datos de un proveedor existente.
         :param proveedor: Supplier
+        :return: bool, True si la sentencia se ejecutó sin errores
         """
         try:
-            query = ("UPDATE proveedores SET nombre_proveedor=%s, telefono=%s, email=%s, direccion=%s "
-                    "WHERE id_proveedor=%s")
             values = (
                 proveedor.nombre_proveedor,
                 proveedor.telefono,
@@ -59,20 +119,23 @@ class supplierDAO:
                 proveedor.direccion,
                 proveedor.id_proveedor
             )
-            self.db.execute_query(query, values)
+            # MySQL solo cuenta las filas que cambian, así que no se exige rowcount > 0
+            return self.db.execute_query(self._SQL_ACTUALIZAR, values, rowcount=True) is not None
         except Exception as e:
             print(f"Error al actualizar proveedor: {e}")
+            return False
 
     def eliminar_proveedor(self, id_proveedor):
         """
         Elimina un proveedor por su ID.
         :param id_proveedor: int
+        :return: bool, True si existía y se eliminó
         """
         try:
-            query = "DELETE FROM proveedores WHERE id_proveedor = %s"
-            self.db.execute_query(query, (id_proveedor,))
+            return bool(self.db.execute_query(self._SQL_ELIMINAR, (id_proveedor,), rowcount=True))
         except Exception as e:
             print(f"Error al eliminar proveedor: {e}")
+            return False
 
     def listar_proveedores(self):
         """
@@ -80,12 +143,12 @@ class supplierDAO:
         :return: list[Supplier]
         """
         try:
-            query = "SELECT id_proveedor, nombre_proveedor, telefono, email, direccion FROM proveedores"
+            query = f"SELECT {self._COLUMNAS} FROM proveedores"
             rows = self.db.execute_query(query, fetch_all=True)
             if rows is None:
                 return []
             if isinstance(rows, list):
-                return [Supplier(*row) for row in rows]
+                return self._a_modelos(rows)
             try:
                 return [Supplier(*rows)]
             except Exception:
@@ -93,3 +156,88 @@ class supplierDAO:
         except Exception as e:
             print(f"Error al listar proveedores: {e}")
             return []
+
+    def listar_proveedores_pagina(self, limite=100, despues_de=None):
+        """
+        Devuelve una página de proveedores ordenada por ID usando paginación por clave
+        (solo lee las filas de la página, sin OFFSET).
+        :param limite: int, tamaño de página
+        :param despues_de: int o None, ID del último proveedor de la página anterior
+        :return: list[Supplier]
+        """
+        try:
+            if despues_de is None:
+                query = self._SQL_PRIMERA_PAGINA
+                params = (limite,)
+            else:
+                query = self._SQL_PAGINA_SIGUIENTE
+                params = (despues_de, limite)
+            rows = self.db.execute_query(query, params, fetch_all=True)
+            return self._a_modelos(rows or [])
+        except Exception as e:
+            print(f"Error al listar página de proveedores: {e}")
+            return []
+
+    def contar_proveedores(self):
+        """
+        Devuelve el número total de proveedores.
+        :return: int
+        """
+        try:
+            row = self.db.execute_query(self._SQL_CONTAR, fetch_one=True)
+            return row[0] if row else 0
+        except Exception as e:
+            print(f"Error al contar proveedores: {e}")
+            return 0
+
+    def buscar_proveedores(self, texto, modo="prefijo", limite=None, despues_de=None):
+        """
+        Busca proveedores por nombre en el servidor, devolviendo solo las filas que coinciden.
+        :param texto: str, texto a buscar (sin distinguir mayúsculas)
+        :param modo: "prefijo" (nombre empieza por el texto, usa el índice) o "contiene"
+        :param limite: int o None, número máximo de resultados
+        :param despues_de: int o None, ID del último resultado de la página anterior
+        :return: list[Supplier]
+        """
+        try:
+            query = f"SELECT {self._COLUMNAS} FROM proveedores WHERE nombre_proveedor LIKE %s ESCAPE '!'"
+            params = [patron_like(texto, modo)]
+            if despues_de is not None:
+                # El "+" impide que SQLite recorra la clave primaria desde el cursor en lugar de
+                # usar el índice del nombre (MySQL lo ignora)
+                query += " AND +id_proveedor > %s"
+                params.append(despues_de)
+            query += " ORDER BY id_proveedor"
+            if limite is not None:
+                query += " LIMIT %s"
+                params.append(limite)
+            rows = self.db.execute_query(query, tuple(params), fetch_all=True)
+            return self._a_modelos(rows or [])
+        except Exception as e:
+            print(f"Error al buscar proveedores: {e}")
+            return []
+
+    def existe_proveedor(self, id_proveedor):
+        """
+        Indica si existe un proveedor con el ID dado (una única búsqueda por clave primaria).
+        :param id_proveedor: int
+        :return: bool
+        """
+        try:
+            return self.db.execute_query(self._SQL_EXISTE, (id_proveedor,), fetch_one=True) is not None
+        except Exception as e:
+            print(f"Error al comprobar proveedor: {e}")
+            return False
+
+    def iter_proveedores(self, tamano_lote=None):
+        """
+        Recorre todos los proveedores ordenados por ID sin cargarlos en memoria: las filas se leen
+        del servidor en bloques de `tamano_lote` y se convierten en objetos a medida que se piden.
+        :param tamano_lote: int, filas por lectura (por defecto DB_STREAM_BATCH_SIZE)
+        :return: generador de Supplier
+        :raises Exception: el error de la base de datos si el recorrido falla a mitad; no se captura
+                           para que quien recorre la tabla no confunda un fallo con el final
+        """
+        query = f"SELECT {self._COLUMNAS} FROM proveedores ORDER BY id_proveedor"
+        for row in self.db.iter_query(query, batch_size=tamano_lote):
+            yield Supplier(*row)
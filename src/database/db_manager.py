@@ -3,10 +3,16 @@
 
 # Importa el conector de MySQL y la clase de error para manejar excepciones
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errors
 # Importa dotenv para cargar variables de entorno
 from dotenv import load_dotenv
 import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from src.database.query_stats import query_stats, cursor_medido, nombre_transaccion
 
 # Carga las variables de entorno desde el archivo .env
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '../../.env'))
@@ -17,12 +23,372 @@ user = os.getenv('DB_USER')
 password = os.getenv('DB_PASSWORD')
 database = os.getenv('DB_NAME')
 
+# Parámetros del pool de conexiones (opcionales en .env)
+pool_size = int(os.getenv('DB_POOL_SIZE', '5'))
+pool_idle_timeout = float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))
+pool_ping_interval = float(os.getenv('DB_POOL_PING_INTERVAL', '30'))
+pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+# Filas por sentencia en las inserciones masivas
+bulk_chunk_size = int(os.getenv('DB_BULK_CHUNK_SIZE', '500'))
+# Filas leídas por cada viaje al servidor en los recorridos en streaming
+stream_batch_size = int(os.getenv('DB_STREAM_BATCH_SIZE', '1000'))
+# Valores como máximo en cada lista IN (...) de las búsquedas de varios IDs
+in_chunk_size = int(os.getenv('DB_IN_CHUNK_SIZE', '500'))
+# Sentencias preparadas (cursores reutilizables) que guarda cada conexión; 0 desactiva la caché
+statement_cache_size = int(os.getenv('DB_STATEMENT_CACHE', '64'))
+
+# Registro de tiempos de las consultas (DB_METRICS=0 lo desactiva) y umbral de consulta lenta
+metrics_enabled = os.getenv('DB_METRICS', '1') != '0'
+slow_query_ms = float(os.getenv('DB_SLOW_QUERY_MS', '200'))
+
+# Motor de almacenamiento: 'mysql' (servidor) o 'sqlite' (fichero local en DB_PATH)
+backend = os.getenv('DB_BACKEND', 'mysql').lower()
+db_path = os.getenv('DB_PATH', os.path.join(os.path.dirname(__file__), '../../almacen.db'))
+
+
+class _entrada_pool:
+    """
+    Conexión física gestionada por el pool junto con sus marcas de tiempo de uso y verificación.
+    """
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.ultimo_uso = time.monotonic()
+        self.ultima_verificacion = self.ultimo_uso
+        self.valida = True
+        # Transacciones explícitas abiertas en la conexión (ver db_manager.transaccion())
+        self.transacciones = 0
+        # Alguna sentencia de la transacción actual falló: se revertirá al cerrarla
+        self.fallida = False
+        # Cursores reutilizables de la conexión, del menos al más usado recientemente
+        self.cursores = OrderedDict()
+
+    def cursor(self, clave, crear, limite):
+        """
+        Devuelve el cursor guardado con esa clave o lo crea con `crear()`. Si se supera
+        `limite`, cierra el cursor usado hace más tiempo.
+        """
+        cursor = self.cursores.get(clave)
+        if cursor is not None:
+            self.cursores.move_to_end(clave)
+            return cursor
+        cursor = self.cursores[clave] = crear()
+        if len(self.cursores) > limite:
+            _, descartado = self.cursores.popitem(last=False)
+            _cerrar_cursor(descartado)
+        return cursor
+
+    def cerrar_cursores(self):
+        """
+        Cierra los cursores guardados (p. ej. tras un error que deja su estado en duda).
+        """
+        cursores, self.cursores = self.cursores, OrderedDict()
+        for cursor in cursores.values():
+            _cerrar_cursor(cursor)
+
+
+def _cerrar_cursor(cursor):
+    """
+    Cierra un cursor ignorando los errores (conexión caída o resultados sin leer).
+    """
+    try:
+        cursor.close()
+    except Exception:
+        pass
+
+
+@lru_cache(maxsize=1024)
+def es_escritura(sql_query):
+    """
+    Indica si una sentencia modifica datos y, por tanto, hay que confirmarla.
+    """
+    return sql_query.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+
+
+class sentencia(str):
+    """
+    Texto de una consulta fija de un DAO. Se clasifica una sola vez al definirla (lectura o
+    escritura) en lugar de en cada ejecución, y con preparada=True cada conexión la prepara en
+    el servidor la primera vez y reutiliza el cursor preparado en las siguientes (ver DB_STATEMENT_CACHE).
+    Se usa igual que un str.
+    """
+    def __new__(cls, texto, preparada=True):
+        obj = super().__new__(cls, texto)
+        obj.escritura = es_escritura(obj)
+        obj.preparada = preparada
+        return obj
+
+
+class TransaccionRevertidaError(Exception):
+    """
+    Se lanza al cerrar una transacción explícita en la que alguna sentencia falló:
+    todos los cambios de la transacción se han revertido.
+    """
+    def __init__(self):
+        super().__init__("Una sentencia de la transacción falló; se han revertido todos sus cambios.")
+
+
+class connection_pool:
+    """
+    Pool de conexiones MySQL compartido por todo el proceso, limitado en tamaño y seguro entre hilos.
+    Cada hilo obtiene su propia conexión; las llamadas anidadas desde el mismo hilo reutilizan la
+    conexión ya prestada. La comprobación de vida (ping) se hace periódicamente, no en cada consulta.
+    """
+    def __init__(self, host, user, password, database, size=None, idle_timeout=None,
+                 ping_interval=None, timeout=None, cache_sentencias=None):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.size = max(1, size if size is not None else pool_size)
+        self.idle_timeout = idle_timeout if idle_timeout is not None else pool_idle_timeout
+        self.ping_interval = ping_interval if ping_interval is not None else pool_ping_interval
+        self.timeout = timeout if timeout is not None else pool_timeout
+        # Sentencias preparadas por conexión (0: un cursor nuevo por consulta)
+        self.cache_sentencias = max(0, cache_sentencias if cache_sentencias is not None else statement_cache_size)
+        self._condicion = threading.Condition()
+        self._libres = []  # Conexiones inactivas (la última devuelta se reutiliza primero)
+        self._abiertas = 0
+        self._local = threading.local()
+
+    def _abrir(self):
+        """
+        Abre una nueva conexión física a MySQL.
+        """
+        conexion = mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            passwd=self.password,
+            database=self.database
+        )
+        if conexion.is_connected():
+            print("Conexión exitosa a MySQL.")
+        return _entrada_pool(conexion)
+
+    def _cerrar(self, entrada):
+        """
+        Cierra una conexión física ignorando errores de red.
+        """
+        entrada.cerrar_cursores()
+        try:
+            entrada.conexion.close()
+        except Error:
+            pass
+
+    def _verificar(self, entrada, ahora):
+        """
+        Comprueba que la conexión siga viva solo si ha pasado el intervalo de verificación
+        o si se marcó como inválida. Devuelve False si no se puede recuperar.
+        """
+        if entrada.valida and ahora - entrada.ultima_verificacion < self.ping_interval:
+            return True
+        sesion = entrada.conexion.connection_id
+        try:
+            entrada.conexion.ping(reconnect=True, attempts=1)
+        except Error:
+            return False
+        if entrada.conexion.connection_id != sesion:
+            # Se ha reconectado: las sentencias preparadas de la sesión anterior ya no existen
+            entrada.cursores.clear()
+        entrada.valida = True
+        entrada.ultima_verificacion = ahora
+        return True
+
+    def acquire(self, exclusiva=False):
+        """
+        Presta una conexión al hilo actual. Si el hilo ya tiene una prestada, la reutiliza.
+        Con exclusiva=True se presta siempre una conexión distinta que no se comparte con
+        las llamadas anidadas del hilo (necesario para mantener abierto un cursor en streaming).
+        Bloquea hasta `timeout` segundos si el pool está lleno.
+        :return: _entrada_pool
+        """
+        if exclusiva:
+            return self._tomar()
+        entrada = getattr(self._local, 'entrada', None)
+        if entrada is not None:
+            if not self._verificar(entrada, time.monotonic()):
+                raise errors.OperationalError("La conexión prestada al hilo ya no está disponible.")
+            self._local.usos += 1
+            return entrada
+
+        entrada = self._tomar()
+        self._local.entrada = entrada
+        self._local.usos = 1
+        return entrada
+
+    def _tomar(self):
+        """
+        Saca del pool una conexión libre y verificada, o abre una nueva si hay hueco.
+        """
+        limite = time.monotonic() + self.timeout
+        while True:
+            with self._condicion:
+                while not self._libres and self._abiertas >= self.size:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise errors.PoolError("No hay conexiones libres en el pool.")
+                    self._condicion.wait(restante)
+                if self._libres:
+                    entrada = self._libres.pop()
+                else:
+                    # Se reserva el hueco antes de abrir la conexión
+                    entrada = None
+                    self._abiertas += 1
+
+            if entrada is None:
+                # Se abre fuera del bloqueo para no frenar a otros hilos
+                try:
+                    entrada = self._abrir()
+                except Error:
+                    self._descontar()
+                    raise
+                return entrada
+
+            ahora = time.monotonic()
+            if ahora - entrada.ultimo_uso > self.idle_timeout or not self._verificar(entrada, ahora):
+                # Conexión caducada o caída: se descarta y se intenta con otra
+                self._cerrar(entrada)
+                self._descontar()
+                continue
+            return entrada
+
+    def release(self, entrada):
+        """
+        Devuelve al pool una conexión prestada.
+        Si es la conexión del hilo, solo se libera realmente al cerrar el último préstamo anidado.
+        """
+        if getattr(self._local, 'entrada', None) is entrada:
+            self._local.usos -= 1
+            if self._local.usos > 0:
+                return
+            self._local.entrada = None
+        entrada.ultimo_uso = time.monotonic()
+        if not entrada.valida:
+            self._cerrar(entrada)
+            self._descontar()
+            return
+        with self._condicion:
+            self._libres.append(entrada)
+            self._condicion.notify()
+
+    def invalidate(self, entrada):
+        """
+        Marca una conexión como sospechosa: si sigue prestada se verifica antes de reutilizarla
+        y, al devolverse, se cierra en lugar de volver al pool.
+        """
+        entrada.valida = False
+
+    def _descontar(self):
+        """
+        Libera el hueco de una conexión que se ha cerrado.
+        """
+        with self._condicion:
+            self._abiertas -= 1
+            self._condicion.notify()
+
+    def close(self):
+        """
+        Cierra todas las conexiones inactivas del pool.
+        Las conexiones que sigan prestadas no se ven afectadas.
+        """
+        with self._condicion:
+            libres, self._libres = self._libres, []
+            self._abiertas -= len(libres)
+            self._condicion.notify_all()
+        for entrada in libres:
+            self._cerrar(entrada)
+
+
+def patron_like(texto, modo="prefijo"):
+    """
+    Construye un patrón para `LIKE %s ESCAPE '!'` escapando los comodines del texto.
+    modo="prefijo" busca valores que empiezan por el texto (puede usar el índice de la columna);
+    modo="contiene" busca el texto en cualquier posición (recorre la tabla).
+    """
+    escapado = texto.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+    if modo == "contiene":
+        return f"%{escapado}%"
+    if modo == "prefijo":
+        return f"{escapado}%"
+    raise ValueError(f"Modo de búsqueda no válido: {modo}")
+
+
+def lotes_in(valores, tamano=None):
+    """
+    Reparte los valores (sin repetidos ni None) en lotes de como mucho `tamano` para consultas
+    `IN (...)`. Cada lote se completa repitiendo su último valor hasta la siguiente potencia de dos,
+    de modo que solo hay unas pocas longitudes de lista distintas y cada una se prepara una sola
+    vez por conexión (ver sentencia).
+    :param tamano: int, valores por lote (por defecto DB_IN_CHUNK_SIZE)
+    :return: generador de (marcadores "%s, %s, ...", tupla de valores)
+    """
+    valores = [valor for valor in dict.fromkeys(valores) if valor is not None]
+    tamano = max(1, tamano or in_chunk_size)
+    for inicio in range(0, len(valores), tamano):
+        lote = valores[inicio:inicio + tamano]
+        longitud = min(tamano, 1 << (len(lote) - 1).bit_length())
+        lote += lote[-1:] * (longitud - len(lote))
+        yield ", ".join(["%s"] * longitud), tuple(lote)
+
+
+# Estadísticas de las consultas de todo el proceso (ver InventoryManager.estadisticas())
+estadisticas_consultas = query_stats(slow_query_ms, metrics_enabled)
+
+
+# Pools compartidos por todo el proceso, uno por combinación de parámetros de conexión
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool_compartido(clave, crear):
+    """
+    Devuelve el pool registrado con esa clave, creándolo con `crear()` la primera vez.
+    """
+    with _pools_lock:
+        pool = _pools.get(clave)
+        if pool is None:
+            pool = crear()
+            _pools[clave] = pool
+        return pool
+
+
+def obtener_pool(host, user, password, database):
+    """
+    Devuelve el pool compartido para los parámetros dados, creándolo la primera vez.
+    """
+    return pool_compartido((host, user, password, database),
+                           lambda: connection_pool(host, user, password, database))
+
+
+def cerrar_pools():
+    """
+    Cierra las conexiones de todos los pools. Debe llamarse al finalizar la aplicación.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+    print("Conexiones a la base de datos cerradas.")
+
+
+def crear_db_manager():
+    """
+    Devuelve el gestor de base de datos del motor configurado en DB_BACKEND.
+    El gestor de SQLite se importa solo si se usa.
+    """
+    if backend == 'sqlite':
+        from src.database.sqlite_manager import sqlite_manager
+        return sqlite_manager(db_path)
+    if backend == 'mysql':
+        return db_manager(host, user, password, database)
+    raise ValueError(f"Motor de base de datos no válido: {backend}")
+
 
 # Clase para gestionar la conexión y operaciones con la base de datos MySQL
 class db_manager:
     """
     Clase para gestionar la conexión y las operaciones con la base de datos MySQL.
-    Implementa un patrón básico de gestión de conexión.
+    Las conexiones se obtienen del pool compartido del proceso, de modo que varios
+    DAOs y vistas reutilizan las mismas conexiones físicas.
     """
     def __init__(self, host, user, password, database):
         # Inicializa los parámetros de conexión
@@ -30,89 +396,338 @@ class db_manager:
         self.user = user
         self.password = password
         self.database = database
-        self.connection = None
+        self.pool = obtener_pool(host, user, password, database)
+        # Conexión fijada explícitamente con connect(), independiente por hilo
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        """
+        Conexión fijada por el hilo actual mediante connect(), o None.
+        """
+        entrada = getattr(self._local, 'entrada', None)
+        return entrada.conexion if entrada else None
 
 
     def connect(self):
         """
-        Intenta establecer una conexión a la base de datos.
-        Si la conexión ya existe y está activa, la reutiliza.
+        Obtiene una conexión del pool y la mantiene fijada al hilo actual hasta disconnect().
+        Si el hilo ya tiene una conexión fijada, la reutiliza.
         """
-        if self.connection is None or not self.connection.is_connected():
+        if getattr(self._local, 'entrada', None) is None:
             try:
-                # Intenta conectar con los parámetros proporcionados
-                self.connection = mysql.connector.connect(
-                    host=self.host,
-                    user=self.user,
-                    passwd=self.password,
-                    database=self.database
-                )
-                if self.connection.is_connected():
-                    print("Conexión exitosa a MySQL.")
+                self._local.entrada = self.pool.acquire()
             except Error as e:
-                # Si ocurre un error, muestra el mensaje y asegura que la conexión sea None
+                # Si ocurre un error, muestra el mensaje y no fija ninguna conexión
                 print(f"Error al conectar a MySQL: {e}")
-                self.connection = None
+                return None
         return self.connection
 
 
     def disconnect(self):
         """
-        Cierra la conexión a la base de datos si está abierta.
-        Es importante liberar recursos cuando ya no se necesita la conexión.
+        Devuelve al pool la conexión fijada por el hilo actual.
+        Para cerrar las conexiones físicas al terminar la aplicación usar cerrar_pools().
         """
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            self.connection = None
-            print("Conexión a MySQL cerrada.")
+        entrada = getattr(self._local, 'entrada', None)
+        if entrada is not None:
+            self._local.entrada = None
+            self.pool.release(entrada)
 
 
-    def execute_query(self, sql_query, params=None, fetch_one=False, fetch_all=False):
+    def execute_query(self, sql_query, params=None, fetch_one=False, fetch_all=False, rowcount=False):
         """
-        Establece una conexión (si no existe), ejecuta una consulta SQL y maneja el cierre del cursor.
+        Obtiene una conexión del pool, ejecuta una consulta SQL y maneja el cierre del cursor.
         Retorna los resultados si es una consulta SELECT.
         Parámetros:
             sql_query: Consulta SQL a ejecutar
             params: Parámetros para la consulta (tupla/lista/dict)
             fetch_one: Si es True, retorna solo un resultado
             fetch_all: Si es True, retorna todos los resultados
+            rowcount: Si es True, retorna el número de filas afectadas (None si la consulta falla)
         """
         cursor = None
         result = None
-        connection = None # Para asegurar que la conexión se maneje dentro de este método si es temporal
+        entrada = None
 
         try:
-            # Reutiliza la conexión existente o crea una nueva si no está activa
-            connection = self.connect() 
-            if connection is None:
-                print("No hay conexión a la base de datos.")
-                return None
+            # Toma una conexión del pool (la misma si el hilo ya tiene una prestada)
+            entrada = self.pool.acquire()
+        except Error as e:
+            print(f"Error al conectar a MySQL: {e}")
+            print("No hay conexión a la base de datos.")
+            return None
 
-            # Crea el cursor para ejecutar la consulta
-            cursor = connection.cursor()
+        connection = entrada.conexion
+        inicio = time.perf_counter()
+        filas = 0
+        fallo = False
+        reutilizable = self.pool.cache_sentencias > 0
+        try:
+            # Cursor preparado de la sentencia, cursor compartido de la conexión o uno nuevo
+            cursor = self._cursor(entrada, sql_query) if reutilizable else connection.cursor()
             # Ejecuta la consulta con los parámetros dados
             cursor.execute(sql_query, params or ())
 
-            # Realiza commit solo si la consulta modifica datos
-            if sql_query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
+            # Realiza commit solo si la consulta modifica datos y no hay una transacción explícita abierta
+            escritura = sql_query.escritura if isinstance(sql_query, sentencia) else es_escritura(sql_query)
+            if not entrada.transacciones and escritura:
                 connection.commit()
-            
+
             # Obtiene los resultados si es una consulta SELECT
             if fetch_one:
                 result = cursor.fetchone()
+                filas = 1 if result else 0
+                if reutilizable:
+                    # Lee el resto para que el cursor pueda volver a ejecutarse
+                    cursor.fetchall()
             elif fetch_all:
                 result = cursor.fetchall()
-            
+                filas = len(result)
+            else:
+                filas = max(cursor.rowcount, 0)
+                if rowcount:
+                    result = cursor.rowcount
+                if reutilizable and cursor.with_rows:
+                    cursor.fetchall()
+
         except Error as e:
             # Muestra el error si la consulta falla
+            fallo = True
             print(f"Error al ejecutar consulta: {e}")
-            # Revierte los cambios si hay un error
-            if connection:
-                connection.rollback()
+            if isinstance(e, (errors.OperationalError, errors.InterfaceError)):
+                # Posible conexión caída: se verificará antes de volver a usarla
+                self.pool.invalidate(entrada)
+            if reutilizable:
+                # El estado de los cursores guardados es dudoso: se preparan de nuevo
+                entrada.cerrar_cursores()
+                cursor = None
+            if entrada.transacciones:
+                # Dentro de una transacción explícita se revierte todo al cerrarla
+                entrada.fallida = True
+            else:
+                # Revierte los cambios si hay un error
+                try:
+                    connection.rollback()
+                except Error:
+                    pass
         finally:
-            # Cierra el cursor para liberar recursos
+            # Cierra el cursor para liberar recursos (los reutilizables siguen abiertos)
+            if cursor and not reutilizable:
+                try:
+                    cursor.close()
+                except Error:
+                    # Quedaron resultados sin leer: la conexión se verifica antes de reutilizarla
+                    self.pool.invalidate(entrada)
+            # Devuelve la conexión al pool para que la reutilicen otros DAOs o hilos
+            self.pool.release(entrada)
+            estadisticas_consultas.registrar(sql_query, time.perf_counter() - inicio, filas, fallo)
+        return result
+
+
+    def _cursor(self, entrada, sql_query):
+        """
+        Devuelve el cursor reutilizable de la conexión para la consulta: un cursor preparado
+        propio si es una sentencia preparada, o el cursor de texto compartido si no lo es.
+        """
+        limite = self.pool.cache_sentencias
+        if getattr(sql_query, 'preparada', False):
+            return entrada.cursor(sql_query, lambda: entrada.conexion.cursor(prepared=True), limite)
+        return entrada.cursor(None, entrada.conexion.cursor, limite)
+
+
+    def execute_many(self, sql_query, params_list, chunk_size=None):
+        """
+        Ejecuta una sentencia de escritura para muchas filas dentro de una única transacción,
+        agrupándolas en lotes de `chunk_size` filas (un viaje a la base de datos por lote).
+        Si un lote falla, se reintenta fila a fila para identificar qué filas son erróneas;
+        las demás se confirman igualmente al final. Dentro de una transacción explícita
+        (ver transaccion()) las filas se confirman con ella.
+        Parámetros:
+            sql_query: Sentencia INSERT/UPDATE/DELETE con marcadores %s
+            params_list: Iterable de parámetros, uno por fila
+            chunk_size: Filas por lote (por defecto DB_BULK_CHUNK_SIZE)
+        Retorna una lista de tuplas (índice, mensaje de error) con las filas rechazadas.
+        """
+        filas = list(params_list)
+        if not filas:
+            return []
+        chunk_size = max(1, chunk_size or bulk_chunk_size)
+
+        fallos = []
+        comienzo = time.perf_counter()
+        try:
+            with self._transaccion() as cursor:
+                for inicio in range(0, len(filas), chunk_size):
+                    self._ejecutar_lote(cursor, sql_query, filas, inicio, chunk_size, fallos)
+        except Error as e:
+            # Error no atribuible a una fila concreta: no se confirma nada
+            print(f"Error al ejecutar inserción masiva: {e}")
+            fallos = [(indice, str(e)) for indice in range(len(filas))]
+        finally:
+            estadisticas_consultas.registrar(sql_query, time.perf_counter() - comienzo,
+                                             len(filas) - len(fallos), bool(fallos))
+        return fallos
+
+    def _ejecutar_lote(self, cursor, sql_query, filas, inicio, chunk_size, fallos):
+        """
+        Ejecuta un lote protegido por un savepoint. Si falla, lo repite fila a fila
+        y anota en `fallos` las filas rechazadas.
+        """
+        lote = filas[inicio:inicio + chunk_size]
+        cursor.execute("SAVEPOINT lote")
+        try:
+            cursor.executemany(sql_query, lote)
+            cursor.execute("RELEASE SAVEPOINT lote")
+            return
+        except Error as e:
+            if isinstance(e, (errors.OperationalError, errors.InterfaceError)):
+                raise
+            cursor.execute("ROLLBACK TO SAVEPOINT lote")
+
+        for desplazamiento, params in enumerate(lote):
+            cursor.execute("SAVEPOINT fila")
+            try:
+                cursor.execute(sql_query, params)
+                cursor.execute("RELEASE SAVEPOINT fila")
+            except Error as e:
+                if isinstance(e, (errors.OperationalError, errors.InterfaceError)):
+                    raise
+                cursor.execute("ROLLBACK TO SAVEPOINT fila")
+                fallos.append((inicio + desplazamiento, str(e)))
+
+    def iter_query(self, sql_query, params=None, batch_size=None):
+        """
+        Ejecuta una consulta SELECT con un cursor sin búfer y entrega las filas una a una,
+        leyéndolas del servidor en bloques de `batch_size` filas, de modo que la memoria
+        no crece con el tamaño del resultado.
+        Usa una conexión exclusiva del pool mientras dura el recorrido. Si el recorrido se
+        abandona antes de terminar, la conexión se cierra en lugar de leer las filas restantes.
+        Parámetros:
+            sql_query: Consulta SELECT a ejecutar
+            params: Parámetros para la consulta (tupla/lista/dict)
+            batch_size: Filas por lectura (por defecto DB_STREAM_BATCH_SIZE)
+        """
+        batch_size = max(1, batch_size or stream_batch_size)
+        entrada = self.pool.acquire(exclusiva=True)
+        cursor = None
+        completado = False
+        leidas = 0
+        # Solo se mide el tiempo de la base de datos (execute y fetchmany), no el que el
+        # consumidor tarda en procesar cada bloque: un recorrido largo no es una consulta lenta
+        en_bd = 0.0
+        try:
+            cursor = entrada.conexion.cursor(buffered=False)
+            inicio = time.perf_counter()
+            cursor.execute(sql_query, params or ())
+            while True:
+                filas = cursor.fetchmany(batch_size)
+                en_bd += time.perf_counter() - inicio
+                if not filas:
+                    break
+                leidas += len(filas)
+                for fila in filas:
+                    yield fila
+                inicio = time.perf_counter()
+            completado = True
+        finally:
+            if completado:
+                try:
+                    cursor.close()
+                except Error:
+                    self.pool.invalidate(entrada)
+            else:
+                # Quedan filas pendientes en el servidor (salida anticipada o error)
+                self.pool.invalidate(entrada)
+            self.pool.release(entrada)
+            estadisticas_consultas.registrar(sql_query, en_bd, leidas)
+
+    @contextmanager
+    def _transaccion(self):
+        """
+        Abre una transacción sobre la conexión del hilo y entrega el cursor sin medir.
+        Si el hilo ya tiene una transacción abierta, crea un savepoint dentro de ella.
+        """
+        entrada = self.pool.acquire()
+        connection = entrada.conexion
+        nivel = entrada.transacciones
+        fallida_previa = entrada.fallida
+        cursor = None
+        abierta = False
+        try:
+            cursor = connection.cursor()
+            if nivel:
+                cursor.execute(f"SAVEPOINT transaccion_{nivel}")
+            else:
+                if connection.in_transaction:
+                    # Cierra la transacción implícita que haya dejado una lectura anterior
+                    connection.commit()
+                connection.start_transaction()
+            abierta = True
+            entrada.transacciones = nivel + 1
+            entrada.fallida = False
+            yield cursor
+            if entrada.fallida:
+                raise TransaccionRevertidaError()
+            if nivel:
+                cursor.execute(f"RELEASE SAVEPOINT transaccion_{nivel}")
+            else:
+                connection.commit()
+        except BaseException as e:
+            if isinstance(e, (errors.OperationalError, errors.InterfaceError)):
+                self.pool.invalidate(entrada)
+            if abierta:
+                try:
+                    if nivel:
+                        cursor.execute(f"ROLLBACK TO SAVEPOINT transaccion_{nivel}")
+                        cursor.execute(f"RELEASE SAVEPOINT transaccion_{nivel}")
+                    else:
+                        connection.rollback()
+                except Error:
+                    self.pool.invalidate(entrada)
+            raise
+        finally:
+            if abierta:
+                entrada.transacciones = nivel
+                entrada.fallida = fallida_previa
             if cursor:
-                cursor.close()
-            # No cerramos la conexión aquí si queremos reutilizarla para múltiples operaciones
-            # La desconexión global debería ser manejada por la aplicación cuando finalice.
-        return result
\ No newline at end of file
+                try:
+                    cursor.close()
+                except Error:
+                    self.pool.invalidate(entrada)
+            self.pool.release(entrada)
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Unidad de trabajo: mientras dura el bloque `with`, todas las consultas del hilo (de
+        cualquier DAO) usan la misma conexión y no se confirman hasta el final, con un único commit.
+        Si el bloque lanza una excepción se revierte todo y la excepción se propaga; si alguna
+        consulta falla (los DAOs solo lo notifican devolviendo None/False) se revierte todo y se
+        lanza TransaccionRevertidaError al salir.
+        Las transacciones se pueden anidar: la interior es un savepoint que se revierte sola.
+        Los recorridos en streaming (iter_query) usan otra conexión y no ven los cambios pendientes.
+        Entrega un cursor para ejecutar sentencias propias dentro de la transacción.
+        """
+        with self._transaccion() as cursor:
+            yield cursor_medido(cursor, estadisticas_consultas)
+
+    def execute_transaction(self, funcion):
+        """
+        Ejecuta `funcion(cursor)` dentro de una única transacción sobre una conexión del pool.
+        Confirma al terminar sin errores y revierte si `funcion` lanza una excepción,
+        que se propaga al llamador para que pueda distinguir un rechazo de un éxito.
+        Si ya hay una transacción abierta en el hilo, se ejecuta en un savepoint dentro de ella.
+        Parámetros:
+            funcion: Callable que recibe el cursor y ejecuta las sentencias de la transacción
+        Retorna el valor devuelto por `funcion`.
+        """
+        inicio = time.perf_counter()
+        fallo = True
+        try:
+            with self.transaccion() as cursor:
+                resultado = funcion(cursor)
+            fallo = False
+            return resultado
+        finally:
+            estadisticas_consultas.registrar(nombre_transaccion(funcion), time.perf_counter() - inicio, 0, fallo)
@@ -0,0 +1,531 @@
+"""
+Migraciones versionadas del esquema: crean las tablas y los índices de rendimiento y anotan en
+la tabla schema_migrations las versiones aplicadas, de modo que ejecutarlas varias veces es
+seguro y una base de datos antigua se pone al día con solo las migraciones que le faltan.
+
+Cada paso es idempotente por sí mismo (CREATE TABLE IF NOT EXISTS; un índice se crea solo si no
+existe o si existe con otra definición), así que también sirve para bases de datos creadas a mano
+con el script del README antes de que existieran las migraciones.
+
+La base de datos SQLite se migra sola al abrir la primera conexión. En MySQL se ejecuta:
+    python -m src.database.migraciones migrar
+    python -m src.database.migraciones estado
+    python -m src.database.migraciones verificar   # EXPLAIN de las consultas de los DAOs
+"""
+import argparse
+import re
+import sys
+from datetime import datetime
+
+from src.database.db_manager import backend, crear_db_manager, cerrar_pools
+
+# Tablas en el dialecto de cada motor. En SQLite las fechas se guardan como texto ISO
+# ('AAAA-MM-DD' y 'AAAA-MM-DD HH:MM:SS'), que se ordena bien.
+TABLAS = {
+    "mysql": [
+        """CREATE TABLE IF NOT EXISTS proveedores (
+            id_proveedor INT PRIMARY KEY AUTO_INCREMENT,
+            nombre_proveedor VARCHAR(100) NOT NULL,
+            telefono VARCHAR(20),
+            email VARCHAR(100),
+            direccion TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS productos (
+            id_producto INT PRIMARY KEY AUTO_INCREMENT,
+            nombre_producto VARCHAR(100) NOT NULL,
+            descripcion TEXT,
+            sku VARCHAR(50) UNIQUE,
+            precio_unitario DECIMAL(10,2),
+            stock_actual INT DEFAULT 0,
+            stock_minimo INT DEFAULT 0,
+            ubicacion VARCHAR(50),
+            id_proveedor INT,
+            fecha_alta DATE,
+            FOREIGN KEY (id_proveedor) REFERENCES proveedores(id_proveedor)
+        )""",
+        """CREATE TABLE IF NOT EXISTS clientes (
+            id_cliente INT PRIMARY KEY AUTO_INCREMENT,
+            nombre_cliente VARCHAR(100) NOT NULL,
+            telefono VARCHAR(20),
+            email VARCHAR(100),
+            direccion TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS movimientos (
+            id_movimiento INT PRIMARY KEY AUTO_INCREMENT,
+            id_producto INT NOT NULL,
+            tipo_movimiento ENUM('entrada', 'salida') NOT NULL,
+            cantidad INT NOT NULL,
+            fecha_movimiento DATETIME DEFAULT CURRENT_TIMESTAMP,
+            referencia_origen VARCHAR(100),
+            id_usuario INT,
+            id_cliente_proveedor INT,
+            FOREIGN KEY (id_producto) REFERENCES productos(id_producto)
+        )""",
+    ],
+    "sqlite": [
+        """CREATE TABLE IF NOT EXISTS proveedores (
+            id_proveedor INTEGER PRIMARY KEY,
+            nombre_proveedor VARCHAR(100) NOT NULL,
+            telefono VARCHAR(20),
+            email VARCHAR(100),
+            direccion TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS productos (
+            id_producto INTEGER PRIMARY KEY,
+            nombre_producto VARCHAR(100) NOT NULL,
+            descripcion TEXT,
+            sku VARCHAR(50) UNIQUE,
+            precio_unitario NUMERIC(10,2),
+            stock_actual INTEGER DEFAULT 0,
+            stock_minimo INTEGER DEFAULT 0,
+            ubicacion VARCHAR(50),
+            id_proveedor INTEGER,
+            fecha_alta TEXT,
+            FOREIGN KEY (id_proveedor) REFERENCES proveedores(id_proveedor)
+        )""",
+        """CREATE TABLE IF NOT EXISTS clientes (
+            id_cliente INTEGER PRIMARY KEY,
+            nombre_cliente VARCHAR(100) NOT NULL,
+            telefono VARCHAR(20),
+            email VARCHAR(100),
+            direccion TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS movimientos (
+            id_movimiento INTEGER PRIMARY KEY,
+            id_producto INTEGER NOT NULL,
+            tipo_movimiento TEXT NOT NULL CHECK (tipo_movimiento IN ('entrada', 'salida')),
+            cantidad INTEGER NOT NULL,
+            fecha_movimiento TEXT DEFAULT CURRENT_TIMESTAMP,
+            referencia_origen VARCHAR(100),
+            id_usuario INTEGER,
+            id_cliente_proveedor INTEGER,
+            FOREIGN KEY (id_producto) REFERENCES productos(id_producto)
+        )""",
+        # Como DATETIME en MySQL: una fecha sin hora se guarda como medianoche
+        """CREATE TRIGGER IF NOT EXISTS trg_movimientos_fecha_alta AFTER INSERT ON movimientos
+        WHEN length(NEW.fecha_movimiento) = 10
+        BEGIN
+            UPDATE movimientos SET fecha_movimiento = NEW.fecha_movimiento || ' 00:00:00'
+            WHERE id_movimiento = NEW.id_movimiento;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_movimientos_fecha_cambio AFTER UPDATE OF fecha_movimiento ON movimientos
+        WHEN length(NEW.fecha_movimiento) = 10
+        BEGIN
+            UPDATE movimientos SET fecha_movimiento = NEW.fecha_movimiento || ' 00:00:00'
+            WHERE id_movimiento = NEW.id_movimiento;
+        END""",
+    ],
+}
+
+
+def crear_tablas(migrador):
+    """
+    Paso de migración: crea las tablas (y en SQLite los disparadores) que no existan.
+    """
+    for sql in TABLAS[migrador.motor]:
+        migrador.ejecutar(sql)
+
+
+def indice(nombre, tabla, columnas, sin_mayusculas=False):
+    """
+    Devuelve un paso de migración que crea el índice si no existe o si existe con otra definición.
+    :param columnas: tupla de columnas en el orden del índice
+    :param sin_mayusculas: bool, en SQLite crea el índice con COLLATE NOCASE, el único que puede
+                           usar un LIKE (que no distingue mayúsculas). En MySQL la collation de la
+                           columna ya no distingue mayúsculas y el índice normal sirve.
+    """
+    def paso(migrador):
+        migrador.crear_indice(nombre, tabla, columnas, sin_mayusculas)
+    return paso
+
+
+# Migraciones en orden: (versión, descripción, pasos). Una versión aplicada no se vuelve a
+# ejecutar, así que los cambios nuevos se añaden siempre como versiones nuevas al final.
+MIGRACIONES = [
+    (1, "Tablas de proveedores, productos, clientes y movimientos", [crear_tablas]),
+    (2, "Índices de las búsquedas por nombre y por fecha", [
+        indice("idx_productos_nombre", "productos", ("nombre_producto",), sin_mayusculas=True),
+        indice("idx_clientes_nombre", "clientes", ("nombre_cliente",), sin_mayusculas=True),
+        indice("idx_proveedores_nombre", "proveedores", ("nombre_proveedor",), sin_mayusculas=True),
+        indice("idx_movimientos_fecha", "movimientos", ("fecha_movimiento",)),
+    ]),
+    (3, "Índice de los movimientos de un producto por fecha", [
+        indice("idx_movimientos_producto_fecha", "movimientos", ("id_producto", "fecha_movimiento")),
+    ]),
+    # Al borrar un proveedor, SQLite comprueba la clave foránea de productos recorriendo la tabla
+    # si no hay índice. MySQL crea uno propio para la clave foránea y lo descarta al existir este.
+    (4, "Índice de los productos de un proveedor", [
+        indice("idx_productos_proveedor", "productos", ("id_proveedor",)),
+    ]),
+]
+
+# Consultas de los DAOs que deben resolverse con un índice: (nombre, DAO, método, argumentos,
+# argumentos con nombre, índice esperado). El SQL no se copia aquí: se obtiene llamando al método
+# del DAO con un gestor que solo anota las sentencias (ver sentencias_dao), así que la comprobación
+# sigue a las consultas reales aunque cambien. Un índice esperado None solo exige que no se recorra
+# la tabla entera (p. ej. la clave única del SKU, cuyo nombre depende del motor).
+# El índice de los productos de un proveedor no figura: lo usa la comprobación interna de la clave
+# foránea al borrar un proveedor, que no aparece en el plan de ninguna sentencia.
+CONSULTAS_INDEXADAS = [
+    ("productos por nombre", "productDAO", "buscar_productos", ("tor",), {"limite": 50}, "idx_productos_nombre"),
+    ("clientes por nombre", "clientDAO", "buscar_clientes", ("gar",), {"limite": 50}, "idx_clientes_nombre"),
+    ("proveedores por nombre", "supplierDAO", "buscar_proveedores", ("dis",), {"limite": 50}, "idx_proveedores_nombre"),
+    ("producto por SKU", "productDAO", "buscar_por_sku", ("SKU-1",), {}, None),
+    ("movimientos por fecha", "movementDAO", "buscar_movimientos_por_fecha", ("2025-01-01", "2025-01-02"),
+     {"limite": 100}, "idx_movimientos_fecha"),
+    ("detalle de movimientos por fecha", "movementDAO", "listar_detalles_pagina", (100,),
+     {"desde": "2025-01-01", "hasta": "2025-01-02"}, "idx_movimientos_fecha"),
+    ("movimientos de un producto", "movementDAO", "iter_filas", (), {"id_productos": [1]},
+     "idx_movimientos_producto_fecha"),
+]
+
+# Sentencias de control de transacciones, sin plan de ejecución
+_CONTROL = ("SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN", "COMMIT")
+
+
+class cursor_grabado:
+    """
+    Cursor de transacción que anota cada sentencia (con sus parámetros) antes de ejecutarla.
+    """
+    def __init__(self, cursor, sentencias):
+        self._cursor = cursor
+        self._sentencias = sentencias
+
+    def execute(self, sql_query, params=()):
+        if not sql_query.lstrip().upper().startswith(_CONTROL):
+            self._sentencias.append((sql_query, tuple(params)))
+        return self._cursor.execute(sql_query, params)
+
+    def executemany(self, sql_query, params_list):
+        params_list = list(params_list)
+        if params_list:
+            self._sentencias.append((sql_query, tuple(params_list[0])))
+        return self._cursor.executemany(sql_query, params_list)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+
+class db_grabado:
+    """
+    Sustituye al gestor de base de datos de un DAO y anota las sentencias que el DAO lanza. Con
+    `db` las ejecuta además sobre ese gestor; sin él no ejecuta nada y las consultas no devuelven
+    filas, lo justo para obtener el SQL de los métodos de lectura.
+    """
+    def __init__(self, db=None):
+        self._db = db
+        self.sentencias = []
+
+    def execute_query(self, sql_query, params=None, **opciones):
+        self.sentencias.append((sql_query, tuple(params or ())))
+        return self._db.execute_query(sql_query, params, **opciones) if self._db else None
+
+    def execute_many(self, sql_query, params_list, chunk_size=None):
+        params_list = list(params_list)
+        if params_list:
+            self.sentencias.append((sql_query, tuple(params_list[0])))
+        return self._db.execute_many(sql_query, params_list, chunk_size) if self._db else []
+
+    def iter_query(self, sql_query, params=None, batch_size=None):
+        self.sentencias.append((sql_query, tuple(params or ())))
+        return self._db.iter_query(sql_query, params, batch_size) if self._db else iter(())
+
+    def execute_transaction(self, funcion):
+        return self._db.execute_transaction(lambda cursor: funcion(cursor_grabado(cursor, self.sentencias)))
+
+    def __getattr__(self, nombre):
+        return getattr(self._db, nombre)
+
+
+def sentencias_dao(clase_dao, metodo, *args, **kwargs):
+    """
+    Devuelve las sentencias (sql, parámetros) que lanza un método de lectura de un DAO, sin
+    ejecutarlas ni abrir ninguna conexión.
+    :param clase_dao: str, nombre de la clase del DAO (p. ej. "productDAO")
+    """
+    # Importación diferida: los DAOs dependen de db_manager, que a su vez carga este módulo
+    from src.database.dao import productDAO, clientDAO, supplierDAO, movementDAO
+    modulos = {"productDAO": productDAO, "clientDAO": clientDAO, "supplierDAO": supplierDAO,
+               "movementDAO": movementDAO}
+    clase = getattr(modulos[clase_dao], clase_dao)
+    # Sin __init__: no se crea el gestor de base de datos configurado
+    dao = clase.__new__(clase)
+    dao.db = db_grabado()
+    resultado = getattr(dao, metodo)(*args, **kwargs)
+    if hasattr(resultado, "__next__"):
+        list(resultado)
+    return dao.db.sentencias
+
+
+# Una línea de EXPLAIN QUERY PLAN de SQLite: "SEARCH m USING INDEX idx (...)", "SCAN productos",
+# "SEARCH p USING INTEGER PRIMARY KEY (rowid=?)" (o "SEARCH TABLE productos AS p ..." antes de 3.36)
+_PASO_SQLITE = re.compile(r"^(SCAN|SEARCH) (?:TABLE )?(\w+)(?: AS (\w+))?"
+                          r"(?: USING (?:COVERING )?INDEX (\w+)| USING (?:INTEGER )?PRIMARY KEY)?")
+
+# Tablas de las cláusulas FROM/JOIN con su alias opcional
+_TABLA_SQL = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:WHERE|LEFT|RIGHT|INNER|JOIN|ON|ORDER|GROUP|"
+                        r"LIMIT|USING)\b)(\w+))?", re.IGNORECASE)
+
+
+def _alias_tablas(sql):
+    """
+    Devuelve un dict alias -> tabla de las tablas de una consulta (cada tabla es también su alias).
+    """
+    alias = {}
+    for tabla, nombre in _TABLA_SQL.findall(sql):
+        alias[tabla] = tabla
+        if nombre:
+            alias[nombre] = tabla
+    return alias
+
+
+def _normalizar(sql):
+    """
+    Normaliza el texto de un CREATE INDEX para compararlo con el guardado en sqlite_master.
+    """
+    sql = re.sub(r"\s+", " ", sql.lower().replace("if not exists", ""))
+    return re.sub(r"\s*([(),])\s*", r"\1", sql).strip()
+
+
+class migrador:
+    """
+    Aplica las migraciones pendientes sobre una conexión y comprueba los planes de las consultas.
+    Trabaja directamente con la conexión del conector (sin pasar por db_manager) porque también
+    se usa mientras el pool de SQLite abre su primera conexión.
+    """
+    def __init__(self, conexion, motor, migraciones=None):
+        """
+        :param conexion: conexión de mysql.connector o de sqlite3 (en modo autocommit)
+        :param motor: "mysql" o "sqlite"
+        :param migraciones: lista de (versión, descripción, pasos); por defecto MIGRACIONES
+        """
+        if motor not in TABLAS:
+            raise ValueError(f"Motor de base de datos no válido: {motor}")
+        self.conexion = conexion
+        self.motor = motor
+        self.migraciones = sorted(migraciones if migraciones is not None else MIGRACIONES)
+
+    def _sql(self, sql):
+        return sql.replace("%s", "?") if self.motor == "sqlite" else sql
+
+    def ejecutar(self, sql, params=()):
+        """
+        Ejecuta una sentencia sin resultados (marcadores %s en los dos motores).
+        """
+        cursor = self.conexion.cursor()
+        try:
+            cursor.execute(self._sql(sql), params)
+        finally:
+            cursor.close()
+
+    def consultar(self, sql, params=()):
+        """
+        Ejecuta una consulta y devuelve (nombres de columna, filas).
+        """
+        cursor = self.conexion.cursor()
+        try:
+            cursor.execute(self._sql(sql), params)
+            filas = cursor.fetchall()
+            columnas = [d[0].lower() for d in cursor.description or ()]
+            return columnas, filas
+        finally:
+            cursor.close()
+
+    def crear_indice(self, nombre, tabla, columnas, sin_mayusculas=False):
+        """
+        Crea el índice si no existe; si existe con otra definición lo rehace.
+        MySQL no admite CREATE INDEX IF NOT EXISTS, así que se consulta information_schema.
+        :return: bool, True si se ha creado o rehecho
+        """
+        if self.motor == "sqlite":
+            definicion = ", ".join(f"{c} COLLATE NOCASE" if sin_mayusculas else c for c in columnas)
+            sql = f"CREATE INDEX {nombre} ON {tabla} ({definicion})"
+            _, filas = self.consultar("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = %s", (nombre,))
+            existe = bool(filas)
+            if existe and _normalizar(filas[0][0] or "") == _normalizar(sql):
+                return False
+            borrar = f"DROP INDEX {nombre}"
+        else:
+            sql = f"CREATE INDEX {nombre} ON {tabla} ({', '.join(columnas)})"
+            _, filas = self.consultar(
+                "SELECT column_name FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s ORDER BY seq_in_index",
+                (tabla, nombre))
+            existe = bool(filas)
+            if [f[0].lower() for f in filas] == [c.lower() for c in columnas]:
+                return False
+            borrar = f"DROP INDEX {nombre} ON {tabla}"
+        if existe:
+            self.ejecutar(borrar)
+        self.ejecutar(sql)
+        return True
+
+    def versiones_aplicadas(self):
+        """
+        Devuelve un dict versión -> fecha de aplicación, creando antes la tabla de control si no existe.
+        """
+        self.ejecutar("CREATE TABLE IF NOT EXISTS schema_migrations ("
+                      "version INTEGER PRIMARY KEY, "
+                      "descripcion VARCHAR(200) NOT NULL, "
+                      "aplicada_en DATETIME NOT NULL)")
+        _, filas = self.consultar("SELECT version, aplicada_en FROM schema_migrations")
+        return {version: aplicada_en for version, aplicada_en in filas}
+
+    def estado(self):
+        """
+        :return: list[(versión, descripción, fecha de aplicación o None si está pendiente)]
+        """
+        aplicadas = self.versiones_aplicadas()
+        self._terminar()
+        return [(version, descripcion, aplicadas.get(version)) for version, descripcion, _ in self.migraciones]
+
+    def migrar(self, hasta=None):
+        """
+        Aplica en orden las migraciones pendientes (hasta la versión `hasta` incluida, si se indica).
+        Varios procesos pueden migrar a la vez: en SQLite cada migración se aplica dentro de una
+        transacción BEGIN IMMEDIATE y en MySQL se toma un bloqueo con nombre mientras se migra.
+        :return: list[int] versiones aplicadas en esta llamada
+        """
+        if self.motor == "mysql":
+            _, filas = self.consultar("SELECT GET_LOCK(CONCAT('migraciones_', DATABASE()), 60)")
+            if not filas or filas[0][0] != 1:
+                raise RuntimeError("No se pudo obtener el bloqueo de migraciones.")
+        try:
+            aplicadas = []
+            for version, descripcion, pasos in self.migraciones:
+                if hasta is not None and version > hasta:
+                    break
+                if self._aplicar(version, descripcion, pasos):
+                    aplicadas.append(version)
+            return aplicadas
+        finally:
+            if self.motor == "mysql":
+                self.consultar("SELECT RELEASE_LOCK(CONCAT('migraciones_', DATABASE()))")
+                self._terminar()
+
+    def _aplicar(self, version, descripcion, pasos):
+        """
+        Aplica una migración si no está anotada y la anota.
+        En MySQL las sentencias DDL confirman por sí solas, así que una migración interrumpida
+        se repite entera la próxima vez (por eso cada paso es idempotente).
+        """
+        if self.motor == "sqlite":
+            self.ejecutar("BEGIN IMMEDIATE")
+        try:
+            if version in self.versiones_aplicadas():
+                self._terminar()
+                return False
+            for paso in pasos:
+                paso(self)
+            self.ejecutar("INSERT INTO schema_migrations (version, descripcion, aplicada_en) VALUES (%s, %s, %s)",
+                          (version, descripcion, datetime.now().isoformat(" ", "seconds")))
+            self._terminar()
+            return True
+        except BaseException:
+            self.conexion.rollback()
+            raise
+
+    def _terminar(self):
+        """
+        Confirma la transacción abierta (en SQLite solo si hay una).
+        """
+        if self.motor == "mysql" or self.conexion.in_transaction:
+            self.conexion.commit()
+
+    def plan(self, sql, params=()):
+        """
+        Devuelve el plan de ejecución de una consulta (marcadores %s) según EXPLAIN.
+        :return: list[dict] con una entrada por tabla leída: tabla (nombre real, no el alias),
+                 completo (True si recorre la tabla o el índice entero), indice (nombre, "PRIMARY"
+                 para la clave primaria o None), filas (estimación de MySQL; None en SQLite) y detalle
+        """
+        alias = _alias_tablas(sql)
+        pasos = []
+        if self.motor == "sqlite":
+            _, filas = self.consultar("EXPLAIN QUERY PLAN " + sql, params)
+            for fila in filas:
+                detalle = fila[-1]
+                encontrado = _PASO_SQLITE.match(detalle)
+                if not encontrado:
+                    # Pasos sin tabla: USE TEMP B-TREE FOR ORDER BY, subconsultas, etc.
+                    continue
+                operacion, tabla, nombre, indice_usado = encontrado.group(1, 2, 3, 4)
+                if indice_usado is None and "PRIMARY KEY" in detalle:
+                    indice_usado = "PRIMARY"
+                pasos.append({
+                    "tabla": tabla if nombre else alias.get(tabla, tabla),
+                    "completo": operacion == "SCAN",
+                    "indice": indice_usado,
+                    "filas": None,
+                    "detalle": detalle,
+                })
+        else:
+            columnas, filas = self.consultar("EXPLAIN " + sql, params)
+            for fila in filas:
+                datos = dict(zip(columnas, fila))
+                if datos.get("table") is None:
+                    continue
+                # ALL: toda la tabla; index: todo el índice
+                pasos.append({
+                    "tabla": alias.get(datos["table"], datos["table"]),
+                    "completo": datos.get("type") in ("ALL", "index"),
+                    "indice": datos.get("key"),
+                    "filas": datos.get("rows"),
+                    "detalle": f"type={datos.get('type')} key={datos.get('key')} rows={datos.get('rows')}",
+                })
+            self._terminar()
+        return pasos
+
+    def verificar(self, consultas=None):
+        """
+        Comprueba con EXPLAIN que cada consulta usa su índice y no recorre ninguna tabla entera.
+        :param consultas: iterable de (nombre, DAO, método, argumentos, argumentos con nombre, índice
+                          esperado); por defecto CONSULTAS_INDEXADAS
+        :return: list[dict] con nombre, correcta, indices (usados) y plan
+        """
+        resultados = []
+        for nombre, dao, metodo, args, kwargs, esperado in (consultas if consultas is not None else CONSULTAS_INDEXADAS):
+            sentencias = sentencias_dao(dao, metodo, *args, **kwargs)
+            pasos = [paso for sql, params in sentencias for paso in self.plan(sql, params)]
+            indices = [p["indice"] for p in pasos if p["indice"]]
+            correcta = (bool(sentencias) and not any(p["completo"] for p in pasos)
+                        and (esperado is None or esperado in indices))
+            resultados.append({"nombre": nombre, "correcta": correcta, "indices": indices, "plan": pasos})
+        return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migraciones del esquema de la base de datos")
+    parser.add_argument("accion", nargs="?", default="migrar", choices=("migrar", "estado", "verificar"),
+                        help="migrar (por defecto), estado o verificar los planes de las consultas")
+    parser.add_argument("--hasta", type=int, default=None, help="Versión máxima a aplicar")
+    args = parser.parse_args()
+
+    pool = crear_db_manager().pool
+    entrada = pool.acquire()
+    try:
+        migraciones = migrador(entrada.conexion, backend)
+        if args.accion == "migrar":
+            aplicadas = migraciones.migrar(args.hasta)
+            print(f"Migraciones aplicadas: {', '.join(map(str, aplicadas))}" if aplicadas
+                  else "El esquema ya está al día.")
+        elif args.accion == "estado":
+            for version, descripcion, aplicada_en in migraciones.estado():
+                print(f"{version:>4}  {'aplicada ' + str(aplicada_en) if aplicada_en else 'pendiente':<30}  {descripcion}")
+        else:
+            fallos = 0
+            for resultado in migraciones.verificar():
+                fallos += not resultado["correcta"]
+                print(f"{'OK   ' if resultado['correcta'] else 'FALLO'}  {resultado['nombre']}")
+                for paso in resultado["plan"]:
+                    print(f"       {paso['tabla']}: {paso['detalle']}")
+            if fallos:
+                print(f"{fallos} consultas no usan su índice.")
+                sys.exit(1)
+    finally:
+        pool.release(entrada)
+        cerrar_pools()
+
+
+if __name__ == "__main__":
+    main()
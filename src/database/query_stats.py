@@ -0,0 +1,221 @@
+# Estadísticas de tiempo de las consultas a la base de datos
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+
+# Límites superiores (ms) de los intervalos del histograma de latencias: cada uno es un 25 %
+# mayor que el anterior, desde 0,01 ms hasta unos 450 s, así que un percentil se estima
+# con un error máximo del 25 %.
+LIMITES_MS = tuple(0.01 * 1.25 ** i for i in range(80))
+
+_LITERALES = re.compile(r"'(?:[^'\\]|\\.|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_CASOS = re.compile(r"(?:WHEN \? THEN \? ?)+", re.IGNORECASE)
+_ESPACIOS = re.compile(r"\s+")
+
+# Módulos que ejecutan las consultas: el sitio de la llamada es el primer marco fuera de ellos
+_MODULOS_INTERNOS = {"src.database.db_manager", "src.database.sqlite_manager", __name__}
+
+
+@lru_cache(maxsize=1024)
+def huella(sql_query):
+    """
+    Normaliza una sentencia para agrupar las ejecuciones de la misma consulta: sustituye
+    literales y marcadores por '?', y colapsa las listas IN (...) y los CASE de longitud variable.
+    """
+    texto = _ESPACIOS.sub(" ", sql_query.replace("%s", "?")).strip()
+    texto = _LITERALES.sub("?", texto)
+    texto = _LISTAS.sub("(...)", texto)
+    return _CASOS.sub("WHEN ? THEN ? ... ", texto)
+
+
+def sitio_llamada(profundidad=3):
+    """
+    Describe los primeros marcos de la pila fuera de los gestores de base de datos
+    (normalmente el método del DAO y quien lo llamó).
+    """
+    marco = sys._getframe(1)
+    sitios = []
+    while marco is not None and len(sitios) < profundidad:
+        if marco.f_globals.get("__name__") not in _MODULOS_INTERNOS:
+            codigo = marco.f_code
+            archivo = codigo.co_filename.replace("\\", "/").rsplit("/", 1)[-1]
+            sitios.append(f"{archivo}:{marco.f_lineno} {codigo.co_name}")
+        marco = marco.f_back
+    return " <- ".join(sitios)
+
+
+def nombre_transaccion(funcion):
+    """
+    Nombre con el que se registra una transacción: la función que la ejecuta.
+    """
+    nombre = getattr(funcion, "__qualname__", type(funcion).__name__)
+    return "TRANSACCION " + nombre.replace(".<locals>", "")
+
+
+class cursor_medido:
+    """
+    Envuelve el cursor de una transacción para registrar cada sentencia que ejecuta.
+    Opcionalmente adapta el texto de las sentencias antes de ejecutarlas (p. ej. los marcadores).
+    """
+    def __init__(self, cursor, estadisticas, traducir=None):
+        self._cursor = cursor
+        self._estadisticas = estadisticas
+        self._traducir = traducir
+
+    def _ejecutar(self, metodo, sql_query, params):
+        inicio = time.perf_counter()
+        fallo = True
+        try:
+            resultado = metodo(self._traducir(sql_query) if self._traducir else sql_query, params)
+            fallo = False
+            return resultado
+        finally:
+            self._estadisticas.registrar(sql_query, time.perf_counter() - inicio,
+                                         0 if fallo else max(self._cursor.rowcount, 0), fallo)
+
+    def execute(self, sql_query, params=()):
+        return self._ejecutar(self._cursor.execute, sql_query, params)
+
+    def executemany(self, sql_query, params_list):
+        return self._ejecutar(self._cursor.executemany, sql_query, params_list)
+
+    def __getattr__(self, nombre):
+        # rowcount, lastrowid, fetchone, fetchall, close... se delegan en el cursor real
+        return getattr(self._cursor, nombre)
+
+
+class _estadistica_sentencia:
+    """
+    Contadores acumulados de una huella de consulta.
+    """
+    __slots__ = ("huella", "llamadas", "errores", "filas", "total", "maximo", "cubetas")
+
+    def __init__(self, huella):
+        self.huella = huella
+        self.llamadas = 0
+        self.errores = 0
+        self.filas = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.cubetas = [0] * (len(LIMITES_MS) + 1)
+
+    def percentil(self, fraccion):
+        """
+        Estima el percentil como el límite superior del intervalo que lo contiene.
+        """
+        objetivo = fraccion * self.llamadas
+        acumulado = 0
+        for indice, cuenta in enumerate(self.cubetas):
+            acumulado += cuenta
+            if cuenta and acumulado >= objetivo:
+                return min(LIMITES_MS[indice], self.maximo) if indice < len(LIMITES_MS) else self.maximo
+        return 0.0
+
+
+class query_stats:
+    """
+    Registro de tiempos por consulta, compartido por todo el proceso y seguro entre hilos.
+    Agrupa las ejecuciones por huella (sentencia normalizada) y guarda las consultas lentas
+    más recientes con el sitio desde el que se lanzaron.
+    """
+    def __init__(self, umbral_lento_ms=200.0, activo=True, max_lentas=100):
+        """
+        :param umbral_lento_ms: float, milisegundos a partir de los cuales una consulta es lenta (0 desactiva)
+        :param activo: bool, si es False no se registra nada
+        :param max_lentas: int, consultas lentas recientes que se conservan
+        """
+        self.umbral_lento_ms = umbral_lento_ms
+        self.activo = activo
+        self._sentencias = {}
+        self._lentas = deque(maxlen=max_lentas)
+        self._lock = threading.Lock()
+
+    def registrar(self, sql_query, segundos, filas=0, error=False):
+        """
+        Anota una ejecución de la sentencia.
+        :param segundos: float, duración medida con time.perf_counter()
+        :param filas: int, filas devueltas o afectadas
+        :param error: bool, si la ejecución falló
+        """
+        if not self.activo:
+            return
+        clave = huella(sql_query)
+        ms = segundos * 1000.0
+        with self._lock:
+            estadistica = self._sentencias.get(clave)
+            if estadistica is None:
+                estadistica = self._sentencias[clave] = _estadistica_sentencia(clave)
+            estadistica.llamadas += 1
+            estadistica.filas += filas
+            estadistica.total += ms
+            if ms > estadistica.maximo:
+                estadistica.maximo = ms
+            if error:
+                estadistica.errores += 1
+            estadistica.cubetas[bisect_left(LIMITES_MS, ms)] += 1
+        if self.umbral_lento_ms and ms >= self.umbral_lento_ms:
+            sitio = sitio_llamada()
+            self._lentas.append({"momento": time.time(), "ms": ms, "filas": filas,
+                                 "sql": _ESPACIOS.sub(" ", sql_query).strip(), "sitio": sitio})
+            print(f"Consulta lenta ({ms:.1f} ms, {filas} filas) en {sitio}: {clave}")
+
+    def resumen(self):
+        """
+        Devuelve una lista de dicts, uno por huella, ordenada por tiempo total descendente.
+        """
+        with self._lock:
+            sentencias = list(self._sentencias.values())
+            filas = []
+            for e in sentencias:
+                filas.append({
+                    "huella": e.huella,
+                    "llamadas": e.llamadas,
+                    "errores": e.errores,
+                    "filas": e.filas,
+                    "filas_media": e.filas / e.llamadas,
+                    "total_ms": e.total,
+                    "media_ms": e.total / e.llamadas,
+                    "max_ms": e.maximo,
+                    "p50_ms": e.percentil(0.50),
+                    "p95_ms": e.percentil(0.95),
+                    "p99_ms": e.percentil(0.99),
+                })
+        filas.sort(key=lambda fila: fila["total_ms"], reverse=True)
+        return filas
+
+    def lentas(self):
+        """
+        Devuelve las consultas lentas más recientes (la última al final).
+        """
+        return list(self._lentas)
+
+    def reiniciar(self):
+        """
+        Borra todas las estadísticas acumuladas.
+        """
+        with self._lock:
+            self._sentencias.clear()
+            self._lentas.clear()
+
+    def volcar(self, destino=None, limite=20):
+        """
+        Escribe una tabla con las `limite` consultas que más tiempo acumulan.
+        :param destino: fichero de texto (por defecto la salida estándar)
+        """
+        destino = destino or sys.stdout
+        destino.write(f"{'llamadas':>9} {'total ms':>10} {'media':>8} {'p50':>8} {'p95':>8} "
+                      f"{'p99':>8} {'filas/ll':>8} {'errores':>7}  consulta\n")
+        for fila in self.resumen()[:limite]:
+            destino.write(f"{fila['llamadas']:>9} {fila['total_ms']:>10.1f} {fila['media_ms']:>8.2f} "
+                          f"{fila['p50_ms']:>8.2f} {fila['p95_ms']:>8.2f} {fila['p99_ms']:>8.2f} "
+                          f"{fila['filas_media']:>8.1f} {fila['errores']:>7}  {fila['huella'][:120]}\n")
+        lentas = self.lentas()
+        if lentas:
+            destino.write(f"\nConsultas lentas recientes (>= {self.umbral_lento_ms:g} ms):\n")
+            for lenta in lentas[-limite:]:
+                destino.write(f"{lenta['ms']:>10.1f} ms  {lenta['sitio']}\n    {lenta['sql'][:200]}\n")
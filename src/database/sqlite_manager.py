@@ -0,0 +1,356 @@
+# Gestor de base de datos SQLite con la misma interfaz que db_manager
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+
+from src.database.db_manager import (_entrada_pool, pool_compartido, bulk_chunk_size, stream_batch_size, pool_timeout,
+                                     statement_cache_size, estadisticas_consultas, TransaccionRevertidaError,
+                                     sentencia, es_escritura)
+from src.database.query_stats import cursor_medido, nombre_transaccion
+from src.database.migraciones import migrador
+
+# Conversión explícita de los tipos de Python que usan los modelos
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(" "))
+sqlite3.register_adapter(date, lambda valor: valor.isoformat())
+sqlite3.register_adapter(Decimal, float)
+
+
+@lru_cache(maxsize=512)
+def traducir(sql_query):
+    """
+    Adapta una sentencia escrita para MySQL (marcadores %s) al estilo de SQLite (?).
+    Los valores siempre viajan como parámetros, así que el texto no contiene otros '%s'.
+    """
+    return sql_query.replace("%s", "?")
+
+
+class sqlite_pool:
+    """
+    Conexiones a un fichero SQLite: una por hilo, abierta la primera vez que el hilo la pide
+    y reutilizada mientras viva. La primera conexión activa el modo WAL y crea o pone al día el esquema.
+    Las conexiones invalidadas y las de hilos que ya terminaron se cierran al abrir otra.
+    """
+    def __init__(self, ruta, timeout=None, cache_sentencias=None):
+        self.ruta = ruta
+        self.timeout = timeout if timeout is not None else pool_timeout
+        # 0: un cursor nuevo por consulta; si no, un cursor reutilizable por conexión
+        self.cache_sentencias = max(0, cache_sentencias if cache_sentencias is not None else statement_cache_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Conexiones abiertas y el hilo al que pertenece cada una
+        self._entradas = {}
+        self._esquema_creado = False
+
+    def _abrir(self):
+        """
+        Abre una conexión en modo autocommit: las transacciones se delimitan con BEGIN explícito.
+        La conexión guarda compiladas las últimas sentencias ejecutadas (el equivalente de SQLite
+        a las sentencias preparadas), al menos tantas como DB_STATEMENT_CACHE.
+        """
+        conexion = sqlite3.connect(self.ruta, timeout=self.timeout, isolation_level=None,
+                                   check_same_thread=False, cached_statements=max(128, self.cache_sentencias))
+        conexion.execute("PRAGMA foreign_keys = ON")
+        conexion.execute("PRAGMA synchronous = NORMAL")
+        with self._lock:
+            if not self._esquema_creado:
+                # WAL permite leer mientras otro hilo escribe
+                conexion.execute("PRAGMA journal_mode = WAL")
+                # Crea el esquema o aplica las migraciones que falten (ver migraciones.py)
+                migrador(conexion, "sqlite").migrar()
+                self._esquema_creado = True
+            entrada = _entrada_pool(conexion)
+            self._entradas[entrada] = threading.current_thread()
+            # Las conexiones de hilos terminados ya no las puede usar nadie
+            huerfanas = [e for e, hilo in self._entradas.items() if not hilo.is_alive()]
+            for huerfana in huerfanas:
+                del self._entradas[huerfana]
+        for huerfana in huerfanas:
+            self._cerrar(huerfana)
+        return entrada
+
+    @staticmethod
+    def _cerrar(entrada):
+        """
+        Cierra la conexión de una entrada que ya no está en el pool.
+        """
+        entrada.valida = False
+        try:
+            entrada.conexion.close()
+        except sqlite3.Error:
+            pass
+
+    def acquire(self, exclusiva=False):
+        """
+        Devuelve la conexión del hilo actual. En SQLite un cursor abierto no retiene ningún
+        servidor, así que los recorridos en streaming no necesitan una conexión exclusiva.
+        :return: _entrada_pool
+        """
+        entrada = getattr(self._local, 'entrada', None)
+        if entrada is None or not entrada.valida:
+            if entrada is not None:
+                # Se cierra la conexión invalidada antes de abrir la nueva
+                with self._lock:
+                    self._entradas.pop(entrada, None)
+                self._cerrar(entrada)
+            entrada = self._abrir()
+            self._local.entrada = entrada
+        return entrada
+
+    def release(self, entrada):
+        """
+        La conexión sigue asociada a su hilo; solo se anota el último uso.
+        """
+        entrada.ultimo_uso = time.monotonic()
+
+    def invalidate(self, entrada):
+        """
+        Marca una conexión para que el hilo abra otra la próxima vez.
+        """
+        entrada.valida = False
+
+    def close(self):
+        """
+        Cierra todas las conexiones abiertas. Los hilos que vuelvan a pedir una abren otra.
+        """
+        with self._lock:
+            entradas, self._entradas = list(self._entradas), {}
+        for entrada in entradas:
+            self._cerrar(entrada)
+
+
+def obtener_pool_sqlite(ruta):
+    """
+    Devuelve el pool compartido del fichero dado, creándolo la primera vez.
+    """
+    return pool_compartido(("sqlite", ruta), lambda: sqlite_pool(ruta))
+
+
+class sqlite_manager:
+    """
+    Gestor de base de datos sobre un fichero SQLite local, con la misma interfaz que db_manager.
+    Pensado para puestos de un solo usuario y para ejecutar las pruebas sin servidor MySQL.
+    """
+    def __init__(self, ruta):
+        """
+        :param ruta: str, fichero de la base de datos (se crea con el esquema si no existe)
+        """
+        self.ruta = ruta
+        self.pool = obtener_pool_sqlite(ruta)
+
+    @property
+    def connection(self):
+        """
+        Conexión del hilo actual.
+        """
+        return self.pool.acquire().conexion
+
+    def connect(self):
+        """
+        Devuelve la conexión del hilo actual, abriéndola si hace falta.
+        """
+        try:
+            return self.connection
+        except sqlite3.Error as e:
+            print(f"Error al abrir la base de datos SQLite: {e}")
+            return None
+
+    def disconnect(self):
+        """
+        No hace nada: la conexión sigue abierta para el hilo hasta cerrar_pools().
+        """
+
+    def execute_query(self, sql_query, params=None, fetch_one=False, fetch_all=False, rowcount=False):
+        """
+        Ejecuta una consulta SQL y maneja el cierre del cursor.
+        Retorna los resultados si es una consulta SELECT.
+        Parámetros:
+            sql_query: Consulta SQL a ejecutar (con marcadores %s)
+            params: Parámetros para la consulta (tupla/lista)
+            fetch_one: Si es True, retorna solo un resultado
+            fetch_all: Si es True, retorna todos los resultados
+            rowcount: Si es True, retorna el número de filas afectadas (None si la consulta falla)
+        """
+        try:
+            entrada = self.pool.acquire()
+        except sqlite3.Error as e:
+            print(f"Error al abrir la base de datos SQLite: {e}")
+            return None
+
+        connection = entrada.conexion
+        cursor = None
+        result = None
+        inicio = time.perf_counter()
+        filas = 0
+        fallo = False
+        reutilizable = self.pool.cache_sentencias > 0
+        try:
+            # La sentencia compilada la guarda la conexión, así que basta con un cursor por conexión
+            cursor = entrada.cursor(None, connection.cursor, 1) if reutilizable else connection.cursor()
+            cursor.execute(traducir(sql_query), params or ())
+            # En modo autocommit cada sentencia se confirma sola; dentro de una transacción
+            # explícita (ver transaccion()) se confirma al cerrarla
+            escritura = sql_query.escritura if isinstance(sql_query, sentencia) else es_escritura(sql_query)
+            if not entrada.transacciones and connection.in_transaction and escritura:
+                connection.commit()
+            if fetch_one:
+                result = cursor.fetchone()
+                filas = 1 if result else 0
+                if reutilizable:
+                    # Termina la sentencia: una lectura a medias mantendría abierta su instantánea
+                    cursor.fetchall()
+            elif fetch_all:
+                result = cursor.fetchall()
+                filas = len(result)
+            else:
+                filas = max(cursor.rowcount, 0)
+                if rowcount:
+                    result = cursor.rowcount
+        except sqlite3.Error as e:
+            fallo = True
+            print(f"Error al ejecutar consulta: {e}")
+            if entrada.transacciones:
+                # Dentro de una transacción explícita se revierte todo al cerrarla
+                entrada.fallida = True
+            else:
+                try:
+                    connection.rollback()
+                except sqlite3.Error:
+                    pass
+        finally:
+            if cursor and not reutilizable:
+                cursor.close()
+            self.pool.release(entrada)
+            estadisticas_consultas.registrar(sql_query, time.perf_counter() - inicio, filas, fallo)
+        return result
+
+    def execute_many(self, sql_query, params_list, chunk_size=None):
+        """
+        Ejecuta una sentencia de escritura para muchas filas dentro de una única transacción,
+        en lotes de `chunk_size` filas. Si un lote falla, se reintenta fila a fila para
+        identificar qué filas son erróneas; las demás se confirman igualmente al final.
+        Retorna una lista de tuplas (índice, mensaje de error) con las filas rechazadas.
+        """
+        filas = list(params_list)
+        if not filas:
+            return []
+        chunk_size = max(1, chunk_size or bulk_chunk_size)
+
+        def aplicar(cursor):
+            fallos = []
+            for inicio in range(0, len(filas), chunk_size):
+                lote = filas[inicio:inicio + chunk_size]
+                cursor.execute("SAVEPOINT lote")
+                try:
+                    cursor.executemany(sql_query, lote)
+                    cursor.execute("RELEASE SAVEPOINT lote")
+                    continue
+                except sqlite3.Error:
+                    cursor.execute("ROLLBACK TO SAVEPOINT lote")
+                for desplazamiento, params in enumerate(lote):
+                    cursor.execute("SAVEPOINT fila")
+                    try:
+                        cursor.execute(sql_query, params)
+                        cursor.execute("RELEASE SAVEPOINT fila")
+                    except sqlite3.Error as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT fila")
+                        fallos.append((inicio + desplazamiento, str(e)))
+            return fallos
+
+        try:
+            return self.execute_transaction(aplicar)
+        except sqlite3.Error as e:
+            print(f"Error al ejecutar inserción masiva: {e}")
+            return [(indice, str(e)) for indice in range(len(filas))]
+
+    def iter_query(self, sql_query, params=None, batch_size=None):
+        """
+        Ejecuta una consulta SELECT y entrega las filas una a una, leyéndolas en bloques
+        de `batch_size` filas. Si el recorrido se abandona, basta con cerrar el cursor.
+        """
+        batch_size = max(1, batch_size or stream_batch_size)
+        entrada = self.pool.acquire()
+        cursor = entrada.conexion.cursor()
+        leidas = 0
+        # Solo se mide el tiempo de execute y fetchmany, no el del consumidor (ver db_manager.iter_query)
+        en_bd = 0.0
+        inicio = time.perf_counter()
+        try:
+            cursor.execute(traducir(sql_query), params or ())
+            while True:
+                filas = cursor.fetchmany(batch_size)
+                en_bd += time.perf_counter() - inicio
+                if not filas:
+                    break
+                leidas += len(filas)
+                for fila in filas:
+                    yield fila
+                inicio = time.perf_counter()
+        finally:
+            cursor.close()
+            self.pool.release(entrada)
+            estadisticas_consultas.registrar(sql_query, en_bd, leidas)
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Unidad de trabajo: las consultas del hilo no se confirman hasta el final del bloque
+        `with`, con un único commit. Revierte todo si el bloque lanza una excepción o si alguna
+        consulta falla (en ese caso lanza TransaccionRevertidaError al salir). Las transacciones
+        anidadas son savepoints. La transacción exterior se abre con BEGIN IMMEDIATE para reservar
+        la escritura desde el principio y no fallar a mitad si otro hilo empieza a escribir.
+        Entrega un cursor para ejecutar sentencias propias dentro de la transacción.
+        """
+        entrada = self.pool.acquire()
+        connection = entrada.conexion
+        nivel = entrada.transacciones
+        fallida_previa = entrada.fallida
+        cursor = connection.cursor()
+        abierta = False
+        try:
+            cursor.execute(f"SAVEPOINT transaccion_{nivel}" if nivel else "BEGIN IMMEDIATE")
+            abierta = True
+            entrada.transacciones = nivel + 1
+            entrada.fallida = False
+            # El cursor medido traduce los marcadores y registra cada sentencia
+            yield cursor_medido(cursor, estadisticas_consultas, traducir)
+            if entrada.fallida:
+                raise TransaccionRevertidaError()
+            if nivel:
+                cursor.execute(f"RELEASE SAVEPOINT transaccion_{nivel}")
+            else:
+                connection.commit()
+        except BaseException:
+            if abierta:
+                if nivel:
+                    cursor.execute(f"ROLLBACK TO SAVEPOINT transaccion_{nivel}")
+                    cursor.execute(f"RELEASE SAVEPOINT transaccion_{nivel}")
+                elif connection.in_transaction:
+                    connection.rollback()
+            raise
+        finally:
+            if abierta:
+                entrada.transacciones = nivel
+                entrada.fallida = fallida_previa
+            cursor.close()
+            self.pool.release(entrada)
+
+    def execute_transaction(self, funcion):
+        """
+        Ejecuta `funcion(cursor)` dentro de una única transacción (un savepoint si ya hay una
+        abierta en el hilo). Confirma al terminar sin errores y revierte si `funcion` lanza una
+        excepción, que se propaga al llamador.
+        Retorna el valor devuelto por `funcion`.
+        """
+        inicio = time.perf_counter()
+        fallo = True
+        try:
+            with self.transaccion() as cursor:
+                resultado = funcion(cursor)
+            fallo = False
+            return resultado
+        finally:
+            estadisticas_consultas.registrar(nombre_transaccion(funcion), time.perf_counter() - inicio, 0, fallo)
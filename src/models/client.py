@@ -4,6 +4,9 @@ class Client:
     """
     Modelo que representa un cliente en el sistema de gestión de almacén.
     """
+    # Sin __dict__ por instancia: reduce la memoria al cargar muchos clientes
+    __slots__ = ("id_cliente", "nombre_cliente", "direccion", "telefono", "email")
+
     def __init__(self, id_cliente, nombre_cliente, telefono, email, direccion):
         """
         Inicializa un nuevo cliente.
@@ -0,0 +1,13 @@
+# Conversión rápida de filas de la base de datos en modelos
+from itertools import starmap
+
+
+def fabrica_filas(clase):
+    """
+    Devuelve una función que convierte una lista de filas (tuplas en el orden del constructor)
+    en una lista de instancias de `clase`. starmap llama al constructor desde C, sin el coste
+    de desempaquetar cada fila en un bucle de Python.
+    """
+    def convertir(filas):
+        return list(starmap(clase, filas))
+    return convertir
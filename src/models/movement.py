@@ -3,6 +3,10 @@ class Movement:
     """
     Modelo que representa un movimiento de inventario en el sistema de gestión de almacén.
     """
+    # Sin __dict__ por instancia: reduce la memoria al cargar muchos movimientos
+    __slots__ = ("id_movimiento", "id_producto", "cantidad", "tipo_movimiento", "fecha_movimiento",
+                 "referencia_origen", "id_usuario", "id_cliente_proveedor")
+
     def __init__(self, id_movimiento, id_producto, tipo_movimiento, cantidad, fecha_movimiento, referencia_origen, id_usuario, id_cliente_proveedor):
         """
         Inicializa un nuevo movimiento.
@@ -0,0 +1,39 @@
+# Modelo de lectura de un movimiento con los datos de su producto y su cliente o proveedor
+class MovementDetail:
+    """
+    Movimiento junto con el nombre y el SKU de su producto y el nombre de su cliente (salidas)
+    o proveedor (entradas), tal como se muestra en la pestaña de movimientos. Solo se lee:
+    para modificar un movimiento se usa Movement.
+    """
+    # Sin __dict__ por instancia: reduce la memoria al cargar muchos movimientos
+    __slots__ = ("id_movimiento", "id_producto", "tipo_movimiento", "cantidad", "fecha_movimiento",
+                 "referencia_origen", "id_usuario", "id_cliente_proveedor",
+                 "nombre_producto", "sku", "nombre_cliente_proveedor")
+
+    def __init__(self, id_movimiento, id_producto, tipo_movimiento, cantidad, fecha_movimiento, referencia_origen,
+                 id_usuario, id_cliente_proveedor, nombre_producto, sku, nombre_cliente_proveedor):
+        """
+        Inicializa el detalle de un movimiento. Los primeros campos son los de Movement.
+        :param nombre_producto: str o None si el producto ya no existe
+        :param sku: str o None, SKU del producto
+        :param nombre_cliente_proveedor: str o None, nombre del cliente (salida) o del proveedor (entrada)
+        """
+        self.id_movimiento = id_movimiento
+        self.id_producto = id_producto
+        self.tipo_movimiento = tipo_movimiento
+        self.cantidad = cantidad
+        self.fecha_movimiento = fecha_movimiento
+        self.referencia_origen = referencia_origen
+        self.id_usuario = id_usuario
+        self.id_cliente_proveedor = id_cliente_proveedor
+        self.nombre_producto = nombre_producto
+        self.sku = sku
+        self.nombre_cliente_proveedor = nombre_cliente_proveedor
+
+    def __str__(self):
+        """
+        Devuelve una representación en cadena del detalle del movimiento.
+        """
+        return (f"DetalleMovimiento({self.id_movimiento}, {self.nombre_producto} [{self.sku}], {self.tipo_movimiento}, "
+                f"{self.cantidad}, {self.fecha_movimiento}, {self.referencia_origen}, {self.id_usuario}, "
+                f"{self.nombre_cliente_proveedor})")
@@ -3,6 +3,10 @@ class Product:
     """
     Modelo que representa un producto en el sistema de gestión de almacén.
     """
+    # Sin __dict__ por instancia: reduce la memoria al cargar muchos productos
+    __slots__ = ("id_producto", "nombre_producto", "descripcion", "sku", "precio_unitario",
+                 "stock_actual", "stock_minimo", "ubicacion", "id_proveedor", "fecha_alta")
+
     def __init__(self, id_producto, nombre_producto, descripcion, sku, precio_unitario, stok_actual, stock_minimo, ubicacion, id_proveedor, fecha_alta):
         """
         Inicializa un nuevo producto.
@@ -3,6 +3,9 @@ class Supplier:
     """
     Modelo que representa un proveedor en el sistema de gestión de almacén.
     """
+    # Sin __dict__ por instancia: reduce la memoria al cargar muchos proveedores
+    __slots__ = ("id_proveedor", "nombre_proveedor", "telefono", "email", "direccion")
+
     def __init__(self, id_proveedor, nombre_proveedor, telefono, email, direccion):
         """
         Inicializa un nuevo proveedor.
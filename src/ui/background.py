@@ -0,0 +1,107 @@
+# Ejecución de consultas en segundo plano para no bloquear la interfaz
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import tkinter as tk
+
+
+class BackgroundRunner:
+    """
+    Ejecuta funciones bloqueantes (consultas a la base de datos) en un pool de hilos compartido
+    y entrega sus resultados en el hilo de Tk, que es el único que puede tocar los widgets.
+    Los resultados se recogen de una cola sondeada con after(), ya que Tk no es seguro entre hilos.
+    Las peticiones con la misma clave se sustituyen: al lanzar una nueva se cancela la anterior
+    si aún no había empezado y, si ya estaba en marcha, su resultado se descarta.
+    """
+    # Pool compartido por todas las vistas; no debe superar el tamaño del pool de conexiones
+    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="consultas")
+
+    def __init__(self, widget, al_cambiar_ocupado=None, intervalo_ms=30):
+        """
+        :param widget: widget de Tk sobre el que se programan los sondeos con after()
+        :param al_cambiar_ocupado: función (bool) llamada al empezar y terminar el trabajo pendiente
+        :param intervalo_ms: int, milisegundos entre sondeos de la cola de resultados
+        """
+        self.widget = widget
+        self.al_cambiar_ocupado = al_cambiar_ocupado
+        self.intervalo_ms = intervalo_ms
+        self._cola = queue.Queue()
+        self._generaciones = {}  # clave -> número de la última petición lanzada
+        self._futuros = {}       # clave -> futuro de la última petición lanzada
+        self._pendientes = 0
+        self._sondeo = None
+
+    def ejecutar(self, funcion, al_terminar=None, al_fallar=None, clave=None):
+        """
+        Ejecuta `funcion()` en segundo plano.
+        :param al_terminar: función (resultado) llamada en el hilo de Tk si termina bien
+        :param al_fallar: función (excepción) llamada en el hilo de Tk si lanza una excepción
+        :param clave: objeto hashable; una petición nueva con la misma clave sustituye a la anterior
+        """
+        generacion = None
+        if clave is not None:
+            self.cancelar(clave)
+            generacion = self._generaciones[clave]
+        futuro = self._executor.submit(funcion)
+        if clave is not None:
+            self._futuros[clave] = futuro
+        self._pendientes += 1
+        if self._pendientes == 1:
+            self._notificar(True)
+        futuro.add_done_callback(
+            lambda f: self._cola.put((f, clave, generacion, al_terminar, al_fallar)))
+        self._programar_sondeo()
+
+    def cancelar(self, clave):
+        """
+        Descarta la petición en curso con esa clave: se cancela si no ha empezado
+        y su resultado no se entregará.
+        """
+        self._generaciones[clave] = self._generaciones.get(clave, 0) + 1
+        futuro = self._futuros.pop(clave, None)
+        if futuro is not None:
+            futuro.cancel()
+
+    def _programar_sondeo(self):
+        if self._sondeo is None:
+            try:
+                self._sondeo = self.widget.after(self.intervalo_ms, self._sondear)
+            except tk.TclError:
+                # El widget ya no existe: no hay a quién entregar los resultados
+                self._sondeo = None
+
+    def _sondear(self):
+        """
+        Entrega en el hilo de Tk los resultados que hayan llegado a la cola.
+        """
+        self._sondeo = None
+        while True:
+            try:
+                futuro, clave, generacion, al_terminar, al_fallar = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            self._pendientes -= 1
+            if clave is not None:
+                if generacion != self._generaciones.get(clave):
+                    continue  # Petición sustituida por otra más reciente
+                self._futuros.pop(clave, None)
+            if futuro.cancelled():
+                continue
+            error = futuro.exception()
+            if error is not None:
+                if al_fallar:
+                    al_fallar(error)
+                else:
+                    print(f"Error en tarea en segundo plano: {error}")
+            elif al_terminar:
+                al_terminar(futuro.result())
+        if self._pendientes:
+            self._programar_sondeo()
+        else:
+            self._notificar(False)
+
+    def _notificar(self, ocupado):
+        if self.al_cambiar_ocupado:
+            try:
+                self.al_cambiar_ocupado(ocupado)
+            except tk.TclError:
+                pass
@@ -2,6 +2,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.core.inventory_manager import InventoryManager
+from src.ui.virtual_table import VirtualTable
+from src.ui.background import BackgroundRunner
 
 class ClientView(ttk.Frame):
     """
@@ -11,6 +13,8 @@ class ClientView(ttk.Frame):
         super().__init__(master)
         self.manager = InventoryManager()
         # Instancia el gestor de inventario para acceder a la lógica de negocio
+        self.runner = BackgroundRunner(self, self._indicar_carga)
+        # Las consultas se hacen en segundo plano para no congelar la ventana
         self._crear_widgets()
         # Crea los widgets de la interfaz y carga los clientes al iniciar la vista
         self._cargar_clientes()
@@ -26,16 +30,16 @@ class ClientView(ttk.Frame):
         btn_buscar.pack(side=tk.LEFT)
         btn_limpiar = ttk.Button(self.frame_busqueda, text="Limpiar", command=self._limpiar_busqueda)
         btn_limpiar.pack(side=tk.LEFT, padx=5)
+        self.lbl_estado = ttk.Label(self.frame_busqueda, foreground="gray")
+        self.lbl_estado.pack(side=tk.RIGHT)
         # Frame de lista y botones
         # --- Tabla de clientes ---
         # Muestra la lista de clientes en formato de tabla
         self.frame_lista = ttk.Frame(self)
         self.frame_lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.tree = ttk.Treeview(self.frame_lista, columns=("ID", "Nombre", "Teléfono", "Email", "Dirección"), show="headings")
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=120)
-        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tabla = VirtualTable(self.frame_lista, ("ID", "Nombre", "Teléfono", "Email", "Dirección"), ancho=120, ejecutor=self.runner)
+        self.tabla.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.tabla.tree
         # --- Botones de acción ---
         # Permiten agregar y eliminar clientes
         self.frame_botones = ttk.Frame(self)
@@ -45,17 +49,42 @@ class ClientView(ttk.Frame):
         self.btn_eliminar = ttk.Button(self.frame_botones, text="Eliminar cliente", command=self._eliminar_cliente)
         self.btn_eliminar.grid(row=0, column=1, padx=5)
         
+    def _indicar_carga(self, ocupado):
+        """
+        Muestra u oculta el indicador de carga mientras hay consultas en curso.
+        """
+        self.lbl_estado.config(text="Cargando..." if ocupado else "")
+        self.config(cursor="watch" if ocupado else "")
+
     def _filtrar_clientes(self):
         """
-        Filtra los clientes por nombre según el texto de búsqueda ingresado en la barra.
+        Busca en la base de datos los clientes cuyo nombre empieza por el texto ingresado en la barra
+        y, si ninguno empieza así, los que lo contienen.
+        """
+        texto = self.entry_busqueda.get().strip()
+        if not texto:
+            self._cargar_clientes()
+            return
+        modo = ["prefijo"]
+
+        def pagina(ultima, limite):
+            clientes = self.manager.buscar_clientes(texto, modo[0], limite, ultima[0] if ultima else None)
+            if not clientes and ultima is None and modo[0] == "prefijo":
+                # Ningún nombre empieza por el texto: se busca en cualquier parte del nombre
+                modo[0] = "contiene"
+                clientes = self.manager.buscar_clientes(texto, modo[0], limite)
+            return [self._fila(c) for c in clientes]
+        self.tabla.cargar(pagina)
+
+    def _aplicar_alta(self, fila):
+        """
+        Muestra un cliente recién guardado sin volver a consultar la tabla. Si hay una búsqueda
+        activa o la tabla no puede colocarlo, repite la consulta.
         """
-        texto = self.entry_busqueda.get().lower()
-        todos = self.manager.listar_clientes()
-        filtrados = [c for c in todos if texto in c.nombre_cliente.lower()]
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        for c in filtrados:
-            self.tree.insert("", tk.END, values=(c.id_cliente, c.nombre_cliente, c.telefono, c.email, c.direccion))
+        if self.entry_busqueda.get().strip():
+            self._filtrar_clientes()
+        elif not self.tabla.insertar_fila(fila):
+            self._cargar_clientes()
 
     def _limpiar_busqueda(self):
         """
@@ -64,12 +93,24 @@ class ClientView(ttk.Frame):
         self.entry_busqueda.delete(0, tk.END)
         self._cargar_clientes()
 
-    def _cargar_clientes(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        clientes = self.manager.listar_clientes()
-        for c in clientes:
-            self.tree.insert("", tk.END, values=(c.id_cliente, c.nombre_cliente, c.telefono, c.email, c.direccion))
+    @staticmethod
+    def _fila(c):
+        """
+        Valores de un cliente en el orden de las columnas de la tabla.
+        """
+        return (c.id_cliente, c.nombre_cliente, c.telefono, c.email, c.direccion)
+
+    def _cargar_clientes(self, clientes=None):
+        """
+        Carga los clientes en la tabla. Si se pasa una lista, la usa; si no, los pide por páginas
+        a medida que el usuario se desplaza.
+        """
+        if clientes is not None:
+            self.tabla.mostrar_filas([self._fila(c) for c in clientes])
+            return
+        self.tabla.cargar(
+            lambda ultima, limite: [self._fila(c) for c in self.manager.listar_clientes_pagina(limite, ultima[0] if ultima else None)],
+            self.manager.contar_clientes)
 
     def _abrir_agregar(self):
         win = tk.Toplevel(self)
@@ -107,10 +148,6 @@ class ClientView(ttk.Frame):
                 if not datos[0].isdigit():
                     messagebox.showerror("Error", "El ID debe ser un número entero.")
                     return
-                clientes_existentes = self.manager.listar_clientes()
-                if any(c.id_cliente == int(datos[0]) for c in clientes_existentes):
-                    messagebox.showerror("Error", f"El ID {datos[0]} ya existe para otro cliente.")
-                    return
                 datos[0] = int(datos[0])
                 # Validación de teléfono (solo dígitos y longitud adecuada)
                 if not validar_telefono(datos[2]):
@@ -120,14 +157,40 @@ class ClientView(ttk.Frame):
                 if not validar_email(datos[3]):
                     messagebox.showerror("Error", "El email no tiene un formato válido.")
                     return
-                # Si todo es válido, agrega el cliente usando el gestor
-                self.manager.agregar_cliente(*datos)
-                messagebox.showinfo("Éxito", "Cliente agregado correctamente")
-                win.destroy()
-                self._cargar_clientes()
             except Exception as e:
                 # Muestra un mensaje si ocurre un error inesperado
                 messagebox.showerror("Error", f"No se pudo agregar el cliente: {e}")
+                return
+
+            def insertar():
+                """
+                Comprueba que el ID no exista y agrega el cliente (en segundo plano).
+                Devuelve (mensaje de error o None, registro guardado).
+                """
+                if self.manager.existe_cliente(datos[0]):
+                    return f"El ID {datos[0]} ya existe para otro cliente.", None
+                cliente = self.manager.agregar_cliente(*datos)
+                if cliente is None:
+                    return "No se pudo guardar el cliente en la base de datos.", None
+                return None, cliente
+
+            def al_terminar(resultado):
+                error, cliente = resultado
+                if error:
+                    btn_guardar.state(["!disabled"])
+                    messagebox.showerror("Error", error)
+                    return
+                messagebox.showinfo("Éxito", "Cliente agregado correctamente")
+                win.destroy()
+                self._aplicar_alta(self._fila(cliente))
+
+            def al_fallar(e):
+                btn_guardar.state(["!disabled"])
+                messagebox.showerror("Error", f"No se pudo agregar el cliente: {e}")
+
+            # Evita guardar dos veces mientras la inserción está en curso
+            btn_guardar.state(["disabled"])
+            self.runner.ejecutar(insertar, al_terminar, al_fallar)
 
         btn_guardar = ttk.Button(win, text="Guardar", command=guardar)
         btn_guardar.grid(row=len(labels), column=0, columnspan=2, pady=10)
@@ -141,6 +204,15 @@ class ClientView(ttk.Frame):
             messagebox.showwarning("Advertencia", "Seleccione un cliente para eliminar")
             return
         id_cliente = self.tree.item(seleccionado[0])["values"][0]
-        self.manager.eliminar_cliente(id_cliente)
-        self._cargar_clientes()
-        messagebox.showinfo("Éxito", "Cliente eliminado")
+
+        def al_terminar(eliminado):
+            if not eliminado:
+                # Ya no existía o la base de datos lo rechazó: se vuelve a consultar la tabla
+                self._cargar_clientes()
+                messagebox.showerror("Error", "No se pudo eliminar el cliente: puede que ya no exista o tenga registros asociados.")
+                return
+            self.tabla.eliminar_fila(id_cliente)
+            messagebox.showinfo("Éxito", "Cliente eliminado")
+
+        self.runner.ejecutar(lambda: self.manager.eliminar_cliente(id_cliente), al_terminar,
+                             lambda e: messagebox.showerror("Error", f"No se pudo eliminar el cliente: {e}"))
@@ -2,6 +2,7 @@
 Ventana principal de la aplicación con pestañas.
 Este archivo define la interfaz principal y la estructura de navegación entre las vistas de productos, clientes, proveedores y movimientos.
 """
+import os
 import tkinter as tk
 from tkinter import ttk
 from src.ui.product_view import ProductView
@@ -9,6 +10,17 @@ from src.ui.client_view import ClientView  # Asegúrate de que src/ui/client_vie
 from src.ui.supplier_view import SupplierView
 from src.ui.movement_view import MovementView
 
+# Crear las pestañas no visitadas en segundo plano tras mostrar la primera (UI_PRECARGAR_PESTANAS=1)
+precargar_pestanas = os.getenv('UI_PRECARGAR_PESTANAS', '0') == '1'
+
+# Pestañas de la ventana principal: (título, clase de la vista)
+PESTANAS = (
+    ("Productos", ProductView),
+    ("Clientes", ClientView),
+    ("Proveedores", SupplierView),
+    ("Movimientos", MovementView),
+)
+
 class PlaceholderView(ttk.Frame):
     """
     Vista de marcador de posición para futuras pestañas o mensajes.
@@ -21,36 +33,64 @@ class PlaceholderView(ttk.Frame):
 class MainWindow(tk.Tk):
     """
     Ventana principal gráfica con pestañas para gestionar productos, clientes, proveedores y movimientos.
+    Cada vista se crea (y consulta la base de datos) la primera vez que se selecciona su pestaña.
     """
-    def __init__(self):
+    def __init__(self, precargar=None):
+        """
+        :param precargar: bool o None; si es True, las pestañas no visitadas se crean una a una
+                          tras pintar la primera. Por defecto se usa UI_PRECARGAR_PESTANAS.
+        """
         super().__init__()
         # Configura el título y tamaño de la ventana principal
         self.title("Gestión de Almacén")
         self.geometry("900x500")
+        self.precargar = precargar_pestanas if precargar is None else precargar
         self._crear_widgets()
 
     def _crear_widgets(self):
         """
-        Crea el widget Notebook y agrega las pestañas de cada módulo principal.
+        Crea el widget Notebook con un contenedor vacío por pestaña; las vistas se crean bajo demanda.
         """
-        notebook = ttk.Notebook(self)
-        notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
 
-        # Pestaña de productos
-        tab_productos = ProductView(master=notebook)
-        notebook.add(tab_productos, text="Productos")
+        self._clases = {}  # Nombre del contenedor -> clase de la vista pendiente de crear
+        self.vistas = {}   # Nombre del contenedor -> vista ya creada
+        for texto, clase in PESTANAS:
+            contenedor = ttk.Frame(self.notebook)
+            self.notebook.add(contenedor, text=texto)
+            self._clases[str(contenedor)] = clase
 
-        # Pestaña de clientes
-        tab_clientes = ClientView(master=notebook)
-        notebook.add(tab_clientes, text="Clientes")
+        self.notebook.bind("<<NotebookTabChanged>>", self._al_cambiar_pestana)
+        self._crear_vista(self.notebook.select())
+        if self.precargar:
+            # after_idle se ejecuta cuando la primera pestaña ya se ha pintado
+            self.after_idle(self._precargar_siguiente)
 
-        # Pestaña de proveedores
-        tab_proveedores = SupplierView(master=notebook)
-        notebook.add(tab_proveedores, text="Proveedores")
+    def _al_cambiar_pestana(self, event):
+        self._crear_vista(self.notebook.select())
 
-        # Pestaña de movimientos
-        tab_movimientos = MovementView(master=notebook)
-        notebook.add(tab_movimientos, text="Movimientos")
+    def _crear_vista(self, contenedor):
+        """
+        Crea la vista de una pestaña si aún no existe.
+        :param contenedor: str, nombre Tk del contenedor de la pestaña
+        """
+        clase = self._clases.pop(contenedor, None)
+        if clase is None:
+            return
+        vista = clase(master=self.nametowidget(contenedor))
+        vista.pack(fill=tk.BOTH, expand=True)
+        self.vistas[contenedor] = vista
+
+    def _precargar_siguiente(self):
+        """
+        Crea la siguiente pestaña pendiente y se vuelve a programar, dejando que Tk atienda
+        los eventos entre una y otra. Los datos de cada vista se cargan en segundo plano.
+        """
+        if not self._clases:
+            return
+        self._crear_vista(next(iter(self._clases)))
+        self.after(50, self._precargar_siguiente)
 
 # Punto de entrada de la aplicación
 if __name__ == "__main__":
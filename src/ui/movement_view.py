@@ -1,7 +1,28 @@
 # Vista gráfica de movimientos
 import tkinter as tk
 from tkinter import ttk, messagebox
+from datetime import datetime
 from src.core.inventory_manager import InventoryManager
+from src.ui.virtual_table import VirtualTable
+from src.ui.background import BackgroundRunner
+
+
+def _rango_fechas(texto):
+    """
+    Convierte un texto "AAAA", "AAAA-MM" o "AAAA-MM-DD" en el intervalo [desde, hasta) que cubre.
+    Lanza ValueError si el formato no es válido.
+    """
+    partes = texto.split("-")
+    if len(partes) == 1:
+        desde = datetime.strptime(texto, "%Y")
+        return desde, desde.replace(year=desde.year + 1)
+    if len(partes) == 2:
+        desde = datetime.strptime(texto, "%Y-%m")
+        if desde.month == 12:
+            return desde, desde.replace(year=desde.year + 1, month=1)
+        return desde, desde.replace(month=desde.month + 1)
+    desde = datetime.strptime(texto, "%Y-%m-%d")
+    return desde, datetime.fromordinal(desde.toordinal() + 1)
 
 class MovementView(ttk.Frame):
     """
@@ -11,6 +32,8 @@ class MovementView(ttk.Frame):
         super().__init__(master)
         # Instancia el gestor de inventario para acceder a la lógica de negocio
         self.manager = InventoryManager()
+        # Las consultas se hacen en segundo plano para no congelar la ventana
+        self.runner = BackgroundRunner(self, self._indicar_carga)
         self._crear_widgets()
         self._cargar_movimientos()
 
@@ -21,23 +44,23 @@ class MovementView(ttk.Frame):
         # Frame para barra de búsqueda
         self.frame_busqueda = ttk.Frame(self)
         self.frame_busqueda.pack(fill=tk.X, padx=10, pady=(10,0))
-        ttk.Label(self.frame_busqueda, text="Buscar por fecha de movimiento:").pack(side=tk.LEFT)
+        ttk.Label(self.frame_busqueda, text="Buscar por fecha (AAAA-MM-DD):").pack(side=tk.LEFT)
         self.entry_busqueda = ttk.Entry(self.frame_busqueda)
         self.entry_busqueda.pack(side=tk.LEFT, padx=5)
         btn_buscar = ttk.Button(self.frame_busqueda, text="Buscar", command=self._filtrar_movimientos)
         btn_buscar.pack(side=tk.LEFT)
         btn_limpiar = ttk.Button(self.frame_busqueda, text="Limpiar", command=self._limpiar_busqueda)
         btn_limpiar.pack(side=tk.LEFT, padx=5)
+        self.lbl_estado = ttk.Label(self.frame_busqueda, foreground="gray")
+        self.lbl_estado.pack(side=tk.RIGHT)
 
         self.frame_lista = ttk.Frame(self)
         self.frame_lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        # Tabla para mostrar los movimientos
-        self.tree = ttk.Treeview(self.frame_lista, columns=("ID", "Producto", "Tipo", "Cantidad", "Fecha", "Referencia", "Usuario", "Cliente/Proveedor"), show="headings")
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100)
-        self.tree.pack(fill=tk.BOTH, expand=True)
+        # Tabla para mostrar los movimientos (solo se pintan las filas visibles)
+        self.tabla = VirtualTable(self.frame_lista, ("ID", "Producto", "SKU", "Tipo", "Cantidad", "Fecha", "Referencia", "Usuario", "Cliente/Proveedor"), ancho=100, ejecutor=self.runner)
+        self.tabla.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.tabla.tree
 
         # Botones para registrar y eliminar movimientos
         self.frame_botones = ttk.Frame(self)
@@ -48,25 +71,63 @@ class MovementView(ttk.Frame):
         self.btn_eliminar = ttk.Button(self.frame_botones, text="Eliminar movimiento", command=self._eliminar_movimiento)
         self.btn_eliminar.grid(row=0, column=1, padx=5)
 
+    def _indicar_carga(self, ocupado):
+        """
+        Muestra u oculta el indicador de carga mientras hay consultas en curso.
+        """
+        self.lbl_estado.config(text="Cargando..." if ocupado else "")
+        self.config(cursor="watch" if ocupado else "")
+
+    @staticmethod
+    def _fila(m):
+        """
+        Valores del detalle de un movimiento (MovementDetail) en el orden de las columnas de la tabla.
+        Si el producto o el cliente/proveedor ya no existen se muestra su ID.
+        """
+        producto = m.nombre_producto if m.nombre_producto is not None else m.id_producto
+        contraparte = m.nombre_cliente_proveedor if m.nombre_cliente_proveedor is not None else m.id_cliente_proveedor
+        return (m.id_movimiento, producto, m.sku or "", m.tipo_movimiento, m.cantidad, m.fecha_movimiento,
+                m.referencia_origen, m.id_usuario, contraparte)
+
     def _cargar_movimientos(self, movimientos=None):
         """
-        Carga la lista de movimientos en la tabla. Si se pasa una lista, la usa; si no, carga todos.
+        Carga los movimientos en la tabla. Si se pasa una lista de detalles, la usa; si no, los pide
+        por páginas (una consulta con los nombres ya resueltos) a medida que el usuario se desplaza.
         """
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        if movimientos is None:
-            movimientos = self.manager.listar_movimientos()
-        for m in movimientos:
-            self.tree.insert("", tk.END, values=(m.id_movimiento, m.id_producto, m.tipo_movimiento, m.cantidad, m.fecha_movimiento, m.referencia_origen, m.id_usuario, m.id_cliente_proveedor))
+        if movimientos is not None:
+            self.tabla.mostrar_filas([self._fila(m) for m in movimientos])
+            return
+        self.tabla.cargar(
+            lambda ultima, limite: [self._fila(m) for m in self.manager.listar_movimientos_detalle(limite, ultima[0] if ultima else None)],
+            self.manager.contar_movimientos)
 
     def _filtrar_movimientos(self):
         """
-        Filtra los movimientos por fecha según el texto de búsqueda.
+        Busca en la base de datos los movimientos del año, mes o día indicado en la barra de búsqueda.
+        """
+        texto = self.entry_busqueda.get().strip()
+        if not texto:
+            self._cargar_movimientos()
+            return
+        try:
+            desde, hasta = _rango_fechas(texto)
+        except ValueError:
+            messagebox.showerror("Error", "La fecha debe tener el formato AAAA, AAAA-MM o AAAA-MM-DD.")
+            return
+        # Paginación por (fecha, id): columnas 5 y 0 de la última fila recibida
+        self.tabla.cargar(
+            lambda ultima, limite: [self._fila(m) for m in self.manager.listar_movimientos_detalle(
+                limite, (ultima[5], ultima[0]) if ultima else None, desde, hasta)])
+
+    def _aplicar_alta(self, fila):
+        """
+        Muestra un movimiento recién guardado sin volver a consultar la tabla. Si hay una búsqueda
+        activa o la tabla no puede colocarlo, repite la consulta.
         """
-        texto = self.entry_busqueda.get().lower()
-        todos = self.manager.listar_movimientos()
-        filtrados = [m for m in todos if texto in str(m.fecha_movimiento).lower()]
-        self._cargar_movimientos(filtrados)
+        if self.entry_busqueda.get().strip():
+            self._filtrar_movimientos()
+        elif not self.tabla.insertar_fila(fila):
+            self._cargar_movimientos()
 
     def _limpiar_busqueda(self):
         """
@@ -100,22 +161,50 @@ class MovementView(ttk.Frame):
                 if not datos[0].isdigit():
                     messagebox.showerror("Error", "El ID debe ser un número entero.")
                     return
-                movimientos_existentes = self.manager.listar_movimientos()
-                if any(m.id_movimiento == int(datos[0]) for m in movimientos_existentes):
-                    messagebox.showerror("Error", f"El ID {datos[0]} ya existe para otro movimiento.")
-                    return
                 datos[0] = int(datos[0])
                 datos[1] = int(datos[1])
                 datos[3] = int(datos[3])
                 datos[6] = int(datos[6])
                 datos[7] = int(datos[7])
-                self.manager.registrar_movimiento(*datos)
+            except Exception as e:
+                messagebox.showerror("Error", f"No se pudo registrar el movimiento: {e}")
+                return
+
+            def registrar():
+                """
+                Comprueba que el ID no exista y registra el movimiento (en segundo plano).
+                Devuelve (mensaje de error o None, registro guardado).
+                """
+                if self.manager.existe_movimiento(datos[0]):
+                    return f"El ID {datos[0]} ya existe para otro movimiento.", None
+                movimiento = self.manager.registrar_movimiento(*datos)
+                if movimiento is None:
+                    return "No se pudo registrar el movimiento en la base de datos.", None
+                # Se relee con los nombres de su producto y su cliente/proveedor para mostrarlo
+                return None, self.manager.obtener_movimiento_detalle(movimiento.id_movimiento)
+
+            def al_terminar(resultado):
+                error, movimiento = resultado
+                if error:
+                    btn_guardar.state(["!disabled"])
+                    messagebox.showerror("Error", error)
+                    return
                 messagebox.showinfo("Éxito", "Movimiento registrado correctamente")
                 win.destroy()
-                self._cargar_movimientos()
-            except Exception as e:
+                if movimiento is None:
+                    # Se guardó pero no se pudo releer: se vuelve a consultar la tabla
+                    self._cargar_movimientos()
+                else:
+                    self._aplicar_alta(self._fila(movimiento))
+
+            def al_fallar(e):
+                btn_guardar.state(["!disabled"])
                 messagebox.showerror("Error", f"No se pudo registrar el movimiento: {e}")
 
+            # Evita guardar dos veces mientras el registro está en curso
+            btn_guardar.state(["disabled"])
+            self.runner.ejecutar(registrar, al_terminar, al_fallar)
+
         btn_guardar = ttk.Button(win, text="Guardar", command=guardar)
         btn_guardar.grid(row=len(labels), column=0, columnspan=2, pady=10)
 
@@ -128,6 +217,15 @@ class MovementView(ttk.Frame):
             messagebox.showwarning("Advertencia", "Seleccione un movimiento para eliminar")
             return
         id_movimiento = self.tree.item(seleccionado[0])["values"][0]
-        self.manager.eliminar_movimiento(id_movimiento)
-        self._cargar_movimientos()
-        messagebox.showinfo("Éxito", "Movimiento eliminado")
+
+        def al_terminar(eliminado):
+            if not eliminado:
+                # Ya no existía o la base de datos lo rechazó: se vuelve a consultar la tabla
+                self._cargar_movimientos()
+                messagebox.showerror("Error", "No se pudo eliminar el movimiento: puede que ya no exista o tenga registros asociados.")
+                return
+            self.tabla.eliminar_fila(id_movimiento)
+            messagebox.showinfo("Éxito", "Movimiento eliminado")
+
+        self.runner.ejecutar(lambda: self.manager.eliminar_movimiento(id_movimiento), al_terminar,
+                             lambda e: messagebox.showerror("Error", f"No se pudo eliminar el movimiento: {e}"))
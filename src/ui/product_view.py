@@ -2,6 +2,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.core.inventory_manager import InventoryManager
+from src.ui.virtual_table import VirtualTable
+from src.ui.background import BackgroundRunner
 
 class ProductView(ttk.Frame):
     """
@@ -11,6 +13,8 @@ class ProductView(ttk.Frame):
         super().__init__(master)
         # Instancia el gestor de inventario para acceder a la lógica de negocio
         self.manager = InventoryManager()
+        # Las consultas se hacen en segundo plano para no congelar la ventana
+        self.runner = BackgroundRunner(self, self._indicar_carga)
         self._crear_widgets()
         self._cargar_productos()
 
@@ -21,23 +25,23 @@ class ProductView(ttk.Frame):
         # Frame para barra de búsqueda
         self.frame_busqueda = ttk.Frame(self)
         self.frame_busqueda.pack(fill=tk.X, padx=10, pady=(10,0))
-        ttk.Label(self.frame_busqueda, text="Buscar por nombre de producto:").pack(side=tk.LEFT)
+        ttk.Label(self.frame_busqueda, text="Buscar por nombre de producto o SKU:").pack(side=tk.LEFT)
         self.entry_busqueda = ttk.Entry(self.frame_busqueda)
         self.entry_busqueda.pack(side=tk.LEFT, padx=5)
         btn_buscar = ttk.Button(self.frame_busqueda, text="Buscar", command=self._filtrar_productos)
         btn_buscar.pack(side=tk.LEFT)
         btn_limpiar = ttk.Button(self.frame_busqueda, text="Limpiar", command=self._limpiar_busqueda)
         btn_limpiar.pack(side=tk.LEFT, padx=5)
+        self.lbl_estado = ttk.Label(self.frame_busqueda, foreground="gray")
+        self.lbl_estado.pack(side=tk.RIGHT)
 
         self.frame_lista = ttk.Frame(self)
         self.frame_lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        # Tabla para mostrar los productos
-        self.tree = ttk.Treeview(self.frame_lista, columns=("ID", "Nombre", "Descripción", "SKU", "Precio", "Stock", "Mínimo", "Ubicación", "Proveedor", "Fecha"), show="headings")
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=80)
-        self.tree.pack(fill=tk.BOTH, expand=True)
+        # Tabla para mostrar los productos (solo se pintan las filas visibles)
+        self.tabla = VirtualTable(self.frame_lista, ("ID", "Nombre", "Descripción", "SKU", "Precio", "Stock", "Mínimo", "Ubicación", "Proveedor", "Fecha"), ancho=80, ejecutor=self.runner)
+        self.tabla.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.tabla.tree
 
         # Botones para agregar y eliminar productos
         self.frame_botones = ttk.Frame(self)
@@ -48,25 +52,69 @@ class ProductView(ttk.Frame):
         self.btn_eliminar = ttk.Button(self.frame_botones, text="Eliminar producto", command=self._eliminar_producto)
         self.btn_eliminar.grid(row=0, column=1, padx=5)
 
+    def _indicar_carga(self, ocupado):
+        """
+        Muestra u oculta el indicador de carga mientras hay consultas en curso.
+        """
+        self.lbl_estado.config(text="Cargando..." if ocupado else "")
+        self.config(cursor="watch" if ocupado else "")
+
+    @staticmethod
+    def _fila(p):
+        """
+        Valores de un producto en el orden de las columnas de la tabla.
+        """
+        return (p.id_producto, p.nombre_producto, p.descripcion, p.sku, p.precio_unitario, p.stock_actual, p.stock_minimo, p.ubicacion, p.id_proveedor, p.fecha_alta)
+
     def _cargar_productos(self, productos=None):
         """
-        Carga la lista de productos en la tabla. Si se pasa una lista, la usa; si no, carga todos.
+        Carga los productos en la tabla. Si se pasa una lista, la usa; si no, los pide por páginas
+        a medida que el usuario se desplaza.
         """
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        if productos is None:
-            productos = self.manager.listar_productos()
-        for p in productos:
-            self.tree.insert("", tk.END, values=(p.id_producto, p.nombre_producto, p.descripcion, p.sku, p.precio_unitario, p.stock_actual, p.stock_minimo, p.ubicacion, p.id_proveedor, p.fecha_alta))
+        if productos is not None:
+            self.tabla.mostrar_filas([self._fila(p) for p in productos])
+            return
+        self.tabla.cargar(
+            lambda ultima, limite: [self._fila(p) for p in self.manager.listar_productos_pagina(limite, ultima[0] if ultima else None)],
+            self.manager.contar_productos)
 
     def _filtrar_productos(self):
         """
-        Filtra los productos por nombre según el texto de búsqueda.
+        Busca en la base de datos el producto con el SKU indicado o, si no existe, los productos
+        cuyo nombre empieza por el texto de búsqueda y, si ninguno empieza así, los que lo contienen.
+        """
+        texto = self.entry_busqueda.get().strip()
+        if not texto:
+            self._cargar_productos()
+            return
+
+        def mostrar(producto):
+            if producto:
+                self._cargar_productos([producto])
+                return
+            modo = ["prefijo"]
+
+            def pagina(ultima, limite):
+                productos = self.manager.buscar_productos(texto, modo[0], limite, ultima[0] if ultima else None)
+                if not productos and ultima is None and modo[0] == "prefijo":
+                    # Ningún nombre empieza por el texto: se busca en cualquier parte del nombre
+                    modo[0] = "contiene"
+                    productos = self.manager.buscar_productos(texto, modo[0], limite)
+                return [self._fila(p) for p in productos]
+            self.tabla.cargar(pagina)
+
+        # Misma clave que la tabla: una búsqueda o recarga posterior descarta esta
+        self.runner.ejecutar(lambda: self.manager.buscar_producto_por_sku(texto), mostrar, clave=self.tabla)
+
+    def _aplicar_alta(self, fila):
+        """
+        Muestra un producto recién guardado sin volver a consultar la tabla. Si hay una búsqueda
+        activa o la tabla no puede colocarlo, repite la consulta.
         """
-        texto = self.entry_busqueda.get().lower()
-        todos = self.manager.listar_productos()
-        filtrados = [p for p in todos if texto in p.nombre_producto.lower()]
-        self._cargar_productos(filtrados)
+        if self.entry_busqueda.get().strip():
+            self._filtrar_productos()
+        elif not self.tabla.insertar_fila(fila):
+            self._cargar_productos()
 
     def _limpiar_busqueda(self):
         """
@@ -115,11 +163,6 @@ class ProductView(ttk.Frame):
                 if not es_entero(datos[0]):
                     messagebox.showerror("Error", "El ID debe ser un número entero.")
                     return
-                # Validación de ID único
-                productos_existentes = self.manager.listar_productos()
-                if any(p.id_producto == int(datos[0]) for p in productos_existentes):
-                    messagebox.showerror("Error", f"El ID {datos[0]} ya existe para otro producto.")
-                    return
                 if not es_flotante(datos[4]):
                     messagebox.showerror("Error", "El precio unitario debe ser un número positivo.")
                     return
@@ -138,13 +181,42 @@ class ProductView(ttk.Frame):
                 datos[5] = int(datos[5])
                 datos[6] = int(datos[6])
                 datos[8] = int(datos[8])
-                self.manager.agregar_producto(*datos)
+            except Exception as e:
+                messagebox.showerror("Error", f"No se pudo agregar el producto: {e}")
+                return
+
+            def insertar():
+                """
+                Comprueba las claves únicas e inserta el producto (en segundo plano).
+                Devuelve (mensaje de error o None, registro guardado).
+                """
+                if self.manager.existe_producto(datos[0]):
+                    return f"El ID {datos[0]} ya existe para otro producto.", None
+                if datos[3] and self.manager.existe_sku(datos[3]):
+                    return f"El SKU {datos[3]} ya existe para otro producto.", None
+                producto = self.manager.agregar_producto(*datos)
+                if producto is None:
+                    return "No se pudo guardar el producto en la base de datos.", None
+                return None, producto
+
+            def al_terminar(resultado):
+                error, producto = resultado
+                if error:
+                    btn_guardar.state(["!disabled"])
+                    messagebox.showerror("Error", error)
+                    return
                 messagebox.showinfo("Éxito", "Producto agregado correctamente")
                 win.destroy()
-                self._cargar_productos()
-            except Exception as e:
+                self._aplicar_alta(self._fila(producto))
+
+            def al_fallar(e):
+                btn_guardar.state(["!disabled"])
                 messagebox.showerror("Error", f"No se pudo agregar el producto: {e}")
 
+            # Evita guardar dos veces mientras la inserción está en curso
+            btn_guardar.state(["disabled"])
+            self.runner.ejecutar(insertar, al_terminar, al_fallar)
+
         btn_guardar = ttk.Button(win, text="Guardar", command=guardar)
         btn_guardar.grid(row=len(labels), column=0, columnspan=2, pady=10)
 
@@ -157,6 +229,15 @@ class ProductView(ttk.Frame):
             messagebox.showwarning("Advertencia", "Seleccione un producto para eliminar")
             return
         id_producto = self.tree.item(seleccionado[0])["values"][0]
-        self.manager.eliminar_producto(id_producto)
-        self._cargar_productos()
-        messagebox.showinfo("Éxito", "Producto eliminado")
+
+        def al_terminar(eliminado):
+            if not eliminado:
+                # Ya no existía o la base de datos lo rechazó: se vuelve a consultar la tabla
+                self._cargar_productos()
+                messagebox.showerror("Error", "No se pudo eliminar el producto: puede que ya no exista o tenga registros asociados.")
+                return
+            self.tabla.eliminar_fila(id_producto)
+            messagebox.showinfo("Éxito", "Producto eliminado")
+
+        self.runner.ejecutar(lambda: self.manager.eliminar_producto(id_producto), al_terminar,
+                             lambda e: messagebox.showerror("Error", f"No se pudo eliminar el producto: {e}"))
@@ -2,6 +2,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.core.inventory_manager import InventoryManager
+from src.ui.virtual_table import VirtualTable
+from src.ui.background import BackgroundRunner
 
 class SupplierView(ttk.Frame):
     """
@@ -11,6 +13,8 @@ class SupplierView(ttk.Frame):
         super().__init__(master)
         # Instancia el gestor de inventario para acceder a la lógica de negocio
         self.manager = InventoryManager()
+        # Las consultas se hacen en segundo plano para no congelar la ventana
+        self.runner = BackgroundRunner(self, self._indicar_carga)
         self._crear_widgets()
         self._cargar_proveedores()
 
@@ -28,16 +32,16 @@ class SupplierView(ttk.Frame):
         btn_buscar.pack(side=tk.LEFT)
         btn_limpiar = ttk.Button(self.frame_busqueda, text="Limpiar", command=self._limpiar_busqueda)
         btn_limpiar.pack(side=tk.LEFT, padx=5)
+        self.lbl_estado = ttk.Label(self.frame_busqueda, foreground="gray")
+        self.lbl_estado.pack(side=tk.RIGHT)
 
         self.frame_lista = ttk.Frame(self)
         self.frame_lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        # Tabla para mostrar los proveedores
-        self.tree = ttk.Treeview(self.frame_lista, columns=("ID", "Nombre", "Teléfono", "Email", "Dirección"), show="headings")
-        for col in self.tree["columns"]:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=120)
-        self.tree.pack(fill=tk.BOTH, expand=True)
+        # Tabla para mostrar los proveedores (solo se pintan las filas visibles)
+        self.tabla = VirtualTable(self.frame_lista, ("ID", "Nombre", "Teléfono", "Email", "Dirección"), ancho=120, ejecutor=self.runner)
+        self.tabla.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.tabla.tree
 
         # Botones para agregar y eliminar proveedores
         self.frame_botones = ttk.Frame(self)
@@ -48,25 +52,61 @@ class SupplierView(ttk.Frame):
         self.btn_eliminar = ttk.Button(self.frame_botones, text="Eliminar proveedor", command=self._eliminar_proveedor)
         self.btn_eliminar.grid(row=0, column=1, padx=5)
 
+    def _indicar_carga(self, ocupado):
+        """
+        Muestra u oculta el indicador de carga mientras hay consultas en curso.
+        """
+        self.lbl_estado.config(text="Cargando..." if ocupado else "")
+        self.config(cursor="watch" if ocupado else "")
+
+    @staticmethod
+    def _fila(p):
+        """
+        Valores de un proveedor en el orden de las columnas de la tabla.
+        """
+        return (p.id_proveedor, p.nombre_proveedor, p.telefono, p.email, p.direccion)
+
     def _cargar_proveedores(self, proveedores=None):
         """
-        Carga la lista de proveedores en la tabla. Si se pasa una lista, la usa; si no, carga todos.
+        Carga los proveedores en la tabla. Si se pasa una lista, la usa; si no, los pide por páginas
+        a medida que el usuario se desplaza.
         """
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        if proveedores is None:
-            proveedores = self.manager.listar_proveedores()
-        for p in proveedores:
-            self.tree.insert("", tk.END, values=(p.id_proveedor, p.nombre_proveedor, p.telefono, p.email, p.direccion))
+        if proveedores is not None:
+            self.tabla.mostrar_filas([self._fila(p) for p in proveedores])
+            return
+        self.tabla.cargar(
+            lambda ultima, limite: [self._fila(p) for p in self.manager.listar_proveedores_pagina(limite, ultima[0] if ultima else None)],
+            self.manager.contar_proveedores)
 
     def _filtrar_proveedores(self):
         """
-        Filtra los proveedores por nombre según el texto de búsqueda.
+        Busca en la base de datos los proveedores cuyo nombre empieza por el texto de búsqueda
+        y, si ninguno empieza así, los que lo contienen.
         """
-        texto = self.entry_busqueda.get().lower()
-        todos = self.manager.listar_proveedores()
-        filtrados = [p for p in todos if texto in p.nombre_proveedor.lower()]
-        self._cargar_proveedores(filtrados)
+        texto = self.entry_busqueda.get().strip()
+        if not texto:
+            self._cargar_proveedores()
+            return
+        modo = ["prefijo"]
+
+        def pagina(ultima, limite):
+            proveedores = self.manager.buscar_proveedores(texto, modo[0], limite, ultima[0] if ultima else None)
+            if not proveedores and ultima is None and modo[0] == "prefijo":
+                # Ningún nombre empieza por el texto: se busca en cualquier parte del nombre
+                modo[0] = "contiene"
+                proveedores = self.manager.buscar_proveedores(texto, modo[0], limite)
+            return [self._fila(p) for p in proveedores]
+        self.tabla.cargar(pagina)
+
+    def _aplicar_alta(self, fila):
+        """
+        Muestra un proveedor recién guardado sin volver a consultar la tabla. Si hay una búsqueda
+        activa o la tabla no puede colocarlo, repite la consulta.
+        """
+        if self.entry_busqueda.get().strip():
+            self._filtrar_proveedores()
+        elif not self.tabla.insertar_fila(fila):
+            self._cargar_proveedores()
 
     def _limpiar_busqueda(self):
         """
@@ -114,10 +154,6 @@ class SupplierView(ttk.Frame):
                 if not datos[0].isdigit():
                     messagebox.showerror("Error", "El ID debe ser un número entero.")
                     return
-                proveedores_existentes = self.manager.listar_proveedores()
-                if any(p.id_proveedor == int(datos[0]) for p in proveedores_existentes):
-                    messagebox.showerror("Error", f"El ID {datos[0]} ya existe para otro proveedor.")
-                    return
                 datos[0] = int(datos[0])
                 # Validación de teléfono
                 if not validar_telefono(datos[2]):
@@ -127,13 +163,40 @@ class SupplierView(ttk.Frame):
                 if not validar_email(datos[3]):
                     messagebox.showerror("Error", "El email no tiene un formato válido.")
                     return
-                self.manager.agregar_proveedor(*datos)
+            except Exception as e:
+                messagebox.showerror("Error", f"No se pudo agregar el proveedor: {e}")
+                return
+
+            def insertar():
+                """
+                Comprueba que el ID no exista y agrega el proveedor (en segundo plano).
+                Devuelve (mensaje de error o None, registro guardado).
+                """
+                if self.manager.existe_proveedor(datos[0]):
+                    return f"El ID {datos[0]} ya existe para otro proveedor.", None
+                proveedor = self.manager.agregar_proveedor(*datos)
+                if proveedor is None:
+                    return "No se pudo guardar el proveedor en la base de datos.", None
+                return None, proveedor
+
+            def al_terminar(resultado):
+                error, proveedor = resultado
+                if error:
+                    btn_guardar.state(["!disabled"])
+                    messagebox.showerror("Error", error)
+                    return
                 messagebox.showinfo("Éxito", "Proveedor agregado correctamente")
                 win.destroy()
-                self._cargar_proveedores()
-            except Exception as e:
+                self._aplicar_alta(self._fila(proveedor))
+
+            def al_fallar(e):
+                btn_guardar.state(["!disabled"])
                 messagebox.showerror("Error", f"No se pudo agregar el proveedor: {e}")
 
+            # Evita guardar dos veces mientras la inserción está en curso
+            btn_guardar.state(["disabled"])
+            self.runner.ejecutar(insertar, al_terminar, al_fallar)
+
         btn_guardar = ttk.Button(win, text="Guardar", command=guardar)
         btn_guardar.grid(row=len(labels), column=0, columnspan=2, pady=10)
 
@@ -146,6 +209,15 @@ class SupplierView(ttk.Frame):
             messagebox.showwarning("Advertencia", "Seleccione un proveedor para eliminar")
             return
         id_proveedor = self.tree.item(seleccionado[0])["values"][0]
-        self.manager.eliminar_proveedor(id_proveedor)
-        self._cargar_proveedores()
-        messagebox.showinfo("Éxito", "Proveedor eliminado")
+
+        def al_terminar(eliminado):
+            if not eliminado:
+                # Ya no existía o la base de datos lo rechazó: se vuelve a consultar la tabla
+                self._cargar_proveedores()
+                messagebox.showerror("Error", "No se pudo eliminar el proveedor: puede que ya no exista o tenga registros asociados.")
+                return
+            self.tabla.eliminar_fila(id_proveedor)
+            messagebox.showinfo("Éxito", "Proveedor eliminado")
+
+        self.runner.ejecutar(lambda: self.manager.eliminar_proveedor(id_proveedor), al_terminar,
+                             lambda e: messagebox.showerror("Error", f"No se pudo eliminar el proveedor: {e}"))
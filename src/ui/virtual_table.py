@@ -0,0 +1,344 @@
+# Tabla con desplazamiento virtual para resultados grandes
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Tabla basada en Treeview que solo crea los elementos de las filas visibles.
+    Las filas se piden por páginas a una función de carga a medida que el usuario se desplaza
+    (desplazamiento infinito), de modo que el coste de pintar no depende del tamaño de la tabla.
+    Cada elemento del Treeview usa como iid la primera columna de la fila (la clave primaria).
+    Si se le da un BackgroundRunner, las páginas se piden en segundo plano y se pintan al llegar.
+    """
+    ALTO_FILA_POR_DEFECTO = 20
+    ALTO_CABECERA = 25
+
+    def __init__(self, master, columnas, ancho=100, tamano_pagina=200, ejecutor=None):
+        """
+        :param columnas: tupla con los títulos de las columnas
+        :param ancho: int, ancho inicial de cada columna
+        :param tamano_pagina: int, filas pedidas en cada carga
+        :param ejecutor: BackgroundRunner o None para pedir las páginas en el hilo de Tk
+        """
+        super().__init__(master)
+        self.tamano_pagina = tamano_pagina
+        self.ejecutor = ejecutor
+        self.tree = ttk.Treeview(self, columns=columnas, show="headings", selectmode="browse")
+        for col in columnas:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=ancho)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        self.etiqueta = ttk.Label(self, anchor=tk.W)
+        self.tree.grid(row=0, column=0, sticky=tk.NSEW)
+        self.scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.etiqueta.grid(row=1, column=0, columnspan=2, sticky=tk.EW)
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self._filas = []            # Filas cargadas (tuplas de valores)
+        self._obtener_pagina = None  # Función (ultima_fila, limite) -> list[tuple]
+        self._agotado = True        # No quedan más filas por pedir
+        self._total = None          # Total conocido de filas, si se proporcionó
+        self._inicio = 0            # Índice de la primera fila visible
+        self._inicio_deseado = 0    # Inicio pedido mientras se espera una página
+        self._cargando = False      # Hay una página pedida en segundo plano
+        self._visibles = 20         # Número de filas que caben en pantalla
+        self._seleccionada = None   # iid de la fila seleccionada
+
+        self.tree.bind("<Configure>", self._al_redimensionar)
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+        self.tree.bind("<MouseWheel>", self._rueda)
+        self.tree.bind("<Button-4>", lambda e: self._desplazar(-3))
+        self.tree.bind("<Button-5>", lambda e: self._desplazar(3))
+        self.tree.bind("<Up>", lambda e: self._mover_seleccion(-1))
+        self.tree.bind("<Down>", lambda e: self._mover_seleccion(1))
+        self.tree.bind("<Prior>", lambda e: self._mover_seleccion(-self._visibles))
+        self.tree.bind("<Next>", lambda e: self._mover_seleccion(self._visibles))
+
+    # --- Carga de datos ---
+    def cargar(self, obtener_pagina, total=None):
+        """
+        Muestra los datos de una fuente paginada.
+        :param obtener_pagina: función (ultima_fila, limite) -> list[tuple]; ultima_fila es None
+                               en la primera página y la última fila recibida en las siguientes
+        :param total: int, función sin argumentos que lo devuelve, o None; número total de filas
+                      (solo informativo). Si es una función se llama junto a la primera página.
+        """
+        self._reiniciar(obtener_pagina)
+        if self.ejecutor is None:
+            self._total = total() if callable(total) else total
+            self._pedir_mas()
+            self._dibujar()
+            return
+
+        def primera_pagina():
+            cuenta = total() if callable(total) else total
+            return cuenta, obtener_pagina(None, self.tamano_pagina)
+
+        self._cargando = True
+        self.etiqueta.config(text="Cargando...")
+        self.ejecutor.ejecutar(primera_pagina, self._al_recibir_primera,
+                               self._al_fallar_carga, clave=self)
+
+    def mostrar_filas(self, filas):
+        """
+        Muestra una lista de filas ya obtenida.
+        """
+        self._reiniciar(None)
+        self._filas = list(filas)
+        self._total = len(self._filas)
+        self._dibujar()
+
+    def _reiniciar(self, obtener_pagina):
+        """
+        Olvida los datos mostrados y descarta las páginas que estuvieran en camino.
+        """
+        if self.ejecutor is not None:
+            self.ejecutor.cancelar(self)
+        self._obtener_pagina = obtener_pagina
+        self._filas = []
+        self._agotado = obtener_pagina is None
+        self._total = None
+        self._inicio = 0
+        self._inicio_deseado = 0
+        self._cargando = False
+
+    def _pedir_mas(self):
+        """
+        Pide a la fuente la página siguiente a la última fila cargada. Con ejecutor la petición
+        se hace en segundo plano y las filas se añaden en _al_recibir_pagina.
+        """
+        if self._agotado or self._obtener_pagina is None or self._cargando:
+            return
+        ultima = self._filas[-1] if self._filas else None
+        if self.ejecutor is None:
+            self._anadir(self._obtener_pagina(ultima, self.tamano_pagina))
+            return
+        obtener_pagina, limite = self._obtener_pagina, self.tamano_pagina
+        self._cargando = True
+        self.ejecutor.ejecutar(lambda: obtener_pagina(ultima, limite), self._al_recibir_pagina,
+                               self._al_fallar_carga, clave=self)
+
+    def _anadir(self, nuevas):
+        self._filas.extend(nuevas)
+        if len(nuevas) < self.tamano_pagina:
+            self._agotado = True
+
+    def _al_recibir_primera(self, resultado):
+        self._total, nuevas = resultado
+        self._cargando = False
+        self._anadir(nuevas)
+        self._dibujar()
+
+    def _al_recibir_pagina(self, nuevas):
+        self._cargando = False
+        self._anadir(nuevas)
+        # Recoloca la ventana donde el usuario quería llegar mientras la página estaba en camino
+        maximo = max(0, len(self._filas) - self._visibles)
+        self._inicio = max(0, min(self._inicio_deseado, maximo))
+        self._dibujar()
+
+    def _al_fallar_carga(self, error):
+        self._cargando = False
+        self._agotado = True
+        print(f"Error al cargar filas: {error}")
+        self._dibujar()
+        self.etiqueta.config(text="Error al cargar los datos")
+
+    # --- Cambios puntuales tras una escritura ---
+    def insertar_fila(self, fila):
+        """
+        Añade una fila nueva en su posición según la primera columna (las fuentes entregan
+        las filas ordenadas por la clave primaria). Si cae detrás de lo ya cargado y quedan
+        páginas por pedir, llegará con ellas y solo se cuenta en el total.
+        :return: bool, False si ya existe una fila con esa clave o hay una carga en curso;
+                 en ese caso el llamador debe recargar
+        """
+        if self._cargando or self._indice_de(str(fila[0])) is not None:
+            return False
+        posicion = self._posicion(fila[0])
+        if posicion < len(self._filas) or self._agotado:
+            self._filas.insert(posicion, fila)
+            self._seleccionada = str(fila[0])
+            if not self._inicio <= posicion < self._inicio + self._visibles:
+                self._inicio = max(0, min(posicion, len(self._filas) - self._visibles))
+        if self._total is not None:
+            self._total += 1
+        self._dibujar()
+        return True
+
+    def actualizar_fila(self, fila):
+        """
+        Sustituye los valores de la fila con la misma clave, si está cargada.
+        :return: bool, False si la fila no está cargada
+        """
+        indice = self._indice_de(str(fila[0]))
+        if indice is None:
+            return False
+        self._filas[indice] = fila
+        if self._inicio <= indice < self._inicio + self._visibles:
+            self.tree.item(str(fila[0]), values=fila)
+        return True
+
+    def eliminar_fila(self, iid):
+        """
+        Quita la fila con ese iid (si no estaba cargada solo se descuenta del total).
+        """
+        indice = self._indice_de(str(iid))
+        if indice is not None:
+            del self._filas[indice]
+            if self._seleccionada == str(iid):
+                self._seleccionada = None
+            self._inicio = max(0, min(self._inicio, len(self._filas) - self._visibles))
+        if self._total:
+            self._total -= 1
+        self._dibujar()
+
+    def _posicion(self, clave):
+        """
+        Búsqueda binaria de la posición que ocupa `clave` entre las filas cargadas.
+        """
+        inicio, fin = 0, len(self._filas)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if self._filas[medio][0] < clave:
+                inicio = medio + 1
+            else:
+                fin = medio
+        return inicio
+
+    # --- Consulta ---
+    def seleccion(self):
+        """
+        Devuelve la fila seleccionada (tupla con sus valores originales) o None.
+        """
+        indice = self._indice_de(self._seleccionada)
+        return None if indice is None else self._filas[indice]
+
+    def _indice_de(self, iid):
+        """
+        Devuelve la posición de la fila con ese iid, buscando primero en la ventana visible.
+        """
+        if iid is None:
+            return None
+        fin = self._inicio + self._visibles
+        for indice, fila in enumerate(self._filas[self._inicio:fin], self._inicio):
+            if str(fila[0]) == iid:
+                return indice
+        for indice, fila in enumerate(self._filas):
+            if str(fila[0]) == iid:
+                return indice
+        return None
+
+    def __len__(self):
+        return len(self._filas)
+
+    # --- Pintado ---
+    def _dibujar(self):
+        """
+        Sustituye los elementos del Treeview por las filas de la ventana visible.
+        """
+        self.tree.delete(*self.tree.get_children())
+        ventana = self._filas[self._inicio:self._inicio + self._visibles]
+        for fila in ventana:
+            self.tree.insert("", tk.END, iid=str(fila[0]), values=fila)
+        if self._seleccionada is not None and self.tree.exists(self._seleccionada):
+            self.tree.selection_set(self._seleccionada)
+
+        total_virtual = self._total_virtual()
+        if total_virtual:
+            self.scrollbar.set(self._inicio / total_virtual,
+                               min(1.0, (self._inicio + len(ventana)) / total_virtual))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        total = self._total if self._total is not None else len(self._filas)
+        if ventana:
+            self.etiqueta.config(text=f"Mostrando {self._inicio + 1}-{self._inicio + len(ventana)} de {total}")
+        else:
+            self.etiqueta.config(text="Sin resultados")
+
+    def _total_virtual(self):
+        """
+        Filas consideradas para la barra de desplazamiento: las cargadas más una página
+        si quedan por pedir, para que llegar al final dispare la carga siguiente.
+        """
+        return len(self._filas) + (0 if self._agotado else self.tamano_pagina)
+
+    # --- Desplazamiento ---
+    def _desplazar_a(self, inicio):
+        """
+        Coloca la ventana visible empezando en `inicio`, cargando más filas si hace falta.
+        """
+        self._inicio_deseado = inicio
+        cargadas = len(self._filas)
+        if inicio + self._visibles > cargadas and not self._agotado:
+            self._pedir_mas()
+        maximo = max(0, len(self._filas) - self._visibles)
+        inicio = max(0, min(inicio, maximo))
+        if inicio != self._inicio or len(self._filas) != cargadas:
+            self._inicio = inicio
+            self._dibujar()
+
+    def _desplazar(self, filas):
+        self._desplazar_a(self._inicio + filas)
+        return "break"
+
+    def _yview(self, *args):
+        """
+        Atiende los comandos de la barra de desplazamiento ('moveto' y 'scroll').
+        """
+        if args[0] == "moveto":
+            self._desplazar_a(int(float(args[1]) * self._total_virtual()))
+        elif args[0] == "scroll":
+            paso = int(args[1])
+            if args[2] == "pages":
+                paso *= self._visibles
+            self._desplazar(paso)
+
+    def _rueda(self, event):
+        return self._desplazar(-3 if event.delta > 0 else 3)
+
+    def _mover_seleccion(self, paso):
+        """
+        Mueve la selección con el teclado, desplazando la ventana si sale de la zona visible.
+        """
+        indice = self._indice_de(self._seleccionada)
+        nuevo = 0 if indice is None else indice + paso
+        if nuevo >= len(self._filas) and not self._agotado:
+            self._pedir_mas()
+        if not self._filas:
+            return "break"
+        nuevo = max(0, min(nuevo, len(self._filas) - 1))
+        if nuevo < self._inicio:
+            self._desplazar_a(nuevo)
+        elif nuevo >= self._inicio + self._visibles:
+            self._desplazar_a(nuevo - self._visibles + 1)
+        self._seleccionada = str(self._filas[nuevo][0])
+        if self.tree.exists(self._seleccionada):
+            self.tree.selection_set(self._seleccionada)
+            self.tree.see(self._seleccionada)
+        return "break"
+
+    def _al_seleccionar(self, event):
+        seleccion = self.tree.selection()
+        if seleccion:
+            self._seleccionada = seleccion[0]
+
+    def _al_redimensionar(self, event):
+        """
+        Recalcula cuántas filas caben en pantalla y vuelve a pintar.
+        """
+        alto_fila = self.ALTO_FILA_POR_DEFECTO
+        hijos = self.tree.get_children()
+        if hijos:
+            caja = self.tree.bbox(hijos[0])
+            if caja:
+                alto_fila = caja[3]
+        visibles = max(1, (event.height - self.ALTO_CABECERA) // alto_fila)
+        if visibles != self._visibles:
+            self._visibles = visibles
+            if self._inicio + visibles > len(self._filas):
+                self._pedir_mas()
+            self._inicio = max(0, min(self._inicio, len(self._filas) - visibles))
+            self._dibujar()
@@ -0,0 +1,12 @@
+# Las pruebas usan por defecto una base de datos SQLite temporal, sin servidor MySQL.
+# Para ejecutarlas contra MySQL: DB_BACKEND=mysql python -m unittest discover tests
+import atexit
+import os
+import shutil
+import tempfile
+
+os.environ.setdefault("DB_BACKEND", "sqlite")
+if os.environ["DB_BACKEND"] == "sqlite" and "DB_PATH" not in os.environ:
+    _directorio = tempfile.mkdtemp(prefix="almacen_pruebas_")
+    os.environ["DB_PATH"] = os.path.join(_directorio, "almacen.db")
+    atexit.register(shutil.rmtree, _directorio, ignore_errors=True)
@@ -0,0 +1,31 @@
+# Pruebas de la agrupación de búsquedas por ID
+import unittest
+from src.core.batch_loader import BatchLoader
+from src.database.db_manager import lotes_in
+
+
+class TestBatchLoader(unittest.TestCase):
+    def test_agrupa_las_busquedas_pendientes(self):
+        llamadas = []
+
+        def cargar_varios(ids):
+            llamadas.append(list(ids))
+            return {i: f"objeto {i}" for i in ids if i < 100}
+
+        cargador = BatchLoader(cargar_varios)
+        diferidos = [cargador.pedir(i) for i in (3, 1, 3, 200)]
+        self.assertEqual(llamadas, [])
+        self.assertEqual([d() for d in diferidos], ["objeto 3", "objeto 1", "objeto 3", None])
+        self.assertEqual(cargador.obtener_varios([1, 5, None]), {1: "objeto 1", 5: "objeto 5"})
+        self.assertIsNone(cargador.obtener(200))
+        self.assertEqual(llamadas, [[3, 1, 200], [5]])
+
+    def test_lotes_in_limita_las_longitudes_de_lista(self):
+        lotes = list(lotes_in([1, 2, 2, None, 3, 4, 5, 6, 7], tamano=4))
+        self.assertEqual([valores for _, valores in lotes], [(1, 2, 3, 4), (5, 6, 7, 7)])
+        self.assertEqual(lotes[0][0], "%s, %s, %s, %s")
+        self.assertEqual(list(lotes_in([9], tamano=4)), [("%s", (9,))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Pruebas de la caché LRU con caducidad
+import unittest
+from src.core.cache import TTLCache
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_aciertos_y_fallos(self):
+        cache = TTLCache(tamano_maximo=10, ttl=60)
+        cargas = []
+        cargar = lambda clave: cargas.append(clave) or f"valor{clave}"
+        self.assertEqual(cache.obtener(1, cargar), "valor1")
+        self.assertEqual(cache.obtener(1, cargar), "valor1")
+        self.assertEqual(cargas, [1])
+        stats = cache.estadisticas()
+        self.assertEqual((stats["aciertos"], stats["fallos"]), (1, 1))
+
+    def test_expulsa_la_menos_usada(self):
+        cache = TTLCache(tamano_maximo=2, ttl=60)
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        cache.consultar("a")
+        cache.guardar("c", 3)
+        self.assertIsNone(cache.consultar("b"))
+        self.assertEqual(cache.consultar("a"), 1)
+        self.assertEqual(cache.estadisticas()["expulsiones"], 1)
+
+    def test_caducidad(self):
+        reloj = RelojFalso()
+        cache = TTLCache(tamano_maximo=10, ttl=5, reloj=reloj)
+        cache.guardar("a", 1)
+        reloj.ahora = 4.9
+        self.assertEqual(cache.consultar("a"), 1)
+        reloj.ahora = 5.1
+        self.assertIsNone(cache.consultar("a"))
+
+    def test_invalidacion(self):
+        cache = TTLCache(tamano_maximo=10, ttl=60)
+        cache.guardar("SKU1", 7)
+        cache.guardar("SKU2", 7)
+        cache.guardar(7, "producto")
+        cache.invalidar(7)
+        cache.invalidar_valor(7)
+        self.assertIsNone(cache.consultar(7))
+        self.assertIsNone(cache.consultar("SKU1"))
+        self.assertIsNone(cache.consultar("SKU2"))
+
+if __name__ == "__main__":
+    unittest.main()
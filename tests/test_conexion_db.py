@@ -1,7 +1,8 @@
 # Prueba simple de conexión a la base de datos
 import unittest
-from src.database.db_manager import db_manager, host, user, password, database
+from src.database.db_manager import db_manager, host, user, password, database, backend
 
+@unittest.skipUnless(backend == "mysql", "requiere un servidor MySQL (DB_BACKEND=mysql)")
 class TestConexionDB(unittest.TestCase):
     def test_conexion(self):
         db = db_manager(host, user, password, database)
@@ -11,6 +12,13 @@ class TestConexionDB(unittest.TestCase):
             self.assertTrue(conn.is_connected())
         else:
             self.fail("La conexión a la base de datos devolvió None.")
+        db.disconnect()
+
+    def test_pool_compartido(self):
+        # Todos los gestores con los mismos parámetros comparten un único pool
+        db1 = db_manager(host, user, password, database)
+        db2 = db_manager(host, user, password, database)
+        self.assertIs(db1.pool, db2.pool)
 
 if __name__ == "__main__":
     unittest.main()
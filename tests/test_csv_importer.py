@@ -0,0 +1,95 @@
+# Pruebas de la importación de ficheros CSV
+import csv
+import os
+import tempfile
+import unittest
+from src.database.db_manager import backend
+from src.core.inventory_manager import InventoryManager
+from src.core.csv_importer import convertir_lote
+
+
+class TestConversion(unittest.TestCase):
+    def test_convierte_y_rechaza_filas(self):
+        filas = [
+            (2, {"id_producto": "1", "nombre_producto": "Tuerca", "sku": "T-1", "precio_unitario": "0,25",
+                 "id_proveedor": "3", "fecha_alta": "01/02/2024"}),
+            (3, {"id_producto": "x", "nombre_producto": "Mal", "sku": "T-2"}),
+            (4, {"id_producto": "3", "nombre_producto": "Sin SKU"}),
+        ]
+        validas, errores = convertir_lote("productos", filas)
+        self.assertEqual(len(validas), 1)
+        linea, valores, _ = validas[0]
+        self.assertEqual((linea, str(valores[4]), valores[5], str(valores[9])), (2, "0.25", 0, "2024-02-01"))
+        self.assertEqual([(linea, motivo.split(":")[0]) for linea, _, motivo in errores],
+                         [(3, "Valor no válido en id_producto"), (4, "Falta el campo sku")])
+
+
+@unittest.skipUnless(backend == "sqlite", "prueba específica del motor SQLite")
+class TestImportacion(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp(prefix="importar_")
+        self.manager = InventoryManager(tamano_cache=0)
+
+    def tearDown(self):
+        for nombre in os.listdir(self.directorio):
+            os.remove(os.path.join(self.directorio, nombre))
+        os.rmdir(self.directorio)
+
+    def escribir(self, nombre, filas):
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta, "w", newline="", encoding="utf-8") as fichero:
+            csv.writer(fichero, delimiter=";").writerows(filas)
+        return ruta
+
+    def test_importa_catalogo_y_movimientos(self):
+        self.manager.agregar_proveedor(5001, "Proveedor CSV", "", "", "")
+        productos = self.escribir("productos.csv", [
+            ["id_producto", "nombre_producto", "sku", "precio_unitario", "stock_actual", "id_proveedor"],
+            *[[5000 + i, f"Pieza {i}", f"CSV-{i}", "1.5", "10", "5001"] for i in range(1, 8)],
+            ["5100", "SKU repetido", "CSV-3", "1", "0", "5001"],
+            ["5101", "Proveedor inexistente", "CSV-101", "1", "0", "5999"],
+        ])
+        rechazos = os.path.join(self.directorio, "rechazos.csv")
+        resultado = self.manager.importar_csv("productos", productos, rechazos, tamano_lote=3)
+        self.assertEqual((resultado["leidas"], resultado["importadas"], resultado["rechazadas"]), (9, 7, 2))
+        with open(rechazos, encoding="utf-8") as fichero:
+            self.assertEqual([fila["linea"] for fila in csv.DictReader(fichero)], ["9", "10"])
+
+        movimientos = self.escribir("movimientos.csv", [
+            ["id_movimiento", "id_producto", "tipo_movimiento", "cantidad", "fecha_movimiento"],
+            ["6001", "5001", "salida", "4", "2025-05-01 09:30"],
+            ["6002", "5001", "salida", "40", "2025-05-01"],
+            ["6003", "5999", "entrada", "1", "2025-05-01"],
+        ])
+        resultado = self.manager.importar_csv("movimientos", movimientos)
+        self.assertEqual((resultado["importadas"], resultado["rechazadas"]), (1, 2))
+        self.assertEqual(self.manager.obtener_producto(5001).stock_actual, 6)
+
+
+    def test_sku_de_fila_rechazada_queda_libre(self):
+        # La base de datos rechaza la primera fila (ID repetido): su SKU puede usarlo otra fila
+        self.manager.agregar_proveedor(5002, "Proveedor SKU", "", "", "")
+        self.manager.agregar_producto(5201, "Existente", "", "CSV-200", 1, 0, 0, "", 5002, "2025-01-01")
+        productos = self.escribir("productos.csv", [
+            ["id_producto", "nombre_producto", "sku", "precio_unitario", "stock_actual", "id_proveedor"],
+            ["5201", "ID repetido", "CSV-201", "1", "0", "5002"],
+            ["5202", "Mismo SKU, otro bloque", "CSV-201", "1", "0", "5002"],
+        ])
+        resultado = self.manager.importar_csv("productos", productos, tamano_lote=1)
+        self.assertEqual((resultado["importadas"], resultado["rechazadas"]), (1, 1))
+        self.assertEqual(self.manager.buscar_producto_por_sku("CSV-201").id_producto, 5202)
+
+    def test_movimientos_historicos_no_cambian_stock(self):
+        self.manager.agregar_proveedor(5003, "Proveedor histórico", "", "", "")
+        self.manager.agregar_producto(5301, "Histórico", "", "CSV-300", 1, 5, 0, "", 5003, "2025-01-01")
+        movimientos = self.escribir("historico.csv", [
+            ["id_movimiento", "id_producto", "tipo_movimiento", "cantidad", "fecha_movimiento"],
+            ["6301", "5301", "salida", "40", "2024-05-01"],
+            ["6302", "5301", "devolucion", "1", "2024-05-02"],
+        ])
+        resultado = self.manager.importar_csv("movimientos", movimientos, aplicar_stock=False)
+        self.assertEqual((resultado["importadas"], resultado["rechazadas"]), (1, 1))
+        self.assertEqual(self.manager.obtener_producto(5301).stock_actual, 5)
+
+if __name__ == "__main__":
+    unittest.main()
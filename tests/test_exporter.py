@@ -0,0 +1,75 @@
+# Pruebas de la exportación en streaming
+import csv
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from datetime import date
+from src.database.db_manager import backend
+from src.core.inventory_manager import InventoryManager
+from src.core.exporter import StreamingExporter
+from src.models.movement import Movement
+
+
+@unittest.skipUnless(backend == "sqlite", "prueba específica del motor SQLite")
+class TestExportacion(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.manager = InventoryManager(tamano_cache=0)
+        cls.manager.agregar_proveedor(7001, "Proveedor exportación", "", "", "")
+        cls.manager.agregar_productos([(7000 + i, f"Export {i}", "", f"EXP-{i}", 2.5, 100, 0, "C1", 7001, "2025-01-01")
+                                       for i in (1, 2)])
+        cls.manager.movement_dao.crear_movimientos(Movement(*fila) for fila in [
+            (7101, 7001, "salida", 1, "2025-06-30 23:59:59", "", 1, 1),
+            (7102, 7001, "salida", 2, "2025-07-01 08:00:00", "", 1, 1),
+            (7103, 7002, "entrada", 3, "2025-07-15 12:00:00", "", 1, 7001),
+            (7104, 7001, "salida", 4, "2025-08-01 00:00:00", "", 1, 1),
+        ])
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp(prefix="exportar_")
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+
+    def test_movimientos_filtrados_en_jsonl_gzip(self):
+        ruta = os.path.join(self.directorio, "julio.jsonl.gz")
+        resultado = self.manager.exportar_movimientos(ruta, date(2025, 7, 1), date(2025, 8, 1), [7001, 7002])
+        with gzip.open(ruta, "rt", encoding="utf-8") as fichero:
+            filas = [json.loads(linea) for linea in fichero]
+        self.assertEqual(resultado["filas"], 2)
+        self.assertEqual([f["id_movimiento"] for f in filas], [7102, 7103])
+        self.assertEqual(filas[0]["fecha_movimiento"], "2025-07-01 08:00:00")
+
+    def test_productos_en_csv(self):
+        ruta = os.path.join(self.directorio, "stock.csv")
+        self.manager.exportar_productos(ruta)
+        with open(ruta, encoding="utf-8") as fichero:
+            filas = {fila["sku"]: fila for fila in csv.DictReader(fichero)}
+        self.assertEqual(filas["EXP-2"]["stock_actual"], "100")
+        self.assertFalse(os.path.exists(ruta + ".parcial"))
+
+    def test_error_a_mitad_no_deja_fichero(self):
+        # La base de datos falla tras el primer bloque ya escrito: el error llega al llamador
+        # y no queda ni el fichero definitivo ni el temporal
+        dao = self.manager.movement_dao
+        original = dao.db.iter_query
+
+        def una_fila_y_error(query, params=None, batch_size=None):
+            yield next(original(query, params, batch_size))
+            raise sqlite3.OperationalError("disk I/O error")
+
+        ruta = os.path.join(self.directorio, "movimientos.csv")
+        escritas = []
+        with mock.patch.object(dao.db, "iter_query", una_fila_y_error):
+            with self.assertRaises(sqlite3.OperationalError):
+                StreamingExporter(self.manager, tamano_lote=1).exportar_movimientos(ruta, al_progresar=escritas.append)
+        self.assertEqual(escritas, [1])
+        self.assertFalse(os.path.exists(ruta))
+        self.assertFalse(os.path.exists(ruta + ".parcial"))
+
+
+if __name__ == "__main__":
+    unittest.main()
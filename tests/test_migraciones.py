@@ -0,0 +1,63 @@
+# Pruebas de las migraciones del esquema (sobre una base de datos SQLite en memoria)
+import sqlite3
+import unittest
+from src.database.migraciones import migrador, sentencias_dao, MIGRACIONES, TABLAS
+from src.database.dao.productDAO import productDAO
+from src.models.movement import Movement
+
+
+class TestMigraciones(unittest.TestCase):
+    def setUp(self):
+        self.conexion = sqlite3.connect(":memory:", isolation_level=None)
+        self.addCleanup(self.conexion.close)
+
+    def indices(self):
+        return dict(self.conexion.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                                          "AND name LIKE 'idx_%'").fetchall())
+
+    def test_migrar_es_idempotente(self):
+        migraciones = migrador(self.conexion, "sqlite")
+        self.assertEqual(migraciones.migrar(hasta=2), [1, 2])
+        self.assertNotIn("idx_movimientos_producto_fecha", self.indices())
+        self.assertEqual(migraciones.migrar(), [3, 4])
+        self.assertEqual(migraciones.migrar(), [])
+        self.assertEqual([v for v, _, aplicada in migraciones.estado() if aplicada], [v for v, _, _ in MIGRACIONES])
+        self.assertIn("id_producto, fecha_movimiento", self.indices()["idx_movimientos_producto_fecha"])
+
+    def test_pone_al_dia_un_esquema_creado_a_mano(self):
+        # Base de datos anterior a las migraciones: tablas e índice de nombre sin NOCASE
+        for sql in TABLAS["sqlite"]:
+            self.conexion.execute(sql)
+        self.conexion.execute("CREATE INDEX idx_productos_nombre ON productos (nombre_producto)")
+        self.conexion.execute("INSERT INTO productos (id_producto, nombre_producto) VALUES (1, 'Tornillo')")
+
+        migraciones = migrador(self.conexion, "sqlite")
+        self.assertEqual(migraciones.migrar(), [1, 2, 3, 4])
+        self.assertIn("COLLATE NOCASE", self.indices()["idx_productos_nombre"])
+        self.assertEqual(self.conexion.execute("SELECT nombre_producto FROM productos").fetchall(), [("Tornillo",)])
+
+    def test_verificar_comprueba_los_indices_con_explain(self):
+        migraciones = migrador(self.conexion, "sqlite")
+        migraciones.migrar(hasta=1)
+        sin_indices = {r["nombre"]: r["correcta"] for r in migraciones.verificar()}
+        self.assertFalse(sin_indices["productos por nombre"])
+        self.assertTrue(sin_indices["producto por SKU"])
+
+        migraciones.migrar()
+        self.assertTrue(all(r["correcta"] for r in migraciones.verificar()))
+        plan = migraciones.plan("SELECT p.sku FROM movimientos m JOIN productos p ON p.id_producto = m.id_producto "
+                                "WHERE m.id_producto = %s", (1,))
+        self.assertEqual({paso["tabla"]: paso["indice"] for paso in plan},
+                         {"movimientos": "idx_movimientos_producto_fecha", "productos": "PRIMARY"})
+
+    def test_verificar_usa_las_sentencias_de_los_daos(self):
+        # Se comprueba el SQL que lanza el DAO, no una copia
+        self.assertEqual(sentencias_dao("productDAO", "buscar_por_sku", "SKU-1"), [(productDAO._SQL_POR_SKU, ("SKU-1",))])
+        migraciones = migrador(self.conexion, "sqlite")
+        migraciones.migrar()
+        resultados = migraciones.verificar([("sin sentencias", "movementDAO", "cursor_pagina", (Movement(1, 1, "entrada", 1, None, "", 1, 1),), {}, None)])
+        self.assertFalse(resultados[0]["correcta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
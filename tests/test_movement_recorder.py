@@ -0,0 +1,78 @@
+# Pruebas del grabador diferido de movimientos
+import threading
+import time
+import unittest
+from src.core.movement_recorder import BufferedMovementRecorder, ColaLlenaError
+
+
+class ManagerDePrueba:
+    """
+    Sustituye a InventoryManager: anota los bloques recibidos y rechaza las salidas de más de 100 unidades.
+    """
+    def __init__(self, bloquear=None):
+        self.lotes = []
+        self.bloquear = bloquear
+
+    def registrar_movimientos(self, movimientos, tamano_lote=None):
+        if self.bloquear:
+            self.bloquear.wait()
+        self.lotes.append([m.id_movimiento for m in movimientos])
+        return [(m, "Stock insuficiente") for m in movimientos if m.cantidad > 100]
+
+
+def movimiento(i, cantidad=1):
+    return (i, 1, "salida", cantidad, "2025-01-01 10:00:00", "ESC", 1, 1)
+
+
+class TestBufferedMovementRecorder(unittest.TestCase):
+    def test_agrupa_por_tamano_y_flush_graba_el_resto(self):
+        manager = ManagerDePrueba()
+        grabador = BufferedMovementRecorder(manager, tamano_lote=3, intervalo=60)
+        for i in range(1, 8):
+            grabador.registrar(movimiento(i, 500 if i == 7 else 1))
+        self.assertTrue(grabador.flush(timeout=5))
+        self.assertEqual(manager.lotes, [[1, 2, 3], [4, 5, 6], [7]])
+        self.assertEqual([m.id_movimiento for m, _ in grabador.rechazados], [7])
+        self.assertEqual(grabador.pendientes, 0)
+        grabador.close()
+        with self.assertRaises(RuntimeError):
+            grabador.registrar(movimiento(8))
+
+    def test_cola_llena_aplica_contrapresion(self):
+        liberar = threading.Event()
+        grabador = BufferedMovementRecorder(ManagerDePrueba(liberar), tamano_lote=1, intervalo=0, capacidad=2)
+        grabador.registrar(movimiento(1))
+        grabador.registrar(movimiento(2))
+        grabador.registrar(movimiento(3))
+        with self.assertRaises(ColaLlenaError):
+            # El hilo está bloqueado con el primer movimiento y la cola tiene otros dos
+            for i in range(4, 6):
+                grabador.registrar(movimiento(i), espera=0.05)
+        liberar.set()
+        self.assertTrue(grabador.close(timeout=5))
+
+    def test_valida_antes_de_encolar(self):
+        with BufferedMovementRecorder(ManagerDePrueba()) as grabador:
+            with self.assertRaises(ValueError):
+                grabador.registrar((1, 1, "traspaso", 1, None, "", 1, 1))
+
+    def test_intervalo_cuenta_desde_que_se_encolo(self):
+        # Los movimientos que esperan mientras se graba otro bloque no reinician su plazo
+        liberar = threading.Event()
+        manager = ManagerDePrueba(liberar)
+        grabador = BufferedMovementRecorder(manager, tamano_lote=2, intervalo=0.5)
+        inicio = time.monotonic()
+        for i in range(1, 6):
+            grabador.registrar(movimiento(i))
+        time.sleep(0.4)
+        liberar.set()
+        while len(manager.lotes) < 3 and time.monotonic() - inicio < 5:
+            time.sleep(0.01)
+        self.assertEqual(manager.lotes, [[1, 2], [3, 4], [5]])
+        # Con el plazo reiniciado al sacar [3, 4] el último no se grabaría hasta pasados 0.9 s
+        self.assertLess(time.monotonic() - inicio, 0.7)
+        grabador.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
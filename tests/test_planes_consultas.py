@@ -0,0 +1,258 @@
+# Pruebas de regresión de los planes de ejecución: cada sentencia de los DAOs se ejecuta sobre
+# una base de datos SQLite con datos y se comprueba con EXPLAIN que sigue usando su índice y que
+# no recorre tablas enteras. Falla también si un DAO tiene un método o una sentencia fija que
+# estas pruebas no ejecutan, para que las consultas nuevas se añadan a CASOS.
+#
+# EXPLAIN_MAX_SCAN_ROWS (por defecto 1000): un recorrido completo de una tabla con más filas
+# que este umbral se considera una regresión salvo que el caso lo permita.
+import inspect
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+from src.database.dao.productDAO import productDAO
+from src.database.dao.clientDAO import clientDAO
+from src.database.dao.supplierDAO import supplierDAO
+from src.database.dao.movementDAO import movementDAO
+from src.database.db_manager import sentencia
+from src.database.migraciones import migrador, db_grabado
+from src.database.sqlite_manager import sqlite_manager, traducir
+from src.models.product import Product
+from src.models.client import Client
+from src.models.supplier import Supplier
+from src.models.movement import Movement
+
+UMBRAL_FILAS = int(os.getenv("EXPLAIN_MAX_SCAN_ROWS", "1000"))
+
+# Filas de cada tabla en la base de datos de prueba (por encima del umbral por defecto)
+FILAS = {"proveedores": 2000, "productos": 5000, "clientes": 2000, "movimientos": 20000}
+
+# Recorridos permitidos: "limitado" si la tabla se lee en el orden pedido y LIMIT corta la
+# lectura (primera página), "completo" si el método lee a propósito toda la tabla
+LIMITADO, COMPLETO = "limitado", "completo"
+
+
+def caso(dao, metodo, *args, indice=None, recorrido=None, **kwargs):
+    """
+    Llamada a un método de un DAO y lo que se espera de los planes de sus sentencias.
+    :param indice: índice que debe aparecer en algún plan ("PRIMARY" para la clave primaria)
+    :param recorrido: None (ninguna tabla grande se recorre entera), LIMITADO o COMPLETO
+    """
+    return {"dao": dao, "metodo": metodo, "args": args, "kwargs": kwargs, "indice": indice, "recorrido": recorrido}
+
+
+DESDE, HASTA = datetime(2025, 1, 3), datetime(2025, 1, 4)
+
+CASOS = [
+    caso("productos", "crear_producto", Product(900001, "Nuevo", "", "SKU-N1", 1, 0, 0, "A1", 1, "2025-01-01")),
+    caso("productos", "crear_productos", [Product(900002, "Nuevo", "", "SKU-N2", 1, 0, 0, "A1", 1, "2025-01-01"),
+                                          Product(900003, "Nuevo", "", "SKU-N3", 1, 0, 0, "A1", 1, "2025-01-01")]),
+    caso("productos", "obtener_producto", 10, indice="PRIMARY"),
+    caso("productos", "obtener_productos", [10, 20, 30], indice="PRIMARY"),
+    caso("productos", "actualizar_producto", Product(900001, "Cambiado", "", "SKU-N1", 2, 0, 0, "A1", 1, "2025-01-01"),
+         indice="PRIMARY"),
+    caso("productos", "eliminar_producto", 900003, indice="PRIMARY"),
+    caso("productos", "listar_productos", recorrido=COMPLETO),
+    caso("productos", "listar_productos_pagina", 100, recorrido=LIMITADO),
+    caso("productos", "listar_productos_pagina", 100, 4000, indice="PRIMARY"),
+    caso("productos", "contar_productos", recorrido=COMPLETO),
+    caso("productos", "buscar_productos", "Producto 12", limite=50, indice="idx_productos_nombre"),
+    caso("productos", "buscar_productos", "Producto 12", limite=50, despues_de=120, indice="idx_productos_nombre"),
+    # Buscar en mitad del nombre no puede usar ningún índice
+    caso("productos", "buscar_productos", "cto 12", modo="contiene", limite=50, recorrido=COMPLETO),
+    caso("productos", "buscar_por_sku", "SKU-10", indice="sqlite_autoindex_productos_1"),
+    caso("productos", "existe_producto", 10, indice="PRIMARY"),
+    caso("productos", "existe_sku", "SKU-10", indice="sqlite_autoindex_productos_1"),
+    caso("productos", "iter_productos", recorrido=COMPLETO),
+    caso("productos", "iter_filas", recorrido=COMPLETO),
+
+    caso("clientes", "crear_cliente", Client(900001, "Nuevo", "", "", "")),
+    caso("clientes", "crear_clientes", [Client(900002, "Nuevo", "", "", ""), Client(900003, "Nuevo", "", "", "")]),
+    caso("clientes", "obtener_cliente", 10, indice="PRIMARY"),
+    caso("clientes", "obtener_clientes", [10, 20, 30], indice="PRIMARY"),
+    caso("clientes", "actualizar_cliente", Client(900001, "Cambiado", "", "", ""), indice="PRIMARY"),
+    caso("clientes", "eliminar_cliente", 900003, indice="PRIMARY"),
+    caso("clientes", "listar_clientes", recorrido=COMPLETO),
+    caso("clientes", "listar_clientes_pagina", 100, recorrido=LIMITADO),
+    caso("clientes", "listar_clientes_pagina", 100, 1000, indice="PRIMARY"),
+    caso("clientes", "contar_clientes", recorrido=COMPLETO),
+    caso("clientes", "buscar_clientes", "Cliente 12", limite=50, indice="idx_clientes_nombre"),
+    caso("clientes", "buscar_clientes", "Cliente 12", limite=50, despues_de=120, indice="idx_clientes_nombre"),
+    caso("clientes", "buscar_clientes", "nte 12", modo="contiene", limite=50, recorrido=COMPLETO),
+    caso("clientes", "existe_cliente", 10, indice="PRIMARY"),
+    caso("clientes", "iter_clientes", recorrido=COMPLETO),
+
+    caso("proveedores", "crear_proveedor", Supplier(900001, "Nuevo", "", "", "")),
+    caso("proveedores", "crear_proveedores", [Supplier(900002, "Nuevo", "", "", ""),
+                                              Supplier(900003, "Nuevo", "", "", "")]),
+    caso("proveedores", "obtener_proveedor", 10, indice="PRIMARY"),
+    caso("proveedores", "obtener_proveedores", [10, 20, 30], indice="PRIMARY"),
+    caso("proveedores", "actualizar_proveedor", Supplier(900001, "Cambiado", "", "", ""), indice="PRIMARY"),
+    caso("proveedores", "eliminar_proveedor", 900003, indice="PRIMARY"),
+    caso("proveedores", "listar_proveedores", recorrido=COMPLETO),
+    caso("proveedores", "listar_proveedores_pagina", 100, recorrido=LIMITADO),
+    caso("proveedores", "listar_proveedores_pagina", 100, 1000, indice="PRIMARY"),
+    caso("proveedores", "contar_proveedores", recorrido=COMPLETO),
+    caso("proveedores", "buscar_proveedores", "Proveedor 12", limite=50, indice="idx_proveedores_nombre"),
+    caso("proveedores", "buscar_proveedores", "Proveedor 12", limite=50, despues_de=120,
+         indice="idx_proveedores_nombre"),
+    caso("proveedores", "buscar_proveedores", "dor 12", modo="contiene", limite=50, recorrido=COMPLETO),
+    caso("proveedores", "existe_proveedor", 10, indice="PRIMARY"),
+    caso("proveedores", "iter_proveedores", recorrido=COMPLETO),
+
+    caso("movimientos", "crear_movimiento", Movement(900001, 1, "entrada", 5, DESDE, "P", 1, 1)),
+    caso("movimientos", "crear_movimientos", [Movement(900002, 1, "entrada", 5, DESDE, "P", 1, 1),
+                                              Movement(900003, 1, "entrada", 5, DESDE, "P", 1, 1)]),
+    caso("movimientos", "obtener_movimiento", 10, indice="PRIMARY"),
+    caso("movimientos", "obtener_movimientos", [10, 20, 30], indice="PRIMARY"),
+    caso("movimientos", "actualizar_movimiento", Movement(900001, 1, "entrada", 7, DESDE, "P", 1, 1), indice="PRIMARY"),
+    caso("movimientos", "eliminar_movimiento", 900003, indice="PRIMARY"),
+    caso("movimientos", "listar_movimientos", recorrido=COMPLETO),
+    caso("movimientos", "listar_movimientos_pagina", 100, recorrido=LIMITADO),
+    caso("movimientos", "listar_movimientos_pagina", 100, 5000, indice="PRIMARY"),
+    caso("movimientos", "listar_movimientos_pagina", 100, 5000, descendente=True, indice="PRIMARY"),
+    caso("movimientos", "listar_movimientos_pagina", 100, por_fecha=True, indice="idx_movimientos_fecha",
+         recorrido=LIMITADO),
+    caso("movimientos", "listar_movimientos_pagina", 100, ("2025-01-05 00:00:00", 5760), por_fecha=True,
+         indice="idx_movimientos_fecha"),
+    caso("movimientos", "listar_movimientos_pagina", 100, ("2025-01-05 00:00:00", 5760), por_fecha=True,
+         descendente=True, indice="idx_movimientos_fecha"),
+    caso("movimientos", "contar_movimientos", recorrido=COMPLETO),
+    caso("movimientos", "buscar_movimientos_por_fecha", DESDE, HASTA, limite=100, indice="idx_movimientos_fecha"),
+    caso("movimientos", "buscar_movimientos_por_fecha", DESDE, HASTA, limite=100,
+         despues_de=("2025-01-03 01:00:00", 2940), indice="idx_movimientos_fecha"),
+    caso("movimientos", "obtener_detalle", 10, indice="PRIMARY"),
+    caso("movimientos", "listar_detalles_pagina", 100, recorrido=LIMITADO),
+    caso("movimientos", "listar_detalles_pagina", 100, 5000, indice="PRIMARY"),
+    caso("movimientos", "listar_detalles_pagina", 100, desde=DESDE, hasta=HASTA, indice="idx_movimientos_fecha"),
+    caso("movimientos", "listar_detalles_pagina", 100, ("2025-01-03 01:00:00", 2940), desde=DESDE, hasta=HASTA,
+         indice="idx_movimientos_fecha"),
+    caso("movimientos", "existe_movimiento", 10, indice="PRIMARY"),
+    caso("movimientos", "iter_movimientos", recorrido=COMPLETO),
+    caso("movimientos", "iter_movimientos", desde=DESDE, hasta=HASTA, indice="idx_movimientos_fecha"),
+    caso("movimientos", "iter_filas", id_productos=[1, 2, 3], indice="idx_movimientos_producto_fecha"),
+    caso("movimientos", "crear_movimiento_con_stock", Movement(900004, 1, "entrada", 5, DESDE, "P", 1, 1),
+         indice="PRIMARY"),
+    caso("movimientos", "crear_movimiento_con_stock", Movement(900005, 1, "salida", 1, DESDE, "P", 1, 1),
+         indice="PRIMARY"),
+    caso("movimientos", "crear_movimientos_con_stock", [Movement(900006, 2, "entrada", 5, DESDE, "P", 1, 1),
+                                                        Movement(900007, 3, "salida", 1, DESDE, "P", 1, 1)],
+         indice="PRIMARY"),
+    caso("movimientos", "actualizar_movimiento_con_stock", Movement(900004, 2, "entrada", 3, DESDE, "P", 1, 1),
+         indice="PRIMARY"),
+    caso("movimientos", "eliminar_movimiento_con_stock", 900004, indice="PRIMARY"),
+]
+
+# Métodos públicos que no ejecutan SQL
+SIN_SQL = {("movimientos", "cursor_pagina")}
+
+
+def _sembrar(conexion):
+    """
+    Llena las tablas con FILAS filas generadas en SQL (nombres 'Producto n', 'Cliente n', etc.,
+    y un movimiento por minuto desde el 1 de enero de 2025).
+    """
+    serie = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {}) "
+    conexion.execute("BEGIN")
+    conexion.execute(serie.format(FILAS["proveedores"]) +
+                     "INSERT INTO proveedores SELECT i, 'Proveedor ' || i, NULL, NULL, NULL FROM n")
+    conexion.execute(serie.format(FILAS["productos"]) +
+                     "INSERT INTO productos SELECT i, 'Producto ' || i, NULL, 'SKU-' || i, 10, 1000, 0, 'A1', "
+                     f"i % {FILAS['proveedores']} + 1, '2025-01-01' FROM n")
+    conexion.execute(serie.format(FILAS["clientes"]) +
+                     "INSERT INTO clientes SELECT i, 'Cliente ' || i, NULL, NULL, NULL FROM n")
+    conexion.execute(serie.format(FILAS["movimientos"]) +
+                     f"INSERT INTO movimientos SELECT i, i % {FILAS['productos']} + 1, "
+                     "CASE i % 2 WHEN 0 THEN 'entrada' ELSE 'salida' END, 1, "
+                     "datetime('2025-01-01', '+' || i || ' minutes'), 'R', 1, "
+                     f"i % {FILAS['clientes']} + 1 FROM n")
+    conexion.execute("COMMIT")
+
+
+class TestPlanesConsultas(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Base de datos propia: no se mezcla con la del resto de pruebas
+        cls.directorio = tempfile.mkdtemp(prefix="almacen_planes_")
+        cls.db = sqlite_manager(os.path.join(cls.directorio, "planes.db"))
+        conexion = cls.db.connection
+        _sembrar(conexion)
+        cls.migraciones = migrador(conexion, "sqlite")
+        cls.filas = {tabla: conexion.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0] for tabla in FILAS}
+        cls.daos = {}
+        for nombre, clase in (("productos", productDAO), ("clientes", clientDAO),
+                              ("proveedores", supplierDAO), ("movimientos", movementDAO)):
+            dao = clase()
+            dao.db = db_grabado(cls.db)
+            cls.daos[nombre] = dao
+
+        # Ejecuta cada caso una vez, en orden, y guarda las sentencias que lanza
+        cls.sentencias = []
+        for caso in CASOS:
+            dao = cls.daos[caso["dao"]]
+            dao.db.sentencias = []
+            resultado = getattr(dao, caso["metodo"])(*caso["args"], **caso["kwargs"])
+            if inspect.isgenerator(resultado):
+                list(resultado)
+            cls.sentencias.append(dao.db.sentencias)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.pool.close()
+        shutil.rmtree(cls.directorio, ignore_errors=True)
+
+    def _problemas(self, caso, sql_query, params):
+        """
+        Devuelve los recorridos no permitidos del plan de una sentencia y los índices que usa.
+        """
+        pasos = self.migraciones.plan(sql_query, params)
+        ordena = any("TEMP B-TREE" in fila[-1] for fila in self.db.connection.execute(
+            "EXPLAIN QUERY PLAN " + traducir(sql_query), params))
+        problemas = []
+        for paso in pasos:
+            if not paso["completo"] or self.filas.get(paso["tabla"], 0) <= UMBRAL_FILAS:
+                continue
+            if caso["recorrido"] == COMPLETO:
+                continue
+            # Recorrer en el orden pedido sin ordenar después: LIMIT corta la lectura
+            if caso["recorrido"] == LIMITADO and " LIMIT " in sql_query and not ordena:
+                continue
+            problemas.append(f"recorre {paso['tabla']} ({self.filas[paso['tabla']]} filas): {paso['detalle']}")
+        return problemas, [paso["indice"] for paso in pasos]
+
+    def test_planes_de_las_sentencias_de_los_daos(self):
+        fallos = []
+        for caso, sentencias in zip(CASOS, self.sentencias):
+            nombre = f"{caso['dao']}.{caso['metodo']}{caso['args']}"
+            if not sentencias:
+                fallos.append(f"{nombre}: no ejecuta ninguna sentencia")
+                continue
+            indices = []
+            for sql_query, params in sentencias:
+                problemas, usados = self._problemas(caso, sql_query, params)
+                indices += usados
+                fallos += [f"{nombre}: {problema}\n    {sql_query}" for problema in problemas]
+            if caso["indice"] and caso["indice"] not in indices:
+                fallos.append(f"{nombre}: no usa el índice {caso['indice']} (usa {indices or 'ninguno'})")
+        self.assertEqual(fallos, [], "\n" + "\n".join(fallos))
+
+    def test_los_casos_cubren_todos_los_metodos_y_sentencias(self):
+        cubiertos = {(caso["dao"], caso["metodo"]) for caso in CASOS} | SIN_SQL
+        sin_caso = [f"{nombre}.{metodo}" for nombre, dao in self.daos.items()
+                    for metodo, _ in inspect.getmembers(type(dao), inspect.isfunction)
+                    if not metodo.startswith("_") and (nombre, metodo) not in cubiertos]
+        self.assertEqual(sin_caso, [], "Métodos de los DAOs sin caso en CASOS")
+
+        ejecutadas = {(caso["dao"], sql_query) for caso, sentencias in zip(CASOS, self.sentencias)
+                      for sql_query, _ in sentencias}
+        sin_ejecutar = [f"{nombre}.{atributo}" for nombre, dao in self.daos.items()
+                        for atributo, valor in vars(type(dao)).items()
+                        if atributo.startswith("_SQL_") and isinstance(valor, sentencia)
+                        and (nombre, valor) not in ejecutadas]
+        self.assertEqual(sin_ejecutar, [], "Sentencias fijas de los DAOs que ningún caso ejecuta")
+
+
+if __name__ == "__main__":
+    unittest.main()
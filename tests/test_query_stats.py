@@ -0,0 +1,50 @@
+# Pruebas del registro de tiempos de las consultas
+import io
+import time
+import unittest
+from src.database.db_manager import backend, crear_db_manager, estadisticas_consultas
+from src.database.query_stats import query_stats, huella
+
+
+class TestQueryStats(unittest.TestCase):
+    def test_huella_agrupa_consultas_iguales(self):
+        self.assertEqual(huella("SELECT * FROM productos  WHERE id_producto = %s"),
+                         "SELECT * FROM productos WHERE id_producto = ?")
+        self.assertEqual(huella("SELECT 1 FROM t WHERE id IN (%s, %s, %s) AND x = 'a'"),
+                         huella("SELECT 1 FROM t WHERE id IN (%s, %s) AND x = 'b'"))
+
+    def test_percentiles(self):
+        stats = query_stats(umbral_lento_ms=0)
+        for ms in range(1, 101):
+            stats.registrar("SELECT %s", ms / 1000.0, filas=2)
+        fila = stats.resumen()[0]
+        self.assertEqual((fila["llamadas"], fila["filas"]), (100, 200))
+        # El histograma estima cada percentil con un error máximo del 25 %
+        for clave, esperado in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99)):
+            self.assertGreaterEqual(fila[clave], esperado)
+            self.assertLessEqual(fila[clave], esperado * 1.25)
+
+    def test_consultas_lentas(self):
+        stats = query_stats(umbral_lento_ms=50)
+        stats.registrar("SELECT rapida", 0.001)
+        stats.registrar("SELECT lenta", 0.2, filas=7)
+        lentas = stats.lentas()
+        self.assertEqual([(l["sql"], l["filas"]) for l in lentas], [("SELECT lenta", 7)])
+        self.assertIn("test_query_stats.py", lentas[0]["sitio"])
+        salida = io.StringIO()
+        stats.volcar(salida)
+        self.assertIn("SELECT lenta", salida.getvalue())
+
+    @unittest.skipUnless(backend == "sqlite", "prueba específica del motor SQLite")
+    @unittest.skipUnless(estadisticas_consultas.activo, "métricas desactivadas (DB_METRICS)")
+    def test_recorrido_no_mide_al_consumidor(self):
+        # El tiempo que el consumidor dedica a cada fila no cuenta como tiempo de la consulta
+        sql = "SELECT 1 AS recorrido_medido UNION ALL SELECT 2 UNION ALL SELECT 3"
+        for _ in crear_db_manager().iter_query(sql, batch_size=1):
+            time.sleep(0.05)
+        fila = next(f for f in estadisticas_consultas.resumen() if f["huella"] == huella(sql))
+        self.assertEqual(fila["filas"], 3)
+        self.assertLess(fila["max_ms"], 50)
+
+if __name__ == "__main__":
+    unittest.main()
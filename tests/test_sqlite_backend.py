@@ -0,0 +1,217 @@
+# Pruebas de los DAOs y del gestor de inventario sobre el motor SQLite
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from src.database.db_manager import backend, TransaccionRevertidaError, sentencia
+from src.core.inventory_manager import InventoryManager
+from src.database.dao.movementDAO import StockInsuficienteError
+from src.database.sqlite_manager import sqlite_pool
+
+
+@unittest.skipUnless(backend == "sqlite", "prueba específica del motor SQLite")
+class TestSQLiteBackend(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.manager = InventoryManager(tamano_cache=0)
+        cls.manager.agregar_proveedor(2001, "Proveedor SQLite", "600000000", "p@sqlite.es", "Calle 1")
+        rechazados = cls.manager.agregar_productos(
+            (2000 + i, f"Tornillo {i}", "", f"SQ-{i}", 0.5, 10, 1, "B1", 2001, "2025-01-01")
+            for i in range(1, 51))
+        assert not rechazados, rechazados
+
+    def test_paginacion_y_busqueda(self):
+        pagina = self.manager.listar_productos_pagina(limite=20, despues_de=2010)
+        self.assertEqual([p.id_producto for p in pagina], list(range(2011, 2031)))
+        encontrados = self.manager.buscar_productos("Tornillo 4", limite=5)
+        self.assertEqual({p.id_producto for p in encontrados}, {2004} | set(range(2040, 2044)))
+        self.assertEqual(self.manager.buscar_producto_por_sku("SQ-7").id_producto, 2007)
+
+    def test_alta_masiva_rechaza_duplicados(self):
+        rechazados = self.manager.agregar_productos([
+            (2101, "Nuevo", "", "SQ-NUEVO", 1.0, 0, 0, "B2", 2001, "2025-01-01"),
+            (2102, "Repetido", "", "SQ-1", 1.0, 0, 0, "B2", 2001, "2025-01-01"),
+        ])
+        self.assertEqual([p.id_producto for p, _ in rechazados], [2102])
+        self.assertTrue(self.manager.existe_producto(2101))
+
+    def test_movimientos_actualizan_stock(self):
+        self.manager.registrar_movimiento(3001, 2050, "salida", 4, "2025-02-01", "ref", 1, 1)
+        self.assertEqual(self.manager.obtener_producto(2050).stock_actual, 6)
+        with self.assertRaises(StockInsuficienteError):
+            self.manager.registrar_movimiento(3002, 2050, "salida", 7, "2025-02-01", "ref", 1, 1)
+        self.assertEqual(self.manager.obtener_producto(2050).stock_actual, 6)
+        # Una fecha sin hora se guarda como medianoche, igual que en MySQL
+        self.assertEqual(self.manager.obtener_movimiento(3001).fecha_movimiento, "2025-02-01 00:00:00")
+
+    def test_lote_respeta_el_orden_de_los_movimientos(self):
+        # Una salida sin stock no la cubre una entrada posterior del mismo lote, igual que fila a fila
+        for base, tamano_lote in ((2300, None), (2310, 1)):
+            self.manager.agregar_productos([(base + i, f"Orden {base + i}", "", f"ORD-{base + i}", 1.0, 0, 0, "B3", 2001,
+                                             "2025-01-01") for i in (1, 2)])
+            rechazados = self.manager.registrar_movimientos([
+                (1000 + base + 1, base + 1, "salida", 10, "2025-03-01", "ref", 1, 1),
+                (1000 + base + 2, base + 1, "entrada", 10, "2025-03-01", "ref", 1, 2001),
+                (1000 + base + 3, base + 2, "salida", 10, "2025-03-01", "ref", 1, 1),
+                (1000 + base + 4, base + 2, "entrada", 15, "2025-03-01", "ref", 1, 2001),
+            ], tamano_lote=tamano_lote)
+            with self.subTest(tamano_lote=tamano_lote):
+                self.assertEqual([m.id_movimiento for m, _ in rechazados], [1000 + base + 1, 1000 + base + 3])
+                self.assertEqual(self.manager.obtener_producto(base + 1).stock_actual, 10)
+                self.assertEqual(self.manager.obtener_producto(base + 2).stock_actual, 15)
+
+    def test_editar_y_eliminar_movimientos_corrigen_stock(self):
+        m = self.manager
+        m.agregar_productos([(2320 + i, f"Edición {i}", "", f"EDI-{i}", 1.0, 0, 0, "B3", 2001, "2025-01-01") for i in (1, 2)])
+        entrada = m.registrar_movimiento(3321, 2321, "entrada", 10, "2025-03-01", "ref", 1, 2001)
+        salida = m.registrar_movimiento(3322, 2321, "salida", 4, "2025-03-02", "ref", 1, 1)
+        stock = lambda id_producto: m.obtener_producto(id_producto).stock_actual
+
+        salida.cantidad = 6
+        self.assertIs(m.actualizar_movimiento(salida), salida)
+        self.assertEqual(stock(2321), 4)
+        # Reducir la entrada a 5 dejaría el stock en -1: no cambia nada
+        entrada.cantidad = 5
+        with self.assertRaises(StockInsuficienteError):
+            m.actualizar_movimiento(entrada)
+        self.assertEqual((stock(2321), m.obtener_movimiento(3321).cantidad), (4, 10))
+        # Cambiar de producto devuelve el stock al anterior y lo aplica al nuevo
+        salida.id_producto, salida.tipo_movimiento, salida.cantidad = 2322, "entrada", 2
+        m.actualizar_movimiento(salida)
+        self.assertEqual((stock(2321), stock(2322)), (10, 2))
+
+        m.registrar_movimiento(3323, 2321, "salida", 1, "2025-03-03", "ref", 1, 1)
+        with self.assertRaises(StockInsuficienteError):
+            m.eliminar_movimiento(3321)
+        self.assertTrue(m.existe_movimiento(3321))
+        self.assertTrue(m.eliminar_movimiento(3323))
+        self.assertTrue(m.eliminar_movimiento(3321))
+        self.assertEqual(stock(2321), 0)
+        self.assertFalse(m.eliminar_movimiento(3321))
+
+    def test_editar_movimiento_con_cache_sin_lectura_previa(self):
+        # El movimiento anterior lo devuelve la transacción: no hay una lectura aparte fuera de ella
+        manager = InventoryManager(tamano_cache=10)
+        manager.agregar_producto(2331, "Caché edición", "", "EDI-C", 1.0, 0, 0, "B3", 2001, "2025-01-01")
+        entrada = manager.registrar_movimiento(3341, 2331, "entrada", 5, "2025-03-01", "ref", 1, 2001)
+        self.assertEqual(manager.obtener_producto(2331).stock_actual, 5)
+        with mock.patch.object(manager.movement_dao, "obtener_movimiento", side_effect=AssertionError):
+            entrada.cantidad = 8
+            manager.actualizar_movimiento(entrada)
+            self.assertEqual(manager.obtener_producto(2331).stock_actual, 8)
+            self.assertTrue(manager.eliminar_movimiento(3341))
+            self.assertEqual(manager.obtener_producto(2331).stock_actual, 0)
+            self.assertFalse(manager.eliminar_movimiento(3341))
+
+    def test_movimiento_conserva_la_cache_de_skus(self):
+        # Un movimiento solo cambia el stock: se relee el producto pero el SKU sigue en caché
+        manager = InventoryManager(tamano_cache=10)
+        self.assertEqual(manager.buscar_producto_por_sku("SQ-30").stock_actual, 10)
+        manager.registrar_movimiento(3331, 2030, "entrada", 1, "2025-03-01", "ref", 1, 2001)
+        self.assertEqual(manager.estadisticas_cache()["skus"]["tamano"], 1)
+        self.assertEqual(manager.buscar_producto_por_sku("SQ-30").stock_actual, 11)
+        manager.actualizar_producto(manager.obtener_producto(2030))
+        self.assertEqual(manager.estadisticas_cache()["skus"]["tamano"], 0)
+
+    def test_eliminar_devuelve_si_existia(self):
+        self.assertTrue(self.manager.eliminar_producto(2049))
+        self.assertFalse(self.manager.eliminar_producto(2049))
+
+    def test_transaccion_confirma_o_revierte_todo(self):
+        with self.manager.transaccion():
+            self.manager.agregar_proveedor(2002, "Proveedor UoW", "", "", "")
+            self.manager.agregar_producto(2201, "Alta conjunta", "", "SQ-UOW", 1.0, 0, 0, "B3", 2002, "2025-01-01")
+            self.manager.registrar_movimiento(3101, 2201, "entrada", 5, "2025-03-01", "ref", 1, 2002)
+        self.assertEqual(self.manager.obtener_producto(2201).stock_actual, 5)
+
+        with self.assertRaises(StockInsuficienteError):
+            with self.manager.transaccion():
+                self.manager.registrar_movimiento(3102, 2201, "salida", 2, "2025-03-02", "ref", 1, 1)
+                self.manager.registrar_movimiento(3103, 2201, "salida", 9, "2025-03-02", "ref", 1, 1)
+        self.assertFalse(self.manager.existe_movimiento(3102))
+        self.assertEqual(self.manager.obtener_producto(2201).stock_actual, 5)
+
+        # Una consulta fallida (SKU duplicado) revierte la transacción completa
+        with self.assertRaises(TransaccionRevertidaError):
+            with self.manager.transaccion():
+                self.manager.agregar_proveedor(2003, "Proveedor revertido", "", "", "")
+                self.manager.agregar_producto(2202, "Duplicado", "", "SQ-UOW", 1.0, 0, 0, "B3", 2003, "2025-01-01")
+        self.assertFalse(self.manager.existe_proveedor(2003))
+
+    def test_transaccion_anidada_es_un_savepoint(self):
+        with self.manager.transaccion():
+            self.manager.agregar_cliente(4001, "Cliente exterior", "", "", "")
+            with self.assertRaises(ValueError):
+                with self.manager.transaccion():
+                    self.manager.agregar_cliente(4002, "Cliente interior", "", "", "")
+                    raise ValueError("se revierte solo la interior")
+        self.assertTrue(self.manager.existe_cliente(4001))
+        self.assertFalse(self.manager.existe_cliente(4002))
+
+    def test_obtener_varios_por_id(self):
+        ids = list(range(2010, 2016)) + [2010, 9999]
+        productos = self.manager.obtener_productos(ids)
+        self.assertEqual(sorted(productos), list(range(2010, 2016)))
+        self.assertEqual(productos[2012].sku, "SQ-12")
+        self.assertEqual(list(self.manager.obtener_proveedores([2001, None])), [2001])
+        self.assertEqual(self.manager.obtener_clientes([]), {})
+
+    def test_detalle_de_movimientos_en_una_consulta(self):
+        self.manager.agregar_cliente(4010, "Cliente detalle", "", "", "")
+        self.manager.registrar_movimiento(3201, 2040, "entrada", 3, "2025-04-01", "ref", 1, 2001)
+        self.manager.registrar_movimiento(3202, 2040, "salida", 1, "2025-04-02", "ref", 1, 4010)
+        detalles = self.manager.listar_movimientos_detalle(limite=2, despues_de=3200)
+        self.assertEqual([(d.id_movimiento, d.sku, d.nombre_cliente_proveedor) for d in detalles],
+                         [(3201, "SQ-40", "Proveedor SQLite"), (3202, "SQ-40", "Cliente detalle")])
+        self.assertEqual(self.manager.obtener_movimiento_detalle(3202).nombre_producto, "Tornillo 40")
+
+    def test_sentencias_fijas_reutilizan_el_cursor(self):
+        dao = self.manager.product_dao
+        self.assertTrue(dao._SQL_ACTUALIZAR.escritura)
+        self.assertFalse(sentencia("  select 1").escritura)
+        entrada = dao.db.pool.acquire()
+        self.assertEqual(dao.obtener_producto(2003).sku, "SQ-3")
+        cursor = entrada.cursores[None]
+        self.assertEqual(dao.buscar_por_sku("SQ-4").id_producto, 2004)
+        self.assertIs(entrada.cursores[None], cursor)
+
+    def test_pool_cierra_conexiones_invalidas_y_huerfanas(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        pool = sqlite_pool(os.path.join(directorio.name, "pool.db"))
+        self.addCleanup(pool.close)
+        hilo = threading.Thread(target=pool.acquire)
+        hilo.start()
+        hilo.join()
+        invalida = pool.acquire()
+        pool.invalidate(invalida)
+        # Al pedir otra se cierran la invalidada y la del hilo que ya terminó
+        nueva = pool.acquire()
+        self.assertEqual(list(pool._entradas), [nueva])
+        with self.assertRaises(sqlite3.ProgrammingError):
+            invalida.conexion.execute("SELECT 1")
+
+    def test_recorrido_propaga_errores_a_mitad(self):
+        # Un fallo tras la primera fila debe llegar a quien recorre, no terminar el recorrido en silencio
+        self.manager.agregar_cliente(4011, "Cliente recorrido", "", "", "")
+        for dao, recorrer in ((self.manager.product_dao, "iter_productos"),
+                              (self.manager.client_dao, "iter_clientes"),
+                              (self.manager.supplier_dao, "iter_proveedores")):
+            original = dao.db.iter_query
+
+            def una_fila_y_error(query, params=None, batch_size=None):
+                yield next(original(query, params, batch_size))
+                raise sqlite3.OperationalError("disk I/O error")
+
+            leidos = []
+            with self.subTest(recorrer), mock.patch.object(dao.db, "iter_query", una_fila_y_error):
+                with self.assertRaises(sqlite3.OperationalError):
+                    for modelo in getattr(dao, recorrer)():
+                        leidos.append(modelo)
+                self.assertEqual(len(leidos), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()